@@ -0,0 +1,25 @@
+-- Slim the workflow.run_records secondary indexes that every ledger upsert maintains.
+-- created_at grows with insertion order, so a BRIN index answers time-range scans
+-- at a fraction of the btree size. status/step are low-cardinality: only the
+-- active/failed statuses are worth indexing on their own, and every step lookup
+-- already goes through (run_id, ...) or (record_kind, step, ...) indexes.
+
+BEGIN;
+
+DROP INDEX IF EXISTS workflow.workflow_run_records_created_at_idx;
+CREATE INDEX IF NOT EXISTS workflow_run_records_created_at_brin_idx
+    ON workflow.run_records USING BRIN(created_at) WITH (pages_per_range = 32);
+
+DROP INDEX IF EXISTS workflow.workflow_run_records_status_idx;
+CREATE INDEX IF NOT EXISTS workflow_run_records_active_status_idx
+    ON workflow.run_records(status)
+    WHERE status IN ('running', 'failed');
+
+DROP INDEX IF EXISTS workflow.workflow_run_records_step_idx;
+
+DROP INDEX IF EXISTS workflow.workflow_run_records_question_idx;
+CREATE INDEX IF NOT EXISTS workflow_run_records_question_idx
+    ON workflow.run_records(question_id)
+    WHERE question_id IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- Containment lookups on run metadata (metadata_json @> '{...}') for dashboards.
+-- jsonb_path_ops is smaller and faster than the default opclass for @>, and the
+-- index is limited to run rows so step/question/artifact upserts do not pay for it.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS workflow_run_records_run_metadata_gin_idx
+    ON workflow.run_records USING GIN(metadata_json jsonb_path_ops)
+    WHERE record_kind = 'run';
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Shared metadata merge for workflow.run_records upserts.
+-- An empty incoming object keeps the existing value instead of rebuilding it,
+-- and the single-SELECT SQL body is inlined by the planner at each call site.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION workflow.merge_meta(existing jsonb, incoming jsonb)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+PARALLEL SAFE
+AS $$
+    SELECT CASE
+        WHEN incoming IS NULL OR incoming = '{}'::jsonb THEN existing
+        ELSE COALESCE(existing, '{}'::jsonb) || incoming
+    END
+$$;
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Ordered per-run step listing (list_workflow_steps / iter_workflow_steps).
+-- The index matches the query's ORDER BY started_at NULLS LAST, step, so Postgres
+-- walks one run's steps in order instead of sorting them. output_json and
+-- metadata_json are not INCLUDEd: they are unbounded and would overflow btree
+-- tuple limits, so the scan still visits the heap for the selected rows.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS workflow_run_records_step_order_idx
+    ON workflow.run_records(run_id, started_at NULLS LAST, step)
+    WHERE record_kind = 'step';
+
+COMMIT;
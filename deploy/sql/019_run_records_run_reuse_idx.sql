@@ -0,0 +1,12 @@
+-- Seed the cross-run reuse lookups (find_similar_completed_step and
+-- find_similar_report_question_items) from the matching run rows. Both always
+-- filter runs on config_hash and papers_dir; without this index every call
+-- scanned all run rows before joining to their steps or questions.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS workflow_run_records_run_reuse_idx
+    ON workflow.run_records(config_hash, papers_dir)
+    WHERE record_kind = 'run';
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- Latest completed step by name for find_similar_completed_step. The index order
+-- matches its ORDER BY finished_at DESC NULLS LAST, so LIMIT 1 stops at the first
+-- matching row instead of sorting every completed step of that name.
+-- output_json is not INCLUDEd: it is unbounded and would overflow btree tuples.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS workflow_run_records_completed_step_idx
+    ON workflow.run_records(step, finished_at DESC NULLS LAST)
+    WHERE record_kind = 'step' AND record_key = 'main' AND status = 'completed';
+
+COMMIT;
@@ -0,0 +1,106 @@
+-- Hourly token usage totals per (model, session_id), kept current by statement-level
+-- triggers on observability.token_usage. Usage summaries without a request_id
+-- filter and with an hour-aligned "since" read these rows instead of summing
+-- every usage event. A batched insert costs one aggregated upsert per statement.
+-- NULL model/session_id are stored as '' (as in token_usage_rollup) so they can
+-- take part in the primary key.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS observability.token_usage_hourly (
+    bucket TIMESTAMPTZ NOT NULL,
+    model TEXT NOT NULL DEFAULT '',
+    session_id TEXT NOT NULL DEFAULT '',
+    calls BIGINT NOT NULL DEFAULT 0,
+    input_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, model, session_id)
+);
+
+CREATE INDEX IF NOT EXISTS observability_token_usage_hourly_session_idx
+    ON observability.token_usage_hourly(session_id, bucket);
+
+CREATE OR REPLACE FUNCTION observability.token_usage_hourly_add()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO observability.token_usage_hourly AS h
+        (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+    SELECT
+        date_trunc('hour', created_at, 'UTC'),
+        COALESCE(model, ''),
+        COALESCE(session_id, ''),
+        COUNT(*),
+        COALESCE(SUM(input_tokens), 0),
+        COALESCE(SUM(output_tokens), 0),
+        COALESCE(SUM(total_tokens), 0)
+    FROM usage_rows
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, model, session_id) DO UPDATE SET
+        calls = h.calls + EXCLUDED.calls,
+        input_tokens = h.input_tokens + EXCLUDED.input_tokens,
+        output_tokens = h.output_tokens + EXCLUDED.output_tokens,
+        total_tokens = h.total_tokens + EXCLUDED.total_tokens;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION observability.token_usage_hourly_remove()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE observability.token_usage_hourly AS h SET
+        calls = h.calls - d.calls,
+        input_tokens = h.input_tokens - d.input_tokens,
+        output_tokens = h.output_tokens - d.output_tokens,
+        total_tokens = h.total_tokens - d.total_tokens
+    FROM (
+        SELECT
+            date_trunc('hour', created_at, 'UTC') AS bucket,
+            COALESCE(model, '') AS model,
+            COALESCE(session_id, '') AS session_id,
+            COUNT(*) AS calls,
+            COALESCE(SUM(input_tokens), 0) AS input_tokens,
+            COALESCE(SUM(output_tokens), 0) AS output_tokens,
+            COALESCE(SUM(total_tokens), 0) AS total_tokens
+        FROM usage_rows
+        GROUP BY 1, 2, 3
+    ) AS d
+    WHERE h.bucket = d.bucket AND h.model = d.model AND h.session_id = d.session_id;
+    RETURN NULL;
+END
+$$;
+
+-- Block concurrent inserts between the backfill and trigger creation.
+LOCK TABLE observability.token_usage IN SHARE ROW EXCLUSIVE MODE;
+
+TRUNCATE observability.token_usage_hourly;
+INSERT INTO observability.token_usage_hourly
+    (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+SELECT
+    date_trunc('hour', created_at, 'UTC'),
+    COALESCE(model, ''),
+    COALESCE(session_id, ''),
+    COUNT(*),
+    COALESCE(SUM(input_tokens), 0),
+    COALESCE(SUM(output_tokens), 0),
+    COALESCE(SUM(total_tokens), 0)
+FROM observability.token_usage
+GROUP BY 1, 2, 3;
+
+DROP TRIGGER IF EXISTS token_usage_hourly_insert ON observability.token_usage;
+CREATE TRIGGER token_usage_hourly_insert
+    AFTER INSERT ON observability.token_usage
+    REFERENCING NEW TABLE AS usage_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION observability.token_usage_hourly_add();
+
+DROP TRIGGER IF EXISTS token_usage_hourly_delete ON observability.token_usage;
+CREATE TRIGGER token_usage_hourly_delete
+    AFTER DELETE ON observability.token_usage
+    REFERENCING OLD TABLE AS usage_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION observability.token_usage_hourly_remove();
+
+COMMIT;
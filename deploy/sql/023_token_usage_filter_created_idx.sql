@@ -0,0 +1,17 @@
+-- Serve the session- and request-filtered usage reads (recent usage ordered by
+-- created_at DESC LIMIT n, and "since"-bounded aggregates) from one index range
+-- in created_at order instead of a bitmap scan plus sort. The composite indexes
+-- also answer plain equality lookups, so the single-column session/request
+-- indexes are dropped to avoid maintaining both on every usage insert.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS observability_token_usage_session_created_idx
+    ON observability.token_usage(session_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS observability_token_usage_request_created_idx
+    ON observability.token_usage(request_id, created_at DESC);
+
+DROP INDEX IF EXISTS observability.observability_token_usage_session_idx;
+DROP INDEX IF EXISTS observability.observability_token_usage_request_idx;
+
+COMMIT;
@@ -0,0 +1,81 @@
+-- Keep observability.token_usage_hourly in step with every write to
+-- observability.token_usage, not only INSERT and DELETE (022). An UPDATE moves
+-- the old rows' totals out of their buckets and the new rows' totals in, so
+-- corrected token counts or a changed model/session/created_at stay consistent.
+-- TRUNCATE fires no row or transition-table triggers, so a separate statement
+-- trigger clears the rollup with it. The rollup is rebuilt once here to drop any
+-- drift left by updates or truncates made before these triggers existed.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION observability.token_usage_hourly_update()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO observability.token_usage_hourly AS h
+        (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+    SELECT
+        date_trunc('hour', created_at, 'UTC'),
+        COALESCE(model, ''),
+        COALESCE(session_id, ''),
+        SUM(sign),
+        COALESCE(SUM(sign * input_tokens), 0),
+        COALESCE(SUM(sign * output_tokens), 0),
+        COALESCE(SUM(sign * total_tokens), 0)
+    FROM (
+        SELECT -1 AS sign, created_at, model, session_id, input_tokens, output_tokens, total_tokens
+        FROM old_rows
+        UNION ALL
+        SELECT 1, created_at, model, session_id, input_tokens, output_tokens, total_tokens
+        FROM new_rows
+    ) AS changed
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket, model, session_id) DO UPDATE SET
+        calls = h.calls + EXCLUDED.calls,
+        input_tokens = h.input_tokens + EXCLUDED.input_tokens,
+        output_tokens = h.output_tokens + EXCLUDED.output_tokens,
+        total_tokens = h.total_tokens + EXCLUDED.total_tokens;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION observability.token_usage_hourly_clear()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    TRUNCATE observability.token_usage_hourly;
+    RETURN NULL;
+END
+$$;
+
+-- Block concurrent writes between the rebuild and trigger creation.
+LOCK TABLE observability.token_usage IN SHARE ROW EXCLUSIVE MODE;
+
+TRUNCATE observability.token_usage_hourly;
+INSERT INTO observability.token_usage_hourly
+    (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+SELECT
+    date_trunc('hour', created_at, 'UTC'),
+    COALESCE(model, ''),
+    COALESCE(session_id, ''),
+    COUNT(*),
+    COALESCE(SUM(input_tokens), 0),
+    COALESCE(SUM(output_tokens), 0),
+    COALESCE(SUM(total_tokens), 0)
+FROM observability.token_usage
+GROUP BY 1, 2, 3;
+
+DROP TRIGGER IF EXISTS token_usage_hourly_update ON observability.token_usage;
+CREATE TRIGGER token_usage_hourly_update
+    AFTER UPDATE ON observability.token_usage
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION observability.token_usage_hourly_update();
+
+DROP TRIGGER IF EXISTS token_usage_hourly_truncate ON observability.token_usage;
+CREATE TRIGGER token_usage_hourly_truncate
+    AFTER TRUNCATE ON observability.token_usage
+    FOR EACH STATEMENT EXECUTE FUNCTION observability.token_usage_hourly_clear();
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Drop the run metadata containment index from 016. No query filters runs with
+-- metadata_json @> ..., so the index only added GIN maintenance to every run
+-- upsert and metadata merge.
+
+BEGIN;
+
+DROP INDEX IF EXISTS workflow.workflow_run_records_run_metadata_gin_idx;
+
+COMMIT;
@@ -544,13 +544,14 @@ def cmd_store_workflow_reports(args: argparse.Namespace) -> int:
         db_url=str(db_url),
         recursive=bool(args.recursive),
         limit=int(args.limit or 0),
+        skip_unchanged=not bool(getattr(args, "force", False)),
     )
     if stats["total"] == 0:
         print(f"No workflow report files found in {reports_dir}.")
         return 1
     print(
         f"Stored {stats['stored']} workflow report(s) "
-        f"(scanned {stats['total']}, skipped {stats['skipped']})."
+        f"(scanned {stats['total']}, unchanged {stats['unchanged']}, skipped {stats['skipped']})."
     )
     return 0
 
@@ -943,6 +944,7 @@ def build_parser() -> argparse.ArgumentParser:
     wr.add_argument("--meta-db-url", type=str, default=None)
     wr.add_argument("--recursive", action="store_true")
     wr.add_argument("--limit", type=int, default=0)
+    wr.add_argument("--force", action="store_true", help="Rewrite reports even when already stored unchanged")
     wr.set_defaults(func=cmd_store_workflow_reports)
 
     oa = sub.add_parser(
@@ -799,13 +799,13 @@ def embed_texts(
         batch = texts[i : i + batch_size]
         emb_batch, input_tokens, output_tokens, total_tokens, provider_name = _embed_batch(client, batch)
         try:
-            from ragonometrics.pipeline.token_usage import record_usage
+            from ragonometrics.pipeline.token_usage import record_usage_async
 
             usage_meta = dict(meta or {})
             if provider_name:
                 usage_meta.setdefault("provider", provider_name)
                 usage_meta.setdefault("capability", "embeddings")
-            record_usage(
+            record_usage_async(
                 model=model,
                 operation="embeddings",
                 step=step,
@@ -8,6 +8,7 @@ from .connection import (
     get_pool,
     pooled_connection,
 )
+from .jsonb import json_bytes, jsonb
 
 __all__ = [
     "close_all_pools",
@@ -15,6 +16,8 @@ __all__ = [
     "ensure_schema_ready",
     "get_database_url",
     "get_pool",
+    "json_bytes",
+    "jsonb",
     "pooled_connection",
 ]
 
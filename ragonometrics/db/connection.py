@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import atexit
 import os
 import re
 import threading
@@ -12,8 +13,10 @@ from psycopg import Connection
 from psycopg import connect as pg_connect
 from psycopg_pool import ConnectionPool
 
+from ragonometrics.db.jsonb import register_json_loads
 
-EXPECTED_ALEMBIC_REVISION = "0014"
+
+EXPECTED_ALEMBIC_REVISION = "0025"
 _LEGACY_ALEMBIC_ALIASES = {
     "0001_unified_schema": "0001",
     "0002_migrate_workflow_legacy": "0002",
@@ -30,10 +33,23 @@ _LEGACY_ALEMBIC_ALIASES = {
     "0012_projects_core": "0012",
     "0013_project_scope_existing_tables": "0013",
     "0014_hybrid_query_cache": "0014",
+    "0015_run_records_partial_brin_indexes": "0015",
+    "0016_run_records_metadata_gin": "0016",
+    "0017_workflow_merge_meta_function": "0017",
+    "0018_run_records_step_order_idx": "0018",
+    "0019_run_records_run_reuse_idx": "0019",
+    "0020_run_records_completed_step_idx": "0020",
+    "0021_run_records_lz4_compression": "0021",
+    "0022_token_usage_hourly_rollup": "0022",
+    "0023_token_usage_filter_created_idx": "0023",
+    "0024_token_usage_hourly_update_truncate": "0024",
+    "0025_drop_run_records_metadata_gin": "0025",
 }
 _POOL_LOCK = threading.Lock()
 _POOLS: dict[str, ConnectionPool] = {}
 _SCHEMA_READY_BY_DSN: set[str] = set()
+# Pools whose DSN already passed ensure_schema_ready; skips conn.info.dsn on each borrow.
+_SCHEMA_READY_POOLS: set[ConnectionPool] = set()
 
 
 def get_database_url(explicit_db_url: str | None = None, *, required: bool = True) -> str | None:
@@ -120,6 +136,21 @@ def normalize_alembic_version_marker(conn: Connection) -> Tuple[Optional[str], O
         return raw, normalized, False
 
 
+def is_rejected_statement_error(exc: BaseException) -> bool:
+    """Return True when the server rejected a statement, rather than the connection failing.
+
+    Server-side errors carry a SQLSTATE; connection and pool failures do not,
+    so only the former are worth retrying one row at a time.
+
+    Args:
+        exc (BaseException): Error raised by a database write.
+
+    Returns:
+        bool: True when the error came back from the server with a SQLSTATE.
+    """
+    return bool(getattr(exc, "sqlstate", None))
+
+
 def connect(
     db_url: str | None = None,
     *,
@@ -129,11 +160,33 @@ def connect(
     """Open a psycopg3 connection."""
     resolved = get_database_url(db_url, required=True)
     conn = pg_connect(resolved, autocommit=autocommit)
+    register_json_loads(conn)
     if require_migrated:
         ensure_schema_ready(conn)
     return conn
 
 
+def _pool_connect_kwargs() -> dict[str, object]:
+    """Build per-connection settings for pooled connections.
+
+    ``application_name`` tags pooled sessions in ``pg_stat_activity``. Session
+    GUCs are opt-in through ``DB_SESSION_OPTIONS`` (for example ``-c jit=off``,
+    since JIT compilation only adds latency to short OLTP statements); they are
+    sent as the ``options`` startup parameter, which replaces any ``options``
+    given in the DSN and which PgBouncer-style poolers may reject, so nothing
+    is sent unless it is set. Set ``DB_APPLICATION_NAME`` to an empty string to
+    keep the server default (or the value from the DSN).
+    """
+    kwargs: dict[str, object] = {"autocommit": False}
+    application_name = os.environ.get("DB_APPLICATION_NAME", "ragonometrics").strip()
+    if application_name:
+        kwargs["application_name"] = application_name
+    options = os.environ.get("DB_SESSION_OPTIONS", "").strip()
+    if options:
+        kwargs["options"] = options
+    return kwargs
+
+
 def get_pool(
     db_url: str | None = None,
     *,
@@ -142,6 +195,10 @@ def get_pool(
 ) -> ConnectionPool:
     """Get or create a process-global connection pool for a DSN."""
     resolved = get_database_url(db_url, required=True)
+    # Fast path: an existing pool needs no lock and no pool-size env reads.
+    pool = _POOLS.get(resolved)
+    if pool is not None:
+        return pool
     min_value = int(min_size if min_size is not None else os.environ.get("DB_POOL_MIN_SIZE", "1"))
     max_value = int(max_size if max_size is not None else os.environ.get("DB_POOL_MAX_SIZE", "8"))
     with _POOL_LOCK:
@@ -151,7 +208,8 @@ def get_pool(
                 conninfo=resolved,
                 min_size=max(1, min_value),
                 max_size=max(1, max_value),
-                kwargs={"autocommit": False},
+                kwargs=_pool_connect_kwargs(),
+                configure=register_json_loads,
                 open=True,
             )
             _POOLS[resolved] = pool
@@ -163,13 +221,26 @@ def pooled_connection(
     db_url: str | None = None,
     *,
     require_migrated: bool = True,
+    autocommit: bool = False,
 ) -> Iterator[Connection]:
-    """Yield one pooled connection."""
+    """Yield one pooled connection.
+
+    With ``autocommit=True`` each statement commits on its own, so read-only
+    callers skip the implicit BEGIN and never hold a snapshot open between
+    queries. The pool's transactional default is restored before return.
+    """
     pool = get_pool(db_url)
     with pool.connection() as conn:
-        if require_migrated:
-            ensure_schema_ready(conn)
-        yield conn
+        if autocommit:
+            conn.autocommit = True
+        try:
+            if require_migrated and pool not in _SCHEMA_READY_POOLS:
+                ensure_schema_ready(conn)
+                _SCHEMA_READY_POOLS.add(pool)
+            yield conn
+        finally:
+            if autocommit:
+                conn.autocommit = False
 
 
 def close_all_pools() -> None:
@@ -177,8 +248,13 @@ def close_all_pools() -> None:
     with _POOL_LOCK:
         pools = list(_POOLS.values())
         _POOLS.clear()
+        _SCHEMA_READY_POOLS.clear()
     for pool in pools:
         try:
             pool.close()
         except Exception:
             pass
+
+
+# Return pooled connections to the server cleanly instead of dropping sockets at exit.
+atexit.register(close_all_pools)
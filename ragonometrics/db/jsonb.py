@@ -0,0 +1,100 @@
+"""orjson-backed helpers for binding ``jsonb`` query parameters."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+import orjson
+from psycopg.types.json import Jsonb, set_json_loads
+
+# 19+ digit runs may hold integers outside the 64-bit range, which orjson
+# decodes as lossy floats; such documents go through the stdlib decoder.
+_WIDE_INTEGER_BYTES_RE = re.compile(rb"\d{19}")
+_WIDE_INTEGER_TEXT_RE = re.compile(r"\d{19}")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode a JSON document without losing values the encoders can write.
+
+    orjson handles the common case. Documents that may contain integers wider
+    than 64 bits, or numbers orjson rejects (such as ``1e400``, which jsonb
+    stores), are decoded with ``json.loads`` instead.
+
+    Args:
+        data (bytes | str): JSON document.
+
+    Returns:
+        Any: Decoded value.
+    """
+    wide_integer_re = _WIDE_INTEGER_TEXT_RE if isinstance(data, str) else _WIDE_INTEGER_BYTES_RE
+    if not wide_integer_re.search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def register_json_loads(conn: Any) -> None:
+    """Decode json/jsonb result columns of one connection with ``json_loads``.
+
+    Args:
+        conn (Any): Open psycopg connection.
+    """
+    set_json_loads(json_loads, conn)
+
+
+def json_bytes(value: Any, *, indent: bool = False) -> bytes:
+    """Serialize a value to UTF-8 JSON bytes.
+
+    Non-string dict keys are stringified and unknown objects fall back to
+    ``str`` so arbitrary run metadata never fails to serialize. Values orjson
+    cannot encode at all, such as integers wider than 64 bits, are serialized
+    with the stdlib encoder instead.
+
+    Args:
+        value (Any): Value to serialize.
+        indent (bool): Indent nested values by two spaces for human-readable files.
+
+    Returns:
+        bytes: UTF-8 encoded JSON document.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return orjson.dumps(value, default=str, option=option)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            value,
+            default=str,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        ).encode("utf-8")
+
+
+def _jsonb_dumps(value: Any) -> bytes:
+    """Dump a ``Jsonb`` parameter, passing pre-encoded JSON bytes through.
+
+    Args:
+        value (Any): Value to serialize, or UTF-8 JSON bytes already encoded.
+
+    Returns:
+        bytes: UTF-8 encoded JSON document.
+    """
+    if isinstance(value, bytes):
+        return value
+    return json_bytes(value)
+
+
+def jsonb(value: Any) -> Jsonb:
+    """Wrap a value as a typed ``jsonb`` parameter serialized by orjson.
+
+    Args:
+        value (Any): Value to serialize, or UTF-8 JSON bytes already encoded.
+
+    Returns:
+        Jsonb: Parameter adapter bound with the ``jsonb`` type.
+    """
+    return Jsonb(value, dumps=_jsonb_dumps)
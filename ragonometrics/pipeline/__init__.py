@@ -10,7 +10,15 @@ from .pipeline import (
 )
 
 from .query_cache import DEFAULT_CACHE_PATH, get_cached_answer, make_cache_key, set_cached_answer
-from .token_usage import DEFAULT_USAGE_DB, get_recent_usage, get_usage_by_model, get_usage_summary, record_usage
+from .token_usage import (
+    DEFAULT_USAGE_DB,
+    flush_usage,
+    get_recent_usage,
+    get_usage_by_model,
+    get_usage_summary,
+    record_usage,
+    record_usage_async,
+)
 
 __all__ = [
     "DEFAULT_MODEL",
@@ -24,8 +32,10 @@ __all__ = [
     "make_cache_key",
     "set_cached_answer",
     "DEFAULT_USAGE_DB",
+    "flush_usage",
     "get_recent_usage",
     "get_usage_by_model",
     "get_usage_summary",
     "record_usage",
+    "record_usage_async",
 ]
@@ -264,14 +264,14 @@ def call_llm(
 
             latency_ms = int(max(0.0, (time.perf_counter() - t0) * 1000.0))
             try:
-                from ragonometrics.pipeline.token_usage import record_usage
+                from ragonometrics.pipeline.token_usage import record_usage_async
 
                 usage_meta = dict(meta or {})
                 usage_meta.setdefault("provider", provider_name)
                 usage_meta.setdefault("capability", capability)
                 if fallback_from:
                     usage_meta.setdefault("fallback_from", fallback_from)
-                record_usage(
+                record_usage_async(
                     model=model,
                     operation=usage_context,
                     step=step,
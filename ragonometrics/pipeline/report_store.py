@@ -3,14 +3,33 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List
 
-from ragonometrics.db.connection import connect
+import orjson
 
-from ragonometrics.pipeline.run_records import ensure_run_records_table
+from ragonometrics.db.connection import connect, pooled_connection
+from ragonometrics.db.jsonb import json_bytes, json_loads, jsonb
+
+from ragonometrics.pipeline.run_records import ensure_run_records_table, is_baseline_arm
+
+# Backfills below this size parse in-process; pool startup would dominate.
+_PARALLEL_PARSE_MIN_FILES = 64
+_PARALLEL_PARSE_MAX_WORKERS = 8
+_MMAP_HASH_MIN_BYTES = 1 << 20
+_REPORT_FILE_PATTERN = "workflow-report-*.json"
+# Shared ``{"source": "report_store"}`` jsonb parameter for every ledger upsert.
+_SOURCE_METADATA = jsonb(orjson.dumps({"source": "report_store"}))
 
 
 def _utc_now() -> str:
@@ -42,101 +61,191 @@ def infer_workflow_status(payload: Dict[str, Any]) -> str:
     return "running"
 
 
-def _agentic_status(payload: Dict[str, Any]) -> str | None:
-    """Agentic status.
+def _clean_text(value: Any) -> str | None:
+    """Return stripped text, or `None` when blank.
 
     Args:
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        value (Any): Value to serialize, store, or compare.
 
     Returns:
         str | None: Computed result, or `None` when unavailable.
     """
-    agentic = payload.get("agentic")
-    if not isinstance(agentic, dict):
-        return None
-    value = str(agentic.get("status") or "").strip()
-    return value or None
-
-
-def _report_questions_set(payload: Dict[str, Any]) -> str | None:
-    """Report questions set.
+    text = str(value or "").strip()
+    return text or None
+
+
+@dataclass(frozen=True, slots=True)
+class _PayloadView:
+    """Report payload fields extracted once and shared by every upsert helper."""
+
+    papers_dir: str
+    started_at: Any
+    finished_at: Any
+    config_hash: str
+    config_effective: Dict[str, Any]
+    workstream_id: str | None
+    arm: str | None
+    parent_run_id: str | None
+    trigger_source: str | None
+    git_sha: str | None
+    git_branch: str | None
+    paper_set_hash: str | None
+    question: str | None
+    agentic_status: str | None
+    report_question_set: str | None
+    report_questions: List[Dict[str, Any]]
+    confidence_mean: float | None
+    confidence_label_counts: Dict[str, Any]
+    final_answer: str
+    audit_artifacts: Dict[str, Any]
+
+
+def _payload_view(payload: Dict[str, Any]) -> _PayloadView:
+    """Walk a report payload once and collect the fields persisted to the ledger.
 
     Args:
         payload (Dict[str, Any]): Payload data to persist or transmit.
 
     Returns:
-        str | None: Computed result, or `None` when unavailable.
+        _PayloadView: Extracted payload fields.
     """
     agentic = payload.get("agentic")
     if not isinstance(agentic, dict):
-        return None
-    value = str(agentic.get("report_questions_set") or "").strip()
-    return value or None
+        agentic = {}
+    config = payload.get("config")
+    if not isinstance(config, dict):
+        config = {}
+    config_effective = config.get("config_effective")
+    questions = agentic.get("report_questions")
+    confidence = agentic.get("report_question_confidence")
+    if not isinstance(confidence, dict):
+        confidence = {}
+    label_counts = confidence.get("label_counts")
+    confidence_mean = confidence.get("mean")
+    try:
+        confidence_mean = float(confidence_mean) if confidence_mean is not None else None
+    except Exception:
+        confidence_mean = None
+    audit = payload.get("audit_artifacts")
+    return _PayloadView(
+        papers_dir=str(payload.get("papers_dir") or ""),
+        started_at=payload.get("started_at"),
+        finished_at=payload.get("finished_at"),
+        config_hash=str(config.get("config_hash") or ""),
+        config_effective=config_effective if isinstance(config_effective, dict) else {},
+        workstream_id=_clean_text(payload.get("workstream_id")),
+        arm=_clean_text(payload.get("arm")),
+        parent_run_id=_clean_text(payload.get("parent_run_id")),
+        trigger_source=_clean_text(payload.get("trigger_source")),
+        git_sha=_clean_text(payload.get("git_sha")),
+        git_branch=_clean_text(payload.get("git_branch")),
+        paper_set_hash=_clean_text(payload.get("paper_set_hash")),
+        question=_clean_text(agentic.get("question")),
+        agentic_status=_clean_text(agentic.get("status")),
+        report_question_set=_clean_text(agentic.get("report_questions_set")),
+        report_questions=[q for q in questions if isinstance(q, dict)] if isinstance(questions, list) else [],
+        confidence_mean=confidence_mean,
+        confidence_label_counts=label_counts if isinstance(label_counts, dict) else {},
+        final_answer=str(agentic.get("final_answer") or ""),
+        audit_artifacts=audit if isinstance(audit, dict) else {},
+    )
+
 
+def _content_hash(data: bytes) -> str:
+    """Hash report content for change detection and dedup keys.
 
-def _report_questions(payload: Dict[str, Any]) -> list[dict[str, Any]]:
-    """Report questions.
+    Uses 256-bit BLAKE2b: not an integrity commitment (artifacts keep SHA-256),
+    faster than SHA-256 in software, and the same 64-char hex width.
 
     Args:
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        data (bytes): Bytes to hash.
 
     Returns:
-        list[dict[str, Any]]: Dictionary containing the computed result payload.
+        str: Hex digest.
     """
-    agentic = payload.get("agentic")
-    if not isinstance(agentic, dict):
-        return []
-    questions = agentic.get("report_questions")
-    if not isinstance(questions, list):
-        return []
-    return [q for q in questions if isinstance(q, dict)]
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
 
 
-def _report_question_confidence(payload: Dict[str, Any]) -> dict[str, Any]:
-    """Report question confidence.
+@lru_cache(maxsize=8192)
+def _sha256_file_cached(path_text: str, mtime_ns: int, size: int) -> str:
+    """Hash one file version identified by path, mtime, and size.
+
+    Large artifacts are hashed straight from a read-only memory map so the
+    digest reads page-cache pages without copying them into Python. Errors
+    propagate so failed reads are never cached.
 
     Args:
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        path_text (str): Filesystem path text.
+        mtime_ns (int): File modification time in nanoseconds (cache key only).
+        size (int): File size in bytes.
 
     Returns:
-        dict[str, Any]: Dictionary containing the computed result payload.
+        str: Hex SHA-256 digest.
     """
-    agentic = payload.get("agentic")
-    if not isinstance(agentic, dict):
-        return {}
-    conf = agentic.get("report_question_confidence")
-    if isinstance(conf, dict):
-        return conf
-    return {}
+    with open(path_text, "rb") as fh:
+        if size >= _MMAP_HASH_MIN_BYTES:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        return hashlib.file_digest(fh, "sha256").hexdigest()
 
 
-def _sha256_text(text: str) -> str:
-    """Sha256 text.
+def sha256_file(path: Path) -> str | None:
+    """Return the hex SHA-256 digest of a file.
+
+    Digests are memoized per ``(path, mtime_ns, size)`` so repeated backfills
+    do not re-hash artifacts that have not changed on disk.
 
     Args:
-        text (str): Input text value.
+        path (Path): Filesystem path value.
 
     Returns:
-        str: Computed string result.
+        str | None: Computed result, or `None` when unavailable.
     """
-    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).hexdigest()
+    try:
+        stat = path.stat()
+        return _sha256_file_cached(str(path), stat.st_mtime_ns, stat.st_size)
+    except Exception:
+        return None
 
 
-def _sha256_file(path: Path) -> str | None:
-    """Sha256 file.
+def _mtime_ns(path: Path) -> int | None:
+    """Return a file's modification time in nanoseconds.
 
     Args:
         path (Path): Filesystem path value.
 
     Returns:
-        str | None: Computed result, or `None` when unavailable.
+        int | None: Modification time, or `None` when the file cannot be read.
     """
     try:
-        return hashlib.sha256(path.read_bytes()).hexdigest()
-    except Exception:
+        return path.stat().st_mtime_ns
+    except OSError:
         return None
 
 
+def _artifact_sha256(path: Path, known_sha256: Any, report_mtime_ns: int | None) -> str | None:
+    """Return an artifact digest, reusing the report's recorded one when still valid.
+
+    A recorded digest is trusted only when the artifact is not newer than the
+    report that recorded it; an artifact regenerated afterwards is re-hashed.
+
+    Args:
+        path (Path): Artifact path.
+        known_sha256 (Any): Digest recorded in the report payload, if any.
+        report_mtime_ns (int | None): Report file modification time, or `None`
+            when the report is not on disk.
+
+    Returns:
+        str | None: Hex SHA-256 digest, or `None` when unavailable.
+    """
+    known = _clean_text(known_sha256)
+    if known and report_mtime_ns is not None:
+        artifact_mtime_ns = _mtime_ns(path)
+        if artifact_mtime_ns is not None and artifact_mtime_ns <= report_mtime_ns:
+            return known
+    return sha256_file(path) or known
+
+
 def ensure_workflow_report_store(conn) -> None:
     """Create unified workflow report persistence table/indexes if needed.
 
@@ -146,30 +255,21 @@ def ensure_workflow_report_store(conn) -> None:
     ensure_run_records_table(conn)
 
 
-def _upsert_run_record(cur, *, run_id: str, status: str, papers_dir: str, report_path: str, payload: Dict[str, Any]) -> None:
+def _upsert_run_record(cur, *, run_id: str, status: str, report_path: str, view: _PayloadView) -> None:
     """Upsert run record.
 
     Args:
         cur (Any): Open database cursor.
         run_id (str): Unique workflow run identifier.
         status (str): Status value to persist for the run or step.
-        papers_dir (str): Directory containing input paper files.
         report_path (str): Path to the workflow report file.
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        view (_PayloadView): Fields extracted from the report payload.
     """
-    workstream_id = str(payload.get("workstream_id") or "").strip() or None
-    arm = str(payload.get("arm") or "").strip() or None
-    parent_run_id = str(payload.get("parent_run_id") or "").strip() or None
-    trigger_source = str(payload.get("trigger_source") or "").strip() or None
-    git_sha = str(payload.get("git_sha") or "").strip() or None
-    git_branch = str(payload.get("git_branch") or "").strip() or None
-    paper_set_hash = str(payload.get("paper_set_hash") or "").strip() or None
-    question = str(((payload.get("agentic") or {}).get("question") or "")).strip() or None
-    report_question_set = _report_questions_set(payload)
-    config_effective = (payload.get("config") or {}).get("config_effective")
-    if not isinstance(config_effective, dict):
-        config_effective = {}
     now = _utc_now()
+    # The single-row ledger upserts pass ``prepare=True`` so psycopg parses and
+    # plans each ON CONFLICT statement once per connection instead of once per
+    # report; the per-report question/artifact batches go through
+    # ``executemany``, which psycopg pipelines and prepares on its own.
     cur.execute(
         """
         INSERT INTO workflow.run_records
@@ -185,9 +285,9 @@ def _upsert_run_record(cur, *, run_id: str, status: str, papers_dir: str, report
             %s, 'run', '', 'main',
             %s, %s, %s,
             %s, %s, %s, %s, %s, %s,
-            %s::jsonb, %s, %s, %s,
             %s, %s, %s, %s,
-            %s, %s::jsonb, %s::jsonb
+            %s, %s, %s, %s,
+            %s, %s, %s
         )
         ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
             status = COALESCE(EXCLUDED.status, workflow.run_records.status),
@@ -215,34 +315,35 @@ def _upsert_run_record(cur, *, run_id: str, status: str, papers_dir: str, report
                     THEN EXCLUDED.payload_json
                 ELSE workflow.run_records.payload_json
             END,
-            metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
+            metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
             updated_at = EXCLUDED.updated_at
         """,
         (
             run_id,
             status,
-            papers_dir,
-            str((payload.get("config") or {}).get("config_hash") or ""),
-            workstream_id,
-            arm,
-            parent_run_id,
-            trigger_source,
-            git_sha,
-            git_branch,
-            json.dumps(config_effective, ensure_ascii=False),
-            paper_set_hash,
-            question,
-            report_question_set,
-            payload.get("started_at"),
-            payload.get("finished_at"),
+            view.papers_dir,
+            view.config_hash,
+            view.workstream_id,
+            view.arm,
+            view.parent_run_id,
+            view.trigger_source,
+            view.git_sha,
+            view.git_branch,
+            jsonb(view.config_effective),
+            view.paper_set_hash,
+            view.question,
+            view.report_question_set,
+            view.started_at,
+            view.finished_at,
             now,
             now,
             report_path,
-            json.dumps({"source": "report_store"}, ensure_ascii=False),
-            json.dumps({"source": "report_store"}, ensure_ascii=False),
+            _SOURCE_METADATA,
+            _SOURCE_METADATA,
         ),
+        prepare=True,
     )
-    if workstream_id:
+    if view.workstream_id:
         cur.execute(
             """
             INSERT INTO workflow.run_records
@@ -254,7 +355,7 @@ def _upsert_run_record(cur, *, run_id: str, status: str, papers_dir: str, report
             VALUES (
                 %s, 'workstream_link', '', %s, %s,
                 %s, %s, %s, NOW(), NOW(),
-                %s::jsonb, %s::jsonb
+                %s, %s
             )
             ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
                 status = COALESCE(EXCLUDED.status, workflow.run_records.status),
@@ -262,140 +363,151 @@ def _upsert_run_record(cur, *, run_id: str, status: str, papers_dir: str, report
                 arm = COALESCE(EXCLUDED.arm, workflow.run_records.arm),
                 parent_run_id = COALESCE(EXCLUDED.parent_run_id, workflow.run_records.parent_run_id),
                 payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
-                metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
+                metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
                 updated_at = NOW()
             """,
             (
                 run_id,
-                workstream_id,
+                view.workstream_id,
                 status,
-                workstream_id,
-                arm,
-                parent_run_id,
-                json.dumps(
+                view.workstream_id,
+                view.arm,
+                view.parent_run_id,
+                jsonb(
                     {
                         "source_bucket": "archive" if "archived" in str(report_path).lower() else "current",
-                        "is_baseline": bool(str(arm or "").strip().lower() in {"baseline", "control", "gpt-5"}),
-                    },
-                    ensure_ascii=False,
+                        "is_baseline": is_baseline_arm(view.arm),
+                    }
                 ),
-                json.dumps({"source": "report_store"}, ensure_ascii=False),
+                _SOURCE_METADATA,
             ),
+            prepare=True,
         )
 
 
-def _upsert_report_questions(cur, *, run_id: str, payload: Dict[str, Any]) -> None:
+def _upsert_report_questions(cur, *, run_id: str, view: _PayloadView) -> None:
     """Upsert report questions.
 
     Args:
         cur (Any): Open database cursor.
         run_id (str): Unique workflow run identifier.
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        view (_PayloadView): Fields extracted from the report payload.
     """
-    questions = _report_questions(payload)
-    if not questions:
-        return
-    for item in questions:
+    rows = []
+    for item in view.report_questions:
         question_id = str(item.get("id") or "").strip()
         if not question_id:
             continue
-        cur.execute(
-            """
-            INSERT INTO workflow.run_records
-            (
-                run_id, record_kind, step, record_key, status, question_id,
-                report_question_set, created_at, updated_at, payload_json, metadata_json
-            )
-            VALUES (
-                %s, 'question', 'agentic', %s, %s, %s,
-                %s, NOW(), NOW(), %s::jsonb, %s::jsonb
-            )
-            ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-                status = EXCLUDED.status,
-                question_id = EXCLUDED.question_id,
-                report_question_set = COALESCE(EXCLUDED.report_question_set, workflow.run_records.report_question_set),
-                payload_json = EXCLUDED.payload_json,
-                metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-                updated_at = NOW()
-            """,
+        rows.append(
             (
                 run_id,
                 question_id,
                 item.get("confidence"),
                 question_id,
-                _report_questions_set(payload),
-                json.dumps(item, ensure_ascii=False, default=str),
-                json.dumps(
+                view.report_question_set,
+                jsonb(item),
+                jsonb(
                     {
                         "category": item.get("category"),
                         "retrieval_method": item.get("retrieval_method"),
                         "evidence_type": item.get("evidence_type"),
-                    },
-                    ensure_ascii=False,
+                    }
                 ),
-            ),
+            )
+        )
+    if not rows:
+        return
+    cur.executemany(
+        """
+        INSERT INTO workflow.run_records
+        (
+            run_id, record_kind, step, record_key, status, question_id,
+            report_question_set, created_at, updated_at, payload_json, metadata_json
         )
+        VALUES (
+            %s, 'question', 'agentic', %s, %s, %s,
+            %s, NOW(), NOW(), %s, %s
+        )
+        ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+            status = EXCLUDED.status,
+            question_id = EXCLUDED.question_id,
+            report_question_set = COALESCE(EXCLUDED.report_question_set, workflow.run_records.report_question_set),
+            payload_json = EXCLUDED.payload_json,
+            metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+            updated_at = NOW()
+        """,
+        rows,
+    )
 
 
-def _upsert_artifacts(cur, *, run_id: str, report_path: str, payload: Dict[str, Any]) -> None:
+def _upsert_artifacts(cur, *, run_id: str, report_path: str, view: _PayloadView) -> None:
     """Upsert artifacts.
 
     Args:
         cur (Any): Open database cursor.
         run_id (str): Unique workflow run identifier.
         report_path (str): Path to the workflow report file.
-        payload (Dict[str, Any]): Payload data to persist or transmit.
+        view (_PayloadView): Fields extracted from the report payload.
     """
-    artifact_candidates: list[tuple[str, str | None, dict[str, Any]]] = [
-        ("workflow_report_json", report_path, {"source": "workflow.report_path"}),
+    # Candidates carry the producer's digest when the payload already has one,
+    # so only artifacts without a recorded ``sha256``, or changed after the
+    # report was written, are read from disk.
+    artifact_candidates: list[tuple[str, str | None, dict[str, Any], str | None]] = [
+        ("workflow_report_json", report_path, {"source": "workflow.report_path"}, None),
     ]
-    audit = payload.get("audit_artifacts")
-    if isinstance(audit, dict):
+    audit = view.audit_artifacts
+    if audit:
         md = audit.get("markdown") if isinstance(audit.get("markdown"), dict) else {}
         pdf = audit.get("pdf") if isinstance(audit.get("pdf"), dict) else {}
-        artifact_candidates.append(("audit_markdown", md.get("path"), {"status": md.get("status")}))
-        artifact_candidates.append(("audit_pdf", pdf.get("path"), {"status": pdf.get("status")}))
-        artifact_candidates.append(("audit_tex", pdf.get("tex_path"), {"status": pdf.get("status")}))
+        artifact_candidates.append(("audit_markdown", md.get("path"), {"status": md.get("status")}, md.get("sha256")))
+        artifact_candidates.append(("audit_pdf", pdf.get("path"), {"status": pdf.get("status")}, pdf.get("sha256")))
+        artifact_candidates.append(
+            ("audit_tex", pdf.get("tex_path"), {"status": pdf.get("status")}, pdf.get("tex_sha256"))
+        )
 
-    for artifact_type, path_text, meta in artifact_candidates:
+    report_mtime_ns = _mtime_ns(Path(report_path)) if report_path else None
+    rows = []
+    for artifact_type, path_text, meta, known_sha256 in artifact_candidates:
         if not path_text:
             continue
-        path_obj = Path(path_text)
-        sha256 = _sha256_file(path_obj)
-        key = f"{artifact_type}:{path_text}"
-        cur.execute(
-            """
-            INSERT INTO workflow.run_records
-            (
-                run_id, record_kind, step, record_key, status,
-                artifact_type, artifact_path, artifact_sha256,
-                created_at, updated_at, payload_json, metadata_json
-            )
-            VALUES (
-                %s, 'artifact', 'report', %s, %s,
-                %s, %s, %s,
-                NOW(), NOW(), %s::jsonb, %s::jsonb
-            )
-            ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-                status = COALESCE(EXCLUDED.status, workflow.run_records.status),
-                artifact_type = COALESCE(EXCLUDED.artifact_type, workflow.run_records.artifact_type),
-                artifact_path = COALESCE(EXCLUDED.artifact_path, workflow.run_records.artifact_path),
-                artifact_sha256 = COALESCE(EXCLUDED.artifact_sha256, workflow.run_records.artifact_sha256),
-                payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
-                metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-                updated_at = NOW()
-            """,
+        rows.append(
             (
                 run_id,
-                key,
+                f"{artifact_type}:{path_text}",
                 meta.get("status"),
                 artifact_type,
                 str(path_text),
-                sha256,
-                json.dumps(meta or {}, ensure_ascii=False),
-                json.dumps({"source": "report_store"}, ensure_ascii=False),
-            ),
+                _artifact_sha256(Path(path_text), known_sha256, report_mtime_ns),
+                jsonb(meta or {}),
+                _SOURCE_METADATA,
+            )
+        )
+    if not rows:
+        return
+    cur.executemany(
+        """
+        INSERT INTO workflow.run_records
+        (
+            run_id, record_kind, step, record_key, status,
+            artifact_type, artifact_path, artifact_sha256,
+            created_at, updated_at, payload_json, metadata_json
+        )
+        VALUES (
+            %s, 'artifact', 'report', %s, %s,
+            %s, %s, %s,
+            NOW(), NOW(), %s, %s
         )
+        ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+            status = COALESCE(EXCLUDED.status, workflow.run_records.status),
+            artifact_type = COALESCE(EXCLUDED.artifact_type, workflow.run_records.artifact_type),
+            artifact_path = COALESCE(EXCLUDED.artifact_path, workflow.run_records.artifact_path),
+            artifact_sha256 = COALESCE(EXCLUDED.artifact_sha256, workflow.run_records.artifact_sha256),
+            payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
+            metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+            updated_at = NOW()
+        """,
+        rows,
+    )
 
 
 def upsert_workflow_report(
@@ -405,6 +517,8 @@ def upsert_workflow_report(
     report_path: str,
     payload: Dict[str, Any],
     status: str | None = None,
+    commit: bool = True,
+    payload_bytes: bytes | None = None,
 ) -> None:
     """Upsert one workflow report row into the unified workflow ledger.
 
@@ -414,97 +528,91 @@ def upsert_workflow_report(
         report_path (str): Path to the workflow report file.
         payload (Dict[str, Any]): Payload data to persist or transmit.
         status (str | None): Status value to persist for the run or step.
+        commit (bool): Whether to commit before returning. Batch callers pass
+            ``False`` and commit on their own cadence.
+        payload_bytes (bytes | None): ``payload`` already encoded with
+            ``json_bytes``, when the caller has it.
     """
-    cur = conn.cursor()
     now = _utc_now()
-    payload_json = json.dumps(payload, ensure_ascii=False, default=str)
+    # Serialize the payload once: hash the UTF-8 bytes and hand the same buffer
+    # to the jsonb adapter.
+    if payload_bytes is None:
+        payload_bytes = json_bytes(payload)
     workflow_status = (status or infer_workflow_status(payload)).strip().lower() or "completed"
-    started_at = payload.get("started_at")
-    finished_at = payload.get("finished_at")
-    papers_dir = str(payload.get("papers_dir") or "")
-    agentic_status = _agentic_status(payload)
-    question_set = _report_questions_set(payload)
-    report_questions = _report_questions(payload)
-    confidence = _report_question_confidence(payload)
-    confidence_labels = confidence.get("label_counts") if isinstance(confidence.get("label_counts"), dict) else {}
-    confidence_mean = confidence.get("mean")
-    try:
-        confidence_mean = float(confidence_mean) if confidence_mean is not None else None
-    except Exception:
-        confidence_mean = None
-    final_answer = ""
-    agentic_payload = payload.get("agentic")
-    if isinstance(agentic_payload, dict):
-        final_answer = str(agentic_payload.get("final_answer") or "")
-    report_hash = _sha256_text(payload_json)
-    final_answer_hash = _sha256_text(final_answer) if final_answer else None
-    report_question_count = len(report_questions)
-
-    _upsert_run_record(
-        cur,
-        run_id=run_id,
-        status=workflow_status,
-        papers_dir=papers_dir,
-        report_path=report_path,
-        payload=payload,
-    )
-    cur.execute(
-        """
-        INSERT INTO workflow.run_records
-        (
-            run_id, record_kind, step, record_key,
-            status, started_at, finished_at, papers_dir, report_path,
-            agentic_status, report_question_set, report_hash, report_question_count,
-            confidence_mean, confidence_label_counts_json, final_answer_hash,
-            created_at, updated_at, payload_json, metadata_json
+    view = _payload_view(payload)
+    report_hash = _content_hash(payload_bytes)
+    final_answer_hash = _content_hash(view.final_answer.encode("utf-8", errors="ignore")) if view.final_answer else None
+
+    # Pipeline mode queues the run, report, question, and artifact upserts and
+    # flushes them with a single sync, so one report costs one round trip.
+    with conn.pipeline():
+        cur = conn.cursor()
+        _upsert_run_record(
+            cur,
+            run_id=run_id,
+            status=workflow_status,
+            report_path=report_path,
+            view=view,
         )
-        VALUES (
-            %s, 'report', 'report', 'main',
-            %s, %s, %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s::jsonb, %s,
-            %s, %s, %s::jsonb, %s::jsonb
+        cur.execute(
+            """
+            INSERT INTO workflow.run_records
+            (
+                run_id, record_kind, step, record_key,
+                status, started_at, finished_at, papers_dir, report_path,
+                agentic_status, report_question_set, report_hash, report_question_count,
+                confidence_mean, confidence_label_counts_json, final_answer_hash,
+                created_at, updated_at, payload_json, metadata_json
+            )
+            VALUES (
+                %s, 'report', 'report', 'main',
+                %s, %s, %s, %s, %s,
+                %s, %s, %s, %s,
+                %s, %s, %s,
+                %s, %s, %s, %s
+            )
+            ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+                status = EXCLUDED.status,
+                started_at = EXCLUDED.started_at,
+                finished_at = EXCLUDED.finished_at,
+                papers_dir = EXCLUDED.papers_dir,
+                report_path = EXCLUDED.report_path,
+                agentic_status = EXCLUDED.agentic_status,
+                report_question_set = EXCLUDED.report_question_set,
+                report_hash = EXCLUDED.report_hash,
+                report_question_count = EXCLUDED.report_question_count,
+                confidence_mean = EXCLUDED.confidence_mean,
+                confidence_label_counts_json = EXCLUDED.confidence_label_counts_json,
+                final_answer_hash = EXCLUDED.final_answer_hash,
+                payload_json = EXCLUDED.payload_json,
+                metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+                updated_at = EXCLUDED.updated_at
+            """,
+            (
+                run_id,
+                workflow_status,
+                view.started_at,
+                view.finished_at,
+                view.papers_dir,
+                report_path,
+                view.agentic_status,
+                view.report_question_set,
+                report_hash,
+                len(view.report_questions),
+                view.confidence_mean,
+                jsonb(view.confidence_label_counts),
+                final_answer_hash,
+                now,
+                now,
+                jsonb(payload_bytes),
+                _SOURCE_METADATA,
+            ),
+            prepare=True,
         )
-        ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-            status = EXCLUDED.status,
-            started_at = EXCLUDED.started_at,
-            finished_at = EXCLUDED.finished_at,
-            papers_dir = EXCLUDED.papers_dir,
-            report_path = EXCLUDED.report_path,
-            agentic_status = EXCLUDED.agentic_status,
-            report_question_set = EXCLUDED.report_question_set,
-            report_hash = EXCLUDED.report_hash,
-            report_question_count = EXCLUDED.report_question_count,
-            confidence_mean = EXCLUDED.confidence_mean,
-            confidence_label_counts_json = EXCLUDED.confidence_label_counts_json,
-            final_answer_hash = EXCLUDED.final_answer_hash,
-            payload_json = EXCLUDED.payload_json,
-            metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-            updated_at = EXCLUDED.updated_at
-        """,
-        (
-            run_id,
-            workflow_status,
-            started_at,
-            finished_at,
-            papers_dir,
-            report_path,
-            agentic_status,
-            question_set,
-            report_hash,
-            report_question_count,
-            confidence_mean,
-            json.dumps(confidence_labels, ensure_ascii=False),
-            final_answer_hash,
-            now,
-            now,
-            payload_json,
-            json.dumps({"source": "report_store"}, ensure_ascii=False),
-        ),
-    )
-    _upsert_report_questions(cur, run_id=run_id, payload=payload)
-    _upsert_artifacts(cur, run_id=run_id, report_path=report_path, payload=payload)
-    conn.commit()
+        _upsert_report_questions(cur, run_id=run_id, view=view)
+        _upsert_artifacts(cur, run_id=run_id, report_path=report_path, view=view)
+    if commit:
+        conn.commit()
 
 
 def store_workflow_report(
@@ -515,7 +623,10 @@ def store_workflow_report(
     payload: Dict[str, Any],
     status: str | None = None,
 ) -> None:
-    """Connect and store a single workflow report row.
+    """Store a single workflow report row on a pooled connection.
+
+    Reusing pooled connections keeps psycopg's prepared upserts warm across
+    workflow runs in the same process.
 
     Args:
         db_url (str): Postgres connection URL.
@@ -524,12 +635,139 @@ def store_workflow_report(
         payload (Dict[str, Any]): Payload data to persist or transmit.
         status (str | None): Status value to persist for the run or step.
     """
-    conn = connect(db_url, require_migrated=True)
-    try:
+    with pooled_connection(db_url, require_migrated=True) as conn:
         ensure_workflow_report_store(conn)
         upsert_workflow_report(conn, run_id=run_id, report_path=report_path, payload=payload, status=status)
-    finally:
-        conn.close()
+
+
+def _parse_report_file(path: Path) -> Dict[str, Any] | None:
+    """Read and decode one workflow report file.
+
+    Defined at module scope so it can be dispatched to worker processes.
+
+    Args:
+        path (Path): Filesystem path value.
+
+    Returns:
+        Dict[str, Any] | None: Decoded report payload, or `None` when unreadable.
+    """
+    try:
+        payload = json_loads(path.read_bytes())
+    except Exception:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _iter_report_paths(reports_dir: Path, *, recursive: bool) -> Iterator[Path]:
+    """Yield workflow report files in sorted path order as the tree is walked.
+
+    Only one directory listing is held at a time, so backfills start writing
+    before the walk finishes. Visiting each directory's entries in name order
+    reproduces ``sorted(rglob(...))`` ordering.
+
+    Args:
+        reports_dir (Path): Directory to scan.
+        recursive (bool): Whether to descend into subdirectories.
+
+    Yields:
+        Path: Matching report file path.
+    """
+    try:
+        with os.scandir(reports_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+    for entry in entries:
+        if fnmatchcase(entry.name, _REPORT_FILE_PATTERN) and entry.is_file():
+            yield Path(entry.path)
+        if recursive and entry.is_dir(follow_symlinks=False):
+            yield from _iter_report_paths(Path(entry.path), recursive=True)
+
+
+def _start_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """Start the report parser processes.
+
+    With the ``fork`` start method the pool forks every worker on its first
+    task, so a trivial task is run here. Callers start the pool before opening
+    a database connection, which keeps the connection's socket and any
+    connection-owned state out of the children.
+
+    Args:
+        workers (int): Number of parser processes.
+
+    Returns:
+        ProcessPoolExecutor: Pool whose workers are already running.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pool.submit(int).result()
+    except BaseException:
+        pool.shutdown(cancel_futures=True)
+        raise
+    return pool
+
+
+def _iter_parsed_reports(
+    paths: Iterable[Path],
+    *,
+    pool: ProcessPoolExecutor | None,
+    workers: int,
+) -> Iterator[tuple[Path, Dict[str, Any] | None]]:
+    """Yield ``(path, payload)`` pairs in input order, parsing ahead in worker processes.
+
+    At most ``workers * 4`` files are in flight so decoded payloads do not pile
+    up in memory while the caller is busy writing to Postgres.
+
+    Args:
+        paths (Iterable[Path]): Report files to parse.
+        pool (ProcessPoolExecutor | None): Parser pool from ``_start_parse_pool``;
+            `None` parses in-process.
+        workers (int): Number of processes in ``pool``.
+
+    Yields:
+        tuple[Path, Dict[str, Any] | None]: Report path and decoded payload.
+    """
+    if pool is None:
+        for path in paths:
+            yield path, _parse_report_file(path)
+        return
+    remaining = iter(paths)
+    in_flight = deque()
+    for path in remaining:
+        in_flight.append((path, pool.submit(_parse_report_file, path)))
+        if len(in_flight) >= workers * 4:
+            break
+    while in_flight:
+        path, future = in_flight.popleft()
+        next_path = next(remaining, None)
+        if next_path is not None:
+            in_flight.append((next_path, pool.submit(_parse_report_file, next_path)))
+        yield path, future.result()
+
+
+def _stored_report_hashes(cur, run_ids: List[str]) -> Dict[str, tuple[str | None, str | None]]:
+    """Load the stored ``(report_hash, report_path)`` for the given workflow runs.
+
+    Args:
+        cur (Any): Open database cursor.
+        run_ids (List[str]): Run ids to look up.
+
+    Returns:
+        Dict[str, tuple[str | None, str | None]]: Mapping keyed by run id; runs
+        without a stored report are absent.
+    """
+    if not run_ids:
+        return {}
+    cur.execute(
+        """
+        SELECT run_id, report_hash, report_path
+        FROM workflow.run_records
+        WHERE record_kind = 'report' AND step = 'report' AND record_key = 'main'
+          AND run_id = ANY(%s)
+        """,
+        (list(run_ids),),
+    )
+    return {str(row[0]): (row[1], row[2]) for row in cur.fetchall()}
 
 
 def store_workflow_reports_from_dir(
@@ -538,51 +776,101 @@ def store_workflow_reports_from_dir(
     db_url: str,
     recursive: bool = False,
     limit: int = 0,
+    commit_every: int = 100,
+    parse_workers: int = 0,
+    skip_unchanged: bool = True,
 ) -> Dict[str, int]:
     """Backfill workflow report JSON files from disk into Postgres.
 
+    Reports are written in batches of ``commit_every`` files per transaction.
+    Each file runs inside its own savepoint so a bad report is skipped without
+    discarding the rest of the pending batch. Large backfills decode report
+    JSON in worker processes while this process writes to Postgres. Reports
+    whose ``report_hash`` and path already match the ledger are counted as
+    ``unchanged`` and not rewritten.
+
     Args:
         reports_dir (Path): Path to reports dir.
         db_url (str): Postgres connection URL.
         recursive (bool): Whether to enable recursive.
         limit (int): Maximum number of records to process.
+        commit_every (int): Number of stored reports per commit.
+        parse_workers (int): Parser process count. ``0`` picks one per CPU
+            (capped) for large backfills and parses in-process otherwise.
+        skip_unchanged (bool): Whether to skip reports already stored with the
+            same hash and path.
 
     Returns:
         Dict[str, int]: Dictionary containing the computed result payload.
     """
     if not reports_dir.exists():
-        return {"total": 0, "stored": 0, "skipped": 0}
+        return {"total": 0, "stored": 0, "skipped": 0, "unchanged": 0}
 
-    pattern = "workflow-report-*.json"
-    paths = sorted(reports_dir.rglob(pattern) if recursive else reports_dir.glob(pattern))
+    paths: Iterator[Path] = _iter_report_paths(reports_dir, recursive=recursive)
     if limit and limit > 0:
-        paths = paths[:limit]
-
-    conn = connect(db_url, require_migrated=True)
+        paths = islice(paths, limit)
+
+    batch_size = max(1, int(commit_every or 1))
+    workers = int(parse_workers or 0)
+    if workers <= 0:
+        workers = 1
+        head = list(islice(paths, _PARALLEL_PARSE_MIN_FILES))
+        if len(head) >= _PARALLEL_PARSE_MIN_FILES:
+            workers = min(_PARALLEL_PARSE_MAX_WORKERS, os.cpu_count() or 1)
+        paths = chain(head, paths)
+    total = 0
     stored = 0
     skipped = 0
-    try:
+    unchanged = 0
+    pending = 0
+    with ExitStack() as stack:
+        # Parser processes start before the connection opens so they never inherit it.
+        pool = stack.enter_context(_start_parse_pool(workers)) if workers > 1 else None
+        conn = connect(db_url, require_migrated=True)
+        stack.callback(conn.close)
         ensure_workflow_report_store(conn)
-        for path in paths:
-            try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
-            except Exception:
-                skipped += 1
-                continue
-            run_id = str(payload.get("run_id") or path.stem.replace("workflow-report-", ""))
-            report_path = str(payload.get("report_path") or path)
-            try:
-                upsert_workflow_report(
-                    conn,
-                    run_id=run_id,
-                    report_path=report_path,
-                    payload=payload,
-                    status=infer_workflow_status(payload),
-                )
+        cur = conn.cursor()
+        parsed = _iter_parsed_reports(paths, pool=pool, workers=workers)
+        # Files are handled in commit_every-sized chunks: one ledger lookup for
+        # the chunk's run ids, then the upserts, then one commit.
+        for chunk in iter(lambda: list(islice(parsed, batch_size)), []):
+            reports = []
+            for path, payload in chunk:
+                total += 1
+                if payload is None:
+                    skipped += 1
+                    continue
+                run_id = str(payload.get("run_id") or path.stem.replace("workflow-report-", ""))
+                report_path = str(payload.get("report_path") or path)
+                payload_bytes = json_bytes(payload)
+                reports.append((run_id, report_path, payload, payload_bytes, _content_hash(payload_bytes)))
+            known_hashes = _stored_report_hashes(cur, [report[0] for report in reports]) if skip_unchanged else {}
+            for run_id, report_path, payload, payload_bytes, report_hash in reports:
+                if known_hashes.get(run_id) == (report_hash, report_path):
+                    unchanged += 1
+                    continue
+                cur.execute("SAVEPOINT workflow_report_upsert")
+                try:
+                    upsert_workflow_report(
+                        conn,
+                        run_id=run_id,
+                        report_path=report_path,
+                        payload=payload,
+                        status=infer_workflow_status(payload),
+                        commit=False,
+                        payload_bytes=payload_bytes,
+                    )
+                except Exception:
+                    cur.execute("ROLLBACK TO SAVEPOINT workflow_report_upsert")
+                    skipped += 1
+                    continue
+                cur.execute("RELEASE SAVEPOINT workflow_report_upsert")
+                if skip_unchanged:
+                    known_hashes[run_id] = (report_hash, report_path)
                 stored += 1
-            except Exception:
-                skipped += 1
-    finally:
-        conn.close()
+                pending += 1
+            if pending:
+                conn.commit()
+                pending = 0
 
-    return {"total": len(paths), "stored": stored, "skipped": skipped}
+    return {"total": total, "stored": stored, "skipped": skipped, "unchanged": unchanged}
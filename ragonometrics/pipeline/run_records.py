@@ -8,6 +8,23 @@ from __future__ import annotations
 
 from ragonometrics.db.connection import ensure_schema_ready
 
+# Arms flagged as ``is_baseline`` in run metadata.
+BASELINE_ARMS = frozenset({"baseline", "control", "gpt-5"})
+
+
+def is_baseline_arm(arm: str | None) -> bool:
+    """Return whether an experiment arm label names a baseline arm.
+
+    Args:
+        arm (str | None): Experiment arm label, if any.
+
+    Returns:
+        bool: ``True`` when the normalized label is in ``BASELINE_ARMS``.
+    """
+    if not arm:
+        return False
+    return str(arm).strip().lower() in BASELINE_ARMS
+
 
 def ensure_run_records_table(conn) -> None:
     """Validate that workflow ledger schema has already been migrated.
@@ -2,34 +2,149 @@
 
 from __future__ import annotations
 
+import atexit
 import hashlib
-import json
 import os
-from datetime import datetime, timezone
+import queue
+import threading
+import time
+from contextlib import contextmanager, suppress
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from ragonometrics.db.connection import connect
+import orjson
 
-from ragonometrics.pipeline.run_records import ensure_run_records_table
+from ragonometrics.db.connection import is_rejected_statement_error, pooled_connection
+from ragonometrics.db.jsonb import json_bytes, jsonb
+from ragonometrics.pipeline.run_records import is_baseline_arm
 
 # Kept for call-site compatibility; runtime persistence now uses Postgres.
 DEFAULT_STATE_DB = Path("postgres_workflow_state")
 
+# Shared ``{"source": "state"}`` jsonb parameter for run and workstream upserts.
+_SOURCE_METADATA = jsonb(json_bytes({"source": "state"}))
 
-def _utc_now() -> str:
-    """Utc now.
+# Shared ``{}`` parameter for steps recorded without output (e.g. "running").
+_EMPTY_OBJECT_JSONB = jsonb(b"{}")
 
-    Returns:
-        str: Computed string result.
-    """
-    return datetime.now(timezone.utc).isoformat()
+# Step attempt fields stored in metadata_json, in storage order.
+_STEP_META_KEYS = (
+    "step_attempt_id",
+    "attempt_no",
+    "queued_at",
+    "duration_ms",
+    "status_reason",
+    "error_code",
+    "error_message",
+    "worker_id",
+    "retry_of_attempt_id",
+)
+
+_RUN_CONTEXT_SQL = """
+    SELECT config_hash, paper_set_hash, question, report_question_set, workstream_id, arm
+    FROM workflow.run_records
+    WHERE run_id = %s
+      AND record_kind = 'run'
+      AND step = ''
+      AND record_key = 'main'
+    LIMIT 1
+"""
+
+_STEP_INSERT_COLUMNS_SQL = """
+        run_id, record_kind, step, record_key, status,
+        idempotency_key, input_hash, reuse_source_run_id, reuse_source_record_key,
+        started_at, finished_at, created_at, updated_at,
+        output_json, metadata_json
+"""
+
+_STEP_ON_CONFLICT_SQL = """
+    ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+        status = EXCLUDED.status,
+        idempotency_key = COALESCE(EXCLUDED.idempotency_key, workflow.run_records.idempotency_key),
+        input_hash = COALESCE(EXCLUDED.input_hash, workflow.run_records.input_hash),
+        reuse_source_run_id = COALESCE(EXCLUDED.reuse_source_run_id, workflow.run_records.reuse_source_run_id),
+        reuse_source_record_key = COALESCE(EXCLUDED.reuse_source_record_key, workflow.run_records.reuse_source_record_key),
+        started_at = COALESCE(workflow.run_records.started_at, EXCLUDED.started_at),
+        finished_at = COALESCE(EXCLUDED.finished_at, workflow.run_records.finished_at),
+        output_json = CASE
+            WHEN EXCLUDED.output_json = '{}'::jsonb
+                THEN workflow.run_records.output_json
+            ELSE EXCLUDED.output_json
+        END,
+        metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+        updated_at = NOW()
+"""
+
+_STEP_UPSERT_SQL = f"""
+    INSERT INTO workflow.run_records
+    ({_STEP_INSERT_COLUMNS_SQL})
+    VALUES (
+        %s, 'step', %s, 'main', %s,
+        %s, %s, %s, %s,
+        %s, %s, NOW(), NOW(),
+        %s, %s
+    )
+    {_STEP_ON_CONFLICT_SQL}
+"""
+
+# Large append-style batches are loaded with COPY into a transaction-scoped
+# temp table, then merged with the same ON CONFLICT rules in one statement.
+_COPY_MIN_STEPS = 256
+
+_STEP_STAGE_COLUMNS = (
+    "run_id",
+    "step",
+    "status",
+    "idempotency_key",
+    "input_hash",
+    "reuse_source_run_id",
+    "reuse_source_record_key",
+    "started_at",
+    "finished_at",
+    "output_json",
+    "metadata_json",
+)
+
+_STEP_STAGE_CREATE_SQL = """
+    CREATE TEMP TABLE workflow_step_stage (
+        run_id TEXT NOT NULL,
+        step TEXT NOT NULL,
+        status TEXT,
+        idempotency_key TEXT,
+        input_hash TEXT,
+        reuse_source_run_id TEXT,
+        reuse_source_record_key TEXT,
+        started_at TIMESTAMPTZ,
+        finished_at TIMESTAMPTZ,
+        output_json JSONB NOT NULL,
+        metadata_json JSONB NOT NULL
+    ) ON COMMIT DROP
+"""
+
+_STEP_STAGE_COPY_SQL = f"COPY workflow_step_stage ({', '.join(_STEP_STAGE_COLUMNS)}) FROM STDIN"
+
+_STEP_STAGE_MERGE_SQL = f"""
+    INSERT INTO workflow.run_records
+    ({_STEP_INSERT_COLUMNS_SQL})
+    SELECT
+        run_id, 'step', step, 'main', status,
+        idempotency_key, input_hash, reuse_source_run_id, reuse_source_record_key,
+        started_at, finished_at, NOW(), NOW(),
+        output_json, metadata_json
+    FROM workflow_step_stage
+    {_STEP_ON_CONFLICT_SQL}
+"""
 
 
 def _stable_hash(value: Dict[str, Any]) -> str:
-    """Return stable SHA-256 for a JSON-serializable dictionary."""
-    serialized = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
-    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    """Return stable SHA-256 for a JSON-serializable dictionary.
+
+    For the text/None/int fields hashed here, orjson with sorted keys emits the
+    same bytes as compact ``json.dumps(..., sort_keys=True, ensure_ascii=False)``,
+    so stored input hashes and idempotency keys keep matching.
+    """
+    return hashlib.sha256(orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
 
 def _database_url() -> str:
@@ -47,6 +162,23 @@ def _database_url() -> str:
     return db_url
 
 
+def _json_object(value: Any) -> Dict[str, Any]:
+    """Return a decoded ``jsonb`` column as a dict.
+
+    psycopg already decodes ``jsonb`` (see ``ragonometrics.db.jsonb.json_loads``),
+    so anything that is not a dict is treated as empty. Readers use binary
+    cursors: timestamps load from their packed form instead of being parsed
+    from text, and jsonb documents still go through the orjson loader.
+
+    Args:
+        value (Any): Column value.
+
+    Returns:
+        Dict[str, Any]: The value, or an empty dict.
+    """
+    return value if isinstance(value, dict) else {}
+
+
 def _to_iso(value: Any) -> str | None:
     """To iso.
 
@@ -56,28 +188,114 @@ def _to_iso(value: Any) -> str | None:
     Returns:
         str | None: Computed result, or `None` when unavailable.
     """
-    if value is None:
-        return None
-    if hasattr(value, "isoformat"):
-        try:
-            return value.isoformat()
-        except Exception:
-            return str(value)
+    # Timestamp columns load as datetime; metadata timestamps are already text.
+    if value is None or type(value) is str:
+        return value
+    if isinstance(value, date):
+        return value.isoformat()
     return str(value)
 
 
-def _connect(_db_path: Path):
-    """Connect.
+@contextmanager
+def _connect(_db_path: Path, *, autocommit: bool = False) -> Iterator[Any]:
+    """Borrow a pooled connection for one state operation.
+
+    Schema is owned by migrations; ``require_migrated`` verifies the Alembic
+    revision once per DSN per process. The connection goes back to the shared
+    pool on exit instead of being closed, so state writes skip the connect
+    handshake, and fixed-text statements executed with ``prepare=True`` stay
+    prepared on that connection across calls.
 
     Args:
         _db_path (Path): Path to the local SQLite state database.
+        autocommit (bool): Borrow in autocommit mode, for single-statement
+            writes the server commits itself (one round trip instead of the
+            statement plus COMMIT).
 
-    Returns:
-        Any: Return value produced by the operation.
+    Yields:
+        Any: Open database connection.
     """
-    conn = connect(_database_url(), require_migrated=True)
-    ensure_run_records_table(conn)
-    return conn
+    with pooled_connection(_database_url(), require_migrated=True, autocommit=autocommit) as conn:
+        yield conn
+
+
+_RUN_COLUMNS_SQL = """
+    run_id, created_at, started_at, finished_at, status, papers_dir, config_hash,
+    workstream_id, arm, parent_run_id, trigger_source, git_sha, git_branch,
+    paper_set_hash, question, report_question_set, metadata_json, config_effective_json
+"""
+
+
+_RUN_UPSERT_SQL = f"""
+    INSERT INTO workflow.run_records
+    (
+        run_id, record_kind, step, record_key,
+        status, papers_dir, config_hash,
+        workstream_id, arm, parent_run_id, trigger_source, git_sha, git_branch,
+        config_effective_json, paper_set_hash, question, report_question_set,
+        started_at, finished_at, created_at, updated_at,
+        payload_json, metadata_json
+    )
+    VALUES (
+        %s, 'run', '', 'main',
+        %s, %s, %s,
+        %s, %s, %s, %s, %s, %s,
+        %s, %s, %s, %s,
+        %s, %s, NOW(), NOW(),
+        %s, %s
+    )
+    ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+        status = COALESCE(EXCLUDED.status, workflow.run_records.status),
+        papers_dir = COALESCE(EXCLUDED.papers_dir, workflow.run_records.papers_dir),
+        config_hash = COALESCE(EXCLUDED.config_hash, workflow.run_records.config_hash),
+        workstream_id = COALESCE(EXCLUDED.workstream_id, workflow.run_records.workstream_id),
+        arm = COALESCE(EXCLUDED.arm, workflow.run_records.arm),
+        parent_run_id = COALESCE(EXCLUDED.parent_run_id, workflow.run_records.parent_run_id),
+        trigger_source = COALESCE(EXCLUDED.trigger_source, workflow.run_records.trigger_source),
+        git_sha = COALESCE(EXCLUDED.git_sha, workflow.run_records.git_sha),
+        git_branch = COALESCE(EXCLUDED.git_branch, workflow.run_records.git_branch),
+        config_effective_json = CASE
+            WHEN workflow.run_records.config_effective_json IS NULL OR workflow.run_records.config_effective_json = '{{}}'::jsonb
+                THEN EXCLUDED.config_effective_json
+            ELSE workflow.run_records.config_effective_json
+        END,
+        paper_set_hash = COALESCE(EXCLUDED.paper_set_hash, workflow.run_records.paper_set_hash),
+        question = COALESCE(EXCLUDED.question, workflow.run_records.question),
+        report_question_set = COALESCE(EXCLUDED.report_question_set, workflow.run_records.report_question_set),
+        started_at = COALESCE(workflow.run_records.started_at, EXCLUDED.started_at),
+        finished_at = COALESCE(EXCLUDED.finished_at, workflow.run_records.finished_at),
+        payload_json = CASE
+            WHEN workflow.run_records.payload_json IS NULL OR workflow.run_records.payload_json = '{{}}'::jsonb
+                THEN EXCLUDED.payload_json
+            ELSE workflow.run_records.payload_json
+        END,
+        metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+        updated_at = EXCLUDED.updated_at
+    RETURNING {_RUN_COLUMNS_SQL}
+"""
+
+
+_WORKSTREAM_LINK_UPSERT_SQL = """
+    INSERT INTO workflow.run_records
+    (
+        run_id, record_kind, step, record_key,
+        status, workstream_id, arm, parent_run_id,
+        created_at, updated_at, payload_json, metadata_json
+    )
+    VALUES (
+        %s, 'workstream_link', '', %s,
+        %s, %s, %s, %s,
+        NOW(), NOW(), %s, %s
+    )
+    ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
+        status = COALESCE(EXCLUDED.status, workflow.run_records.status),
+        workstream_id = COALESCE(EXCLUDED.workstream_id, workflow.run_records.workstream_id),
+        arm = COALESCE(EXCLUDED.arm, workflow.run_records.arm),
+        parent_run_id = COALESCE(EXCLUDED.parent_run_id, workflow.run_records.parent_run_id),
+        payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
+        metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
+        updated_at = EXCLUDED.updated_at
+"""
 
 
 def create_workflow_run(
@@ -100,7 +318,7 @@ def create_workflow_run(
     paper_set_hash: Optional[str] = None,
     question: Optional[str] = None,
     report_question_set: Optional[str] = None,
-) -> None:
+) -> Dict[str, Any]:
     """Create workflow run.
 
     Args:
@@ -122,126 +340,110 @@ def create_workflow_run(
         paper_set_hash (Optional[str]): Stable hash representing the selected paper set.
         question (Optional[str]): Question text to answer.
         report_question_set (Optional[str]): Structured question set selector.
+
+    Returns:
+        Dict[str, Any]: Merged run as returned by ``get_workflow_run``.
     """
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
-        now = _utc_now()
-        cur.execute(
-            """
-            INSERT INTO workflow.run_records
-            (
-                run_id, record_kind, step, record_key,
-                status, papers_dir, config_hash,
-                workstream_id, arm, parent_run_id, trigger_source, git_sha, git_branch,
-                config_effective_json, paper_set_hash, question, report_question_set,
-                started_at, finished_at, created_at, updated_at,
-                payload_json, metadata_json
-            )
-            VALUES (
-                %s, 'run', '', 'main',
-                %s, %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s::jsonb, %s, %s, %s,
-                %s, %s, %s, %s,
-                %s::jsonb, %s::jsonb
-            )
-            ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-                status = COALESCE(EXCLUDED.status, workflow.run_records.status),
-                papers_dir = COALESCE(EXCLUDED.papers_dir, workflow.run_records.papers_dir),
-                config_hash = COALESCE(EXCLUDED.config_hash, workflow.run_records.config_hash),
-                workstream_id = COALESCE(EXCLUDED.workstream_id, workflow.run_records.workstream_id),
-                arm = COALESCE(EXCLUDED.arm, workflow.run_records.arm),
-                parent_run_id = COALESCE(EXCLUDED.parent_run_id, workflow.run_records.parent_run_id),
-                trigger_source = COALESCE(EXCLUDED.trigger_source, workflow.run_records.trigger_source),
-                git_sha = COALESCE(EXCLUDED.git_sha, workflow.run_records.git_sha),
-                git_branch = COALESCE(EXCLUDED.git_branch, workflow.run_records.git_branch),
-                config_effective_json = CASE
-                    WHEN workflow.run_records.config_effective_json IS NULL OR workflow.run_records.config_effective_json = '{}'::jsonb
-                        THEN EXCLUDED.config_effective_json
-                    ELSE workflow.run_records.config_effective_json
-                END,
-                paper_set_hash = COALESCE(EXCLUDED.paper_set_hash, workflow.run_records.paper_set_hash),
-                question = COALESCE(EXCLUDED.question, workflow.run_records.question),
-                report_question_set = COALESCE(EXCLUDED.report_question_set, workflow.run_records.report_question_set),
-                started_at = COALESCE(workflow.run_records.started_at, EXCLUDED.started_at),
-                finished_at = COALESCE(EXCLUDED.finished_at, workflow.run_records.finished_at),
-                payload_json = CASE
-                    WHEN workflow.run_records.payload_json IS NULL OR workflow.run_records.payload_json = '{}'::jsonb
-                        THEN EXCLUDED.payload_json
-                    ELSE workflow.run_records.payload_json
-                END,
-                metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-                updated_at = EXCLUDED.updated_at
-            """,
-            (
-                run_id,
-                status,
-                papers_dir,
-                config_hash,
-                workstream_id,
-                arm,
-                parent_run_id,
-                trigger_source,
-                git_sha,
-                git_branch,
-                json.dumps(config_effective or {}, ensure_ascii=False),
-                paper_set_hash,
-                question,
-                report_question_set,
-                started_at,
-                finished_at,
-                now,
-                now,
-                json.dumps({"source": "state"}, ensure_ascii=False),
-                json.dumps(metadata or {}, ensure_ascii=False),
-            ),
-        )
-        if workstream_id:
-            cur.execute(
-                """
-                INSERT INTO workflow.run_records
-                (
-                    run_id, record_kind, step, record_key,
-                    status, workstream_id, arm, parent_run_id,
-                    created_at, updated_at, payload_json, metadata_json
-                )
-                VALUES (
-                    %s, 'workstream_link', '', %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s::jsonb, %s::jsonb
-                )
-                ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-                    status = COALESCE(EXCLUDED.status, workflow.run_records.status),
-                    workstream_id = COALESCE(EXCLUDED.workstream_id, workflow.run_records.workstream_id),
-                    arm = COALESCE(EXCLUDED.arm, workflow.run_records.arm),
-                    parent_run_id = COALESCE(EXCLUDED.parent_run_id, workflow.run_records.parent_run_id),
-                    payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
-                    metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-                    updated_at = EXCLUDED.updated_at
-                """,
+    with _connect(db_path) as conn:
+        # Pipeline mode sends the run and workstream-link upserts with one sync.
+        with conn.pipeline():
+            run_cur = conn.cursor(binary=True)
+            run_cur.execute(
+                _RUN_UPSERT_SQL,
                 (
                     run_id,
-                    workstream_id,
                     status,
+                    papers_dir,
+                    config_hash,
                     workstream_id,
                     arm,
                     parent_run_id,
-                    now,
-                    now,
-                    json.dumps(
-                        {
-                            "source_bucket": "current",
-                            "is_baseline": bool(str(arm or "").strip().lower() in {"baseline", "control", "gpt-5"}),
-                        },
-                        ensure_ascii=False,
-                    ),
-                    json.dumps({"source": "state"}, ensure_ascii=False),
+                    trigger_source,
+                    git_sha,
+                    git_branch,
+                    jsonb(config_effective or {}),
+                    paper_set_hash,
+                    question,
+                    report_question_set,
+                    started_at,
+                    finished_at,
+                    _SOURCE_METADATA,
+                    jsonb(metadata or {}),
                 ),
+                prepare=True,
             )
+            if workstream_id:
+                conn.cursor().execute(
+                    _WORKSTREAM_LINK_UPSERT_SQL,
+                    (
+                        run_id,
+                        workstream_id,
+                        status,
+                        workstream_id,
+                        arm,
+                        parent_run_id,
+                        jsonb(
+                            {
+                                "source_bucket": "current",
+                                "is_baseline": is_baseline_arm(arm),
+                            }
+                        ),
+                        _SOURCE_METADATA,
+                    ),
+                    prepare=True,
+                )
+        row = run_cur.fetchone()
         conn.commit()
-    finally:
-        conn.close()
+        return _run_row_to_dict(row)
+
+
+def _run_row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a workflow run row into its public dictionary form.
+
+    Args:
+        row (Any): Row selected with ``_RUN_COLUMNS_SQL``.
+
+    Returns:
+        Dict[str, Any]: Run summary with decoded metadata and effective config.
+    """
+    return {
+        "run_id": row[0],
+        "created_at": _to_iso(row[1]),
+        "started_at": _to_iso(row[2]),
+        "finished_at": _to_iso(row[3]),
+        "status": row[4],
+        "papers_dir": row[5],
+        "config_hash": row[6],
+        "workstream_id": row[7],
+        "arm": row[8],
+        "parent_run_id": row[9],
+        "trigger_source": row[10],
+        "git_sha": row[11],
+        "git_branch": row[12],
+        "paper_set_hash": row[13],
+        "question": row[14],
+        "report_question_set": row[15],
+        "metadata": _json_object(row[16]),
+        "config_effective": _json_object(row[17]),
+    }
+
+
+# Terminal statuses stamp finished_at with the database clock unless the caller
+# supplies one.
+_SET_RUN_STATUS_SQL = """
+    UPDATE workflow.run_records
+    SET status = %s,
+        finished_at = COALESCE(
+            %s::timestamptz,
+            CASE WHEN %s IN ('completed', 'failed') THEN NOW() END,
+            finished_at
+        ),
+        updated_at = NOW()
+    WHERE run_id = %s
+      AND record_kind = 'run'
+      AND step = ''
+      AND record_key = 'main'
+"""
 
 
 def set_workflow_status(db_path: Path, run_id: str, status: str, *, finished_at: Optional[str] = None) -> None:
@@ -253,28 +455,12 @@ def set_workflow_status(db_path: Path, run_id: str, status: str, *, finished_at:
         status (str): Status value to persist for the run or step.
         finished_at (Optional[str]): ISO timestamp when execution finished.
     """
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
-        final_ts = finished_at
-        if final_ts is None and status in {"completed", "failed"}:
-            final_ts = _utc_now()
-        cur.execute(
-            """
-            UPDATE workflow.run_records
-            SET status = %s,
-                finished_at = COALESCE(%s, finished_at),
-                updated_at = NOW()
-            WHERE run_id = %s
-              AND record_kind = 'run'
-              AND step = ''
-              AND record_key = 'main'
-            """,
-            (status, final_ts, run_id),
+    with _connect(db_path, autocommit=True) as conn:
+        conn.cursor().execute(
+            _SET_RUN_STATUS_SQL,
+            (status, finished_at, status, run_id),
+            prepare=True,
         )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def record_step(
@@ -324,118 +510,176 @@ def record_step(
         reuse_source_record_key (Optional[str]): Record key of the reused source result.
         output (Optional[Dict[str, Any]]): Mapping containing output.
     """
-    conn = _connect(db_path)
-    try:
+    record_steps(
+        db_path,
+        [
+            {
+                "run_id": run_id,
+                "step": step,
+                "status": status,
+                "step_attempt_id": step_attempt_id,
+                "attempt_no": attempt_no,
+                "queued_at": queued_at,
+                "started_at": started_at,
+                "finished_at": finished_at,
+                "duration_ms": duration_ms,
+                "status_reason": status_reason,
+                "error_code": error_code,
+                "error_message": error_message,
+                "worker_id": worker_id,
+                "retry_of_attempt_id": retry_of_attempt_id,
+                "idempotency_key": idempotency_key,
+                "input_hash": input_hash,
+                "reuse_source_run_id": reuse_source_run_id,
+                "reuse_source_record_key": reuse_source_record_key,
+                "output": output,
+            }
+        ],
+    )
+
+
+def record_steps(db_path: Path, steps: List[Dict[str, Any]]) -> None:
+    """Record several step events in one transaction.
+
+    Each item takes the same keys as ``record_step`` keyword arguments. Run
+    context is looked up once per distinct run, and the upserts go out through
+    one pipelined ``executemany`` with a single commit. Large batches with no
+    repeated ``(run_id, step)`` are streamed with ``COPY`` into a temp table
+    and merged in a single statement instead.
+
+    Args:
+        db_path (Path): Path to the local SQLite state database.
+        steps (List[Dict[str, Any]]): Step events to persist.
+    """
+    if not steps:
+        return
+    with _connect(db_path) as conn:
         cur = conn.cursor()
-        run_context: Dict[str, Any] = {}
-        cur.execute(
-            """
-            SELECT config_hash, paper_set_hash, question, report_question_set, workstream_id, arm
-            FROM workflow.run_records
-            WHERE run_id = %s
-              AND record_kind = 'run'
-              AND step = ''
-              AND record_key = 'main'
-            LIMIT 1
-            """,
-            (run_id,),
+        run_contexts: Dict[str, Dict[str, Any]] = {}
+        rows = []
+        for item in steps:
+            run_id = str(item["run_id"])
+            if run_id not in run_contexts:
+                run_contexts[run_id] = _load_run_context(cur, run_id)
+            rows.append(_step_params(item, run_contexts[run_id]))
+        if len(rows) == 1:
+            cur.execute(_STEP_UPSERT_SQL, rows[0], prepare=True)
+        elif len(rows) >= _COPY_MIN_STEPS and len({(row[0], row[1]) for row in rows}) == len(rows):
+            # One merge statement may touch each (run_id, step) only once, so the
+            # COPY path is limited to batches without repeated steps.
+            cur.execute(_STEP_STAGE_CREATE_SQL)
+            with cur.copy(_STEP_STAGE_COPY_SQL) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cur.execute(_STEP_STAGE_MERGE_SQL)
+        else:
+            cur.executemany(_STEP_UPSERT_SQL, rows)
+        conn.commit()
+
+
+def _load_run_context(cur, run_id: str) -> Dict[str, Any]:
+    """Load the run fields that key step input/idempotency hashes.
+
+    Args:
+        cur (Any): Open database cursor.
+        run_id (str): Unique workflow run identifier.
+
+    Returns:
+        Dict[str, Any]: Run context, or an empty mapping when the run is unknown.
+    """
+    cur.execute(_RUN_CONTEXT_SQL, (run_id,), prepare=True)
+    run_row = cur.fetchone()
+    if not run_row:
+        return {}
+    return {
+        "config_hash": run_row[0],
+        "paper_set_hash": run_row[1],
+        "question": run_row[2],
+        "report_question_set": run_row[3],
+        "workstream_id": run_row[4],
+        "arm": run_row[5],
+    }
+
+
+def _step_params(item: Dict[str, Any], run_context: Dict[str, Any]) -> tuple:
+    """Build step upsert parameters for one step event.
+
+    Args:
+        item (Dict[str, Any]): Step event with ``record_step`` keyword names.
+        run_context (Dict[str, Any]): Run fields from ``_load_run_context``.
+
+    Returns:
+        tuple: Parameters for ``_STEP_UPSERT_SQL``.
+    """
+    step = item["step"]
+    status = item["status"]
+    output = item.get("output")
+    status_reason = item.get("status_reason")
+    error_code = item.get("error_code")
+    idempotency_key = item.get("idempotency_key")
+    input_hash = item.get("input_hash")
+    reuse_source_run_id = item.get("reuse_source_run_id")
+    reuse_source_record_key = item.get("reuse_source_record_key")
+
+    reused_from = (output or {}).get("_reused_from") if isinstance(output, dict) else None
+    if isinstance(reused_from, dict):
+        if reuse_source_run_id is None:
+            reuse_source_run_id = str(reused_from.get("run_id") or "").strip() or None
+        if reuse_source_record_key is None:
+            reuse_source_record_key = "main"
+
+    if input_hash is None:
+        input_hash = _stable_hash(
+            {
+                "step": step,
+                "status": status,
+                "run_context": run_context,
+                "status_reason": status_reason,
+                "error_code": error_code,
+            }
         )
-        run_row = cur.fetchone()
-        if run_row:
-            run_context = {
-                "config_hash": run_row[0],
-                "paper_set_hash": run_row[1],
-                "question": run_row[2],
-                "report_question_set": run_row[3],
-                "workstream_id": run_row[4],
-                "arm": run_row[5],
+    if idempotency_key is None:
+        idempotency_key = _stable_hash(
+            {
+                "step": step,
+                "run_context": run_context,
+                "input_hash": input_hash,
             }
+        )
 
-        reused_from = (output or {}).get("_reused_from") if isinstance(output, dict) else None
-        if isinstance(reused_from, dict):
-            if reuse_source_run_id is None:
-                reuse_source_run_id = str(reused_from.get("run_id") or "").strip() or None
-            if reuse_source_record_key is None:
-                reuse_source_record_key = "main"
-
-        if input_hash is None:
-            input_hash = _stable_hash(
-                {
-                    "step": step,
-                    "status": status,
-                    "run_context": run_context,
-                    "status_reason": status_reason,
-                    "error_code": error_code,
-                }
-            )
-        if idempotency_key is None:
-            idempotency_key = _stable_hash(
-                {
-                    "step": step,
-                    "run_context": run_context,
-                    "input_hash": input_hash,
-                }
-            )
+    return (
+        item["run_id"],
+        step,
+        status,
+        idempotency_key,
+        input_hash,
+        reuse_source_run_id,
+        reuse_source_record_key,
+        item.get("started_at"),
+        item.get("finished_at"),
+        jsonb(output) if output else _EMPTY_OBJECT_JSONB,
+        jsonb({key: item.get(key) for key in _STEP_META_KEYS}),
+    )
 
-        meta = {
-            "step_attempt_id": step_attempt_id,
-            "attempt_no": attempt_no,
-            "queued_at": queued_at,
-            "duration_ms": duration_ms,
-            "status_reason": status_reason,
-            "error_code": error_code,
-            "error_message": error_message,
-            "worker_id": worker_id,
-            "retry_of_attempt_id": retry_of_attempt_id,
-        }
-        cur.execute(
-            """
-            INSERT INTO workflow.run_records
-            (
-                run_id, record_kind, step, record_key, status,
-                idempotency_key, input_hash, reuse_source_run_id, reuse_source_record_key,
-                started_at, finished_at, created_at, updated_at,
-                output_json, metadata_json
-            )
-            VALUES (
-                %s, 'step', %s, 'main', %s,
-                %s, %s, %s, %s,
-                %s, %s, NOW(), NOW(),
-                %s::jsonb, %s::jsonb
-            )
-            ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
-                status = EXCLUDED.status,
-                idempotency_key = COALESCE(EXCLUDED.idempotency_key, workflow.run_records.idempotency_key),
-                input_hash = COALESCE(EXCLUDED.input_hash, workflow.run_records.input_hash),
-                reuse_source_run_id = COALESCE(EXCLUDED.reuse_source_run_id, workflow.run_records.reuse_source_run_id),
-                reuse_source_record_key = COALESCE(EXCLUDED.reuse_source_record_key, workflow.run_records.reuse_source_record_key),
-                started_at = COALESCE(workflow.run_records.started_at, EXCLUDED.started_at),
-                finished_at = COALESCE(EXCLUDED.finished_at, workflow.run_records.finished_at),
-                output_json = CASE
-                    WHEN EXCLUDED.output_json = '{}'::jsonb
-                        THEN workflow.run_records.output_json
-                    ELSE EXCLUDED.output_json
-                END,
-                metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
-                updated_at = NOW()
-            """,
-            (
-                run_id,
-                step,
-                status,
-                idempotency_key,
-                input_hash,
-                reuse_source_run_id,
-                reuse_source_record_key,
-                started_at,
-                finished_at,
-                json.dumps(output or {}, ensure_ascii=False),
-                json.dumps(meta, ensure_ascii=False),
-            ),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+
+def _text_match_sql(column: str, value: Optional[str], params: List[Any]) -> str:
+    """Build a NULL-as-empty equality filter that keeps the column sargable.
+
+    Matches ``COALESCE(column, '') = value`` without wrapping the column, so a
+    non-empty value compares the column directly.
+
+    Args:
+        column (str): Qualified column name.
+        value (Optional[str]): Value to match; `None` matches like an empty string.
+        params (List[Any]): Query parameters, extended in place.
+
+    Returns:
+        str: SQL fragment starting with ``AND``.
+    """
+    if not value:
+        return f" AND ({column} IS NULL OR {column} = '')"
+    params.append(value)
+    return f" AND {column} = %s"
 
 
 def find_similar_completed_step(
@@ -473,9 +717,8 @@ def find_similar_completed_step(
         Optional[Dict[str, Any]]: Computed result, or `None` when unavailable.
     """
 
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
+    with _connect(db_path) as conn:
+        cur = conn.cursor(binary=True)
         query = """
             SELECT
                 s.run_id,
@@ -511,33 +754,26 @@ def find_similar_completed_step(
             query += " AND r.arm = %s"
             params.append(arm)
         if match_question:
-            query += " AND COALESCE(r.question, '') = %s"
-            params.append(question or "")
+            query += _text_match_sql("r.question", question, params)
         if match_report_question_set:
-            query += " AND COALESCE(r.report_question_set, '') = %s"
-            params.append(report_question_set or "")
+            query += _text_match_sql("r.report_question_set", report_question_set, params)
         query += """
-            ORDER BY COALESCE(s.finished_at, s.updated_at, s.created_at) DESC
+            ORDER BY s.finished_at DESC NULLS LAST, s.updated_at DESC
             LIMIT 1
         """
-        cur.execute(query, params)
+        # Each filter combination is its own statement text; a run only uses a
+        # handful, so they stay in the connection's prepared-statement cache.
+        cur.execute(query, params, prepare=True)
         row = cur.fetchone()
         if not row:
             return None
-        output = row[3] if isinstance(row[3], dict) else {}
-        if not isinstance(output, dict):
-            try:
-                output = json.loads(str(row[3] or "{}"))
-            except Exception:
-                output = {}
+        output = _json_object(row[3])
         return {
             "run_id": row[0],
             "started_at": _to_iso(row[1]),
             "finished_at": _to_iso(row[2]),
             "output": output,
         }
-    finally:
-        conn.close()
 
 
 def find_similar_report_question_items(
@@ -573,9 +809,8 @@ def find_similar_report_question_items(
         Dict[str, Dict[str, Any]]: Dictionary containing the computed result payload.
     """
 
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
+    with _connect(db_path) as conn:
+        cur = conn.cursor(binary=True)
         query = """
             SELECT DISTINCT ON (q.question_id)
                 q.question_id,
@@ -611,26 +846,19 @@ def find_similar_report_question_items(
             query += " AND r.arm = %s"
             params.append(arm)
         if match_question:
-            query += " AND COALESCE(r.question, '') = %s"
-            params.append(question or "")
+            query += _text_match_sql("r.question", question, params)
         if match_report_question_set:
-            query += " AND COALESCE(r.report_question_set, '') = %s"
-            params.append(report_question_set or "")
+            query += _text_match_sql("r.report_question_set", report_question_set, params)
         query += """
             ORDER BY q.question_id, COALESCE(r.finished_at, q.updated_at, q.created_at) DESC
         """
-        cur.execute(query, params)
+        cur.execute(query, params, prepare=True)
         out: Dict[str, Dict[str, Any]] = {}
         for qid, source_run_id, source_finished_at, payload in cur.fetchall():
             question_id = str(qid or "").strip()
             if not question_id:
                 continue
-            item = payload if isinstance(payload, dict) else {}
-            if not isinstance(item, dict):
-                try:
-                    item = json.loads(str(payload or "{}"))
-                except Exception:
-                    item = {}
+            item = _json_object(payload)
             if not item:
                 continue
             out[question_id] = {
@@ -639,8 +867,17 @@ def find_similar_report_question_items(
                 "item": item,
             }
         return out
-    finally:
-        conn.close()
+
+
+_GET_RUN_SQL = f"""
+    SELECT {_RUN_COLUMNS_SQL}
+    FROM workflow.run_records
+    WHERE run_id = %s
+      AND record_kind = 'run'
+      AND step = ''
+      AND record_key = 'main'
+    LIMIT 1
+"""
 
 
 def get_workflow_run(db_path: Path, run_id: str) -> Optional[Dict[str, Any]]:
@@ -653,61 +890,50 @@ def get_workflow_run(db_path: Path, run_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Computed result, or `None` when unavailable.
     """
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT
-                run_id, created_at, started_at, finished_at, status, papers_dir, config_hash,
-                workstream_id, arm, parent_run_id, trigger_source, git_sha, git_branch,
-                paper_set_hash, question, report_question_set, metadata_json, config_effective_json
-            FROM workflow.run_records
-            WHERE run_id = %s
-              AND record_kind = 'run'
-              AND step = ''
-              AND record_key = 'main'
-            LIMIT 1
-            """,
-            (run_id,),
-        )
+    with _connect(db_path) as conn:
+        cur = conn.cursor(binary=True)
+        cur.execute(_GET_RUN_SQL, (run_id,), prepare=True)
         row = cur.fetchone()
-        if not row:
-            return None
-        meta_value = row[16] if isinstance(row[16], dict) else {}
-        if not isinstance(meta_value, dict):
-            try:
-                meta_value = json.loads(str(row[16] or "{}"))
-            except Exception:
-                meta_value = {}
-        config_effective = row[17] if isinstance(row[17], dict) else {}
-        if not isinstance(config_effective, dict):
-            try:
-                config_effective = json.loads(str(row[17] or "{}"))
-            except Exception:
-                config_effective = {}
-        return {
-            "run_id": row[0],
-            "created_at": _to_iso(row[1]),
-            "started_at": _to_iso(row[2]),
-            "finished_at": _to_iso(row[3]),
-            "status": row[4],
-            "papers_dir": row[5],
-            "config_hash": row[6],
-            "workstream_id": row[7],
-            "arm": row[8],
-            "parent_run_id": row[9],
-            "trigger_source": row[10],
-            "git_sha": row[11],
-            "git_branch": row[12],
-            "paper_set_hash": row[13],
-            "question": row[14],
-            "report_question_set": row[15],
-            "metadata": meta_value,
-            "config_effective": config_effective,
-        }
-    finally:
-        conn.close()
+        return _run_row_to_dict(row) if row else None
+
+
+_LIST_STEPS_SQL = """
+    SELECT
+        step, status, started_at, finished_at, output_json, metadata_json
+    FROM workflow.run_records
+    WHERE run_id = %s
+      AND record_kind = 'step'
+    ORDER BY started_at NULLS LAST, step
+"""
+
+
+def _step_row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a workflow step row into its public dictionary form.
+
+    Args:
+        row (Any): Row selected by ``_LIST_STEPS_SQL``.
+
+    Returns:
+        Dict[str, Any]: Step summary with decoded output and attempt metadata.
+    """
+    output = _json_object(row[4])
+    meta = _json_object(row[5])
+    return {
+        "step": row[0],
+        "status": row[1],
+        "step_attempt_id": meta.get("step_attempt_id"),
+        "attempt_no": meta.get("attempt_no"),
+        "queued_at": _to_iso(meta.get("queued_at")),
+        "started_at": _to_iso(row[2]),
+        "finished_at": _to_iso(row[3]),
+        "duration_ms": meta.get("duration_ms"),
+        "status_reason": meta.get("status_reason"),
+        "error_code": meta.get("error_code"),
+        "error_message": meta.get("error_message"),
+        "worker_id": meta.get("worker_id"),
+        "retry_of_attempt_id": meta.get("retry_of_attempt_id"),
+        "output": output,
+    }
 
 
 def list_workflow_steps(db_path: Path, run_id: str) -> List[Dict[str, Any]]:
@@ -720,52 +946,133 @@ def list_workflow_steps(db_path: Path, run_id: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: Dictionary containing the computed result payload.
     """
-    conn = _connect(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT
-                step, status, started_at, finished_at, output_json, metadata_json
-            FROM workflow.run_records
-            WHERE run_id = %s
-              AND record_kind = 'step'
-            ORDER BY started_at NULLS LAST, step
-            """,
-            (run_id,),
-        )
-        out: List[Dict[str, Any]] = []
-        for row in cur.fetchall():
-            output = row[4] if isinstance(row[4], dict) else {}
-            if not isinstance(output, dict):
-                try:
-                    output = json.loads(str(row[4] or "{}"))
-                except Exception:
-                    output = {}
-            meta = row[5] if isinstance(row[5], dict) else {}
-            if not isinstance(meta, dict):
+    with _connect(db_path) as conn:
+        cur = conn.cursor(binary=True)
+        cur.execute(_LIST_STEPS_SQL, (run_id,), prepare=True)
+        return [_step_row_to_dict(row) for row in cur.fetchall()]
+
+
+_STEP_WRITER_BATCH = 256
+_STEP_WRITER_WAIT_SECONDS = 0.05
+
+
+class _StepWriter:
+    """Background writer that drains queued step events into ``record_steps`` batches."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Path, Dict[str, Any]]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._errors: Dict[str, BaseException] = {}
+
+    def submit(self, db_path: Path, step: Dict[str, Any]) -> None:
+        """Queue one step event, starting the writer thread on first use.
+
+        Args:
+            db_path (Path): Path to the local SQLite state database.
+            step (Dict[str, Any]): Step event with ``record_step`` keyword names.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="workflow-step-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((db_path, step))
+
+    def flush(self, run_id: Optional[str] = None) -> None:
+        """Block until every queued step is written, re-raising a failed write's error.
+
+        Args:
+            run_id (Optional[str]): Raise the first error recorded for this run.
+                When omitted, only wait; errors stay with their runs.
+
+        Raises:
+            BaseException: The first error raised writing the run's steps since its last flush.
+        """
+        self._queue.join()
+        if run_id is None:
+            return
+        with self._lock:
+            error = self._errors.pop(str(run_id), None)
+        if error is not None:
+            raise error
+
+    def _record_error(self, run_id: Any, exc: BaseException) -> None:
+        with self._lock:
+            self._errors.setdefault(str(run_id), exc)
+
+    def _write(self, db_path: Path, steps: List[Dict[str, Any]]) -> None:
+        try:
+            record_steps(db_path, steps)
+            return
+        except BaseException as exc:  # surfaced by flush()
+            if not is_rejected_statement_error(exc):
+                for step in steps:
+                    self._record_error(step.get("run_id"), exc)
+                return
+        # The server rejected the batch: write its steps one by one so only the
+        # bad events are lost.
+        for step in steps:
+            try:
+                record_steps(db_path, [step])
+            except BaseException as exc:
+                self._record_error(step.get("run_id"), exc)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _STEP_WRITER_WAIT_SECONDS
+            while len(batch) < _STEP_WRITER_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
                 try:
-                    meta = json.loads(str(row[5] or "{}"))
-                except Exception:
-                    meta = {}
-            out.append(
-                {
-                    "step": row[0],
-                    "status": row[1],
-                    "step_attempt_id": meta.get("step_attempt_id"),
-                    "attempt_no": meta.get("attempt_no"),
-                    "queued_at": _to_iso(meta.get("queued_at")),
-                    "started_at": _to_iso(row[2]),
-                    "finished_at": _to_iso(row[3]),
-                    "duration_ms": meta.get("duration_ms"),
-                    "status_reason": meta.get("status_reason"),
-                    "error_code": meta.get("error_code"),
-                    "error_message": meta.get("error_message"),
-                    "worker_id": meta.get("worker_id"),
-                    "retry_of_attempt_id": meta.get("retry_of_attempt_id"),
-                    "output": output,
-                }
-            )
-        return out
-    finally:
-        conn.close()
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                by_path: Dict[Path, List[Dict[str, Any]]] = {}
+                for db_path, step in batch:
+                    by_path.setdefault(db_path, []).append(step)
+                for db_path, steps in by_path.items():
+                    self._write(db_path, steps)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_STEP_WRITER = _StepWriter()
+
+
+def record_step_async(db_path: Path, **step: Any) -> None:
+    """Queue a step event for the background writer instead of committing it now.
+
+    Queued events are written in arrival order, up to 256 per commit, after at
+    most ~50 ms. Call ``flush_steps`` before relying on them being persisted.
+
+    Args:
+        db_path (Path): Path to the local SQLite state database.
+        **step (Any): Keyword arguments accepted by ``record_step``.
+    """
+    _STEP_WRITER.submit(db_path, step)
+
+
+def flush_steps(run_id: Optional[str] = None) -> None:
+    """Wait until all steps queued with ``record_step_async`` are committed.
+
+    Args:
+        run_id (Optional[str]): Raise the first error from writing this run's
+            steps. When omitted, only wait for the queue to drain.
+
+    Raises:
+        BaseException: The first error raised writing the run's steps since its last flush.
+    """
+    _STEP_WRITER.flush(run_id)
+
+
+def _flush_steps_at_exit() -> None:
+    """Write pending step events before interpreter shutdown."""
+    with suppress(Exception):
+        flush_steps()
+
+
+atexit.register(_flush_steps_at_exit)
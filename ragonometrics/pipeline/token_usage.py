@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-import json
+import atexit
+import contextlib
 import os
+import queue
+import threading
+import time
 from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from ragonometrics.db.connection import pooled_connection
+from ragonometrics.db.connection import is_rejected_statement_error, pooled_connection
+from ragonometrics.db.jsonb import jsonb
 
 # Kept for call-site compatibility; runtime persistence now uses Postgres.
 DEFAULT_USAGE_DB = Path("postgres_token_usage")
@@ -39,6 +46,154 @@ def _database_url() -> str:
     return db_url
 
 
+_USAGE_COLUMNS = (
+    "model",
+    "operation",
+    "step",
+    "question_id",
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "project_id",
+    "persona_id",
+    "session_id",
+    "request_id",
+    "provider_request_id",
+    "latency_ms",
+    "cache_hit",
+    "cost_usd_input",
+    "cost_usd_output",
+    "cost_usd_total",
+    "run_id",
+)
+# Rows without meta leave the column to its '{}' DEFAULT instead of binding it.
+_INSERT_USAGE_DEFAULT_META_SQL = (
+    f"INSERT INTO observability.token_usage (created_at, {', '.join(_USAGE_COLUMNS)}) "
+    f"VALUES (NOW(), {', '.join(['%s'] * len(_USAGE_COLUMNS))})"
+)
+_INSERT_USAGE_SQL = (
+    f"INSERT INTO observability.token_usage (created_at, {', '.join(_USAGE_COLUMNS)}, meta) "
+    f"VALUES (NOW(), {', '.join(['%s'] * len(_USAGE_COLUMNS))}, %s)"
+)
+# Usage rows are telemetry: commit without waiting for the WAL flush.
+# set_config(..., true) is SET LOCAL in a form that can be prepared.
+_ASYNC_COMMIT_SQL = "SELECT set_config('synchronous_commit', 'off', true)"
+# Large writer batches stream through COPY; created_at takes its NOW() default.
+_COPY_MIN_USAGE_ROWS = 256
+_USAGE_COPY_SQL = f"COPY observability.token_usage ({', '.join(_USAGE_COLUMNS)}, meta) FROM STDIN"
+_EMPTY_META_JSONB = jsonb(b"{}")
+_USAGE_QUEUE_MAX = 10_000
+# Dashboards poll the same aggregates; serve repeats from memory for a few seconds.
+_USAGE_CACHE_SIZE = 256
+_USAGE_CACHE_SECONDS = 5
+_USAGE_WRITER_BATCH = 1000
+_USAGE_WRITER_WAIT_SECONDS = 0.25
+
+
+def _usage_params(
+    *,
+    model: str,
+    operation: str,
+    input_tokens: int,
+    output_tokens: int,
+    total_tokens: int,
+    session_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    step: Optional[str] = None,
+    question_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    persona_id: Optional[str] = None,
+    provider_request_id: Optional[str] = None,
+    latency_ms: Optional[int] = None,
+    cache_hit: Optional[bool] = None,
+    cost_usd_input: Optional[float] = None,
+    cost_usd_output: Optional[float] = None,
+    cost_usd_total: Optional[float] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> tuple:
+    """Build ``_INSERT_USAGE_SQL`` parameters for one usage event.
+
+    Identifiers missing from the arguments are filled from ``meta`` when present.
+    See ``record_usage`` for the arguments.
+
+    Returns:
+        tuple: Insert parameters in ``_USAGE_COLUMNS`` order, followed by
+        ``meta`` only when it is non-empty.
+    """
+    resolved_run_id = run_id
+    resolved_step = step
+    resolved_question_id = question_id
+    resolved_project_id = str(project_id or "").strip() or None
+    resolved_persona_id = str(persona_id or "").strip() or None
+    if isinstance(meta, dict):
+        if resolved_run_id is None:
+            resolved_run_id = meta.get("run_id")
+        if resolved_step is None:
+            resolved_step = meta.get("step")
+        if resolved_question_id is None:
+            resolved_question_id = meta.get("question_id")
+        if resolved_project_id is None:
+            resolved_project_id = str(meta.get("project_id") or "").strip() or None
+        if resolved_persona_id is None:
+            resolved_persona_id = str(meta.get("persona_id") or "").strip() or None
+    params = (
+        model,
+        operation,
+        resolved_step,
+        resolved_question_id,
+        int(input_tokens),
+        int(output_tokens),
+        int(total_tokens),
+        resolved_project_id,
+        resolved_persona_id,
+        session_id,
+        request_id,
+        provider_request_id,
+        int(latency_ms) if latency_ms is not None else None,
+        cache_hit,
+        float(cost_usd_input) if cost_usd_input is not None else None,
+        float(cost_usd_output) if cost_usd_output is not None else None,
+        float(cost_usd_total) if cost_usd_total is not None else None,
+        str(resolved_run_id) if resolved_run_id is not None else None,
+    )
+    if meta:
+        return params + (jsonb(meta),)
+    return params
+
+
+def _insert_usage_rows(rows: List[tuple]) -> None:
+    """Insert usage rows on one pooled connection under a single commit.
+
+    Batches of at least 256 rows are loaded with COPY instead of ``executemany``.
+    The commit does not wait for the WAL flush: a crash may lose the last few
+    hundred milliseconds of usage telemetry, never leave it half-written.
+
+    Args:
+        rows (List[tuple]): Parameters built by ``_usage_params``.
+    """
+    width = len(_USAGE_COLUMNS)
+    with pooled_connection(_database_url(), require_migrated=True) as conn:
+        cur = conn.cursor()
+        if len(rows) >= _COPY_MIN_USAGE_ROWS:
+            cur.execute(_ASYNC_COMMIT_SQL, prepare=True)
+            with cur.copy(_USAGE_COPY_SQL) as copy:
+                for row in rows:
+                    copy.write_row(row if len(row) > width else row + (_EMPTY_META_JSONB,))
+        else:
+            with_meta = [row for row in rows if len(row) > width]
+            without_meta = [row for row in rows if len(row) == width]
+            with conn.pipeline():
+                cur.execute(_ASYNC_COMMIT_SQL, prepare=True)
+                for sql, group in ((_INSERT_USAGE_SQL, with_meta), (_INSERT_USAGE_DEFAULT_META_SQL, without_meta)):
+                    if len(group) == 1:
+                        cur.execute(sql, group[0], prepare=True)
+                    elif group:
+                        cur.executemany(sql, group)
+        conn.commit()
+    _clear_usage_caches()
+
+
 def record_usage(
     *,
     db_path: Path = DEFAULT_USAGE_DB,
@@ -84,69 +239,224 @@ def record_usage(
         cost_usd_total (Optional[float]): Input value for cost usd total.
         meta (Optional[Dict[str, Any]]): Additional metadata dictionary.
     """
-    with pooled_connection(_database_url(), require_migrated=True) as conn:
-        resolved_run_id = run_id
-        resolved_step = step
-        resolved_question_id = question_id
-        resolved_project_id = str(project_id or "").strip() or None
-        resolved_persona_id = str(persona_id or "").strip() or None
-        if isinstance(meta, dict):
-            if resolved_run_id is None:
-                resolved_run_id = meta.get("run_id")
-            if resolved_step is None:
-                resolved_step = meta.get("step")
-            if resolved_question_id is None:
-                resolved_question_id = meta.get("question_id")
-            if resolved_project_id is None:
-                resolved_project_id = str(meta.get("project_id") or "").strip() or None
-            if resolved_persona_id is None:
-                resolved_persona_id = str(meta.get("persona_id") or "").strip() or None
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO observability.token_usage
-            (
-                created_at, model, operation, step, question_id,
-                input_tokens, output_tokens, total_tokens,
-                project_id, persona_id,
-                session_id, request_id, provider_request_id,
-                latency_ms, cache_hit,
-                cost_usd_input, cost_usd_output, cost_usd_total,
-                run_id, meta
+    _insert_usage_rows(
+        [
+            _usage_params(
+                model=model,
+                operation=operation,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=total_tokens,
+                session_id=session_id,
+                request_id=request_id,
+                run_id=run_id,
+                step=step,
+                question_id=question_id,
+                project_id=project_id,
+                persona_id=persona_id,
+                provider_request_id=provider_request_id,
+                latency_ms=latency_ms,
+                cache_hit=cache_hit,
+                cost_usd_input=cost_usd_input,
+                cost_usd_output=cost_usd_output,
+                cost_usd_total=cost_usd_total,
+                meta=meta,
             )
-            VALUES (
-                NOW(), %s, %s, %s, %s,
-                %s, %s, %s,
-                %s, %s,
-                %s, %s, %s,
-                %s, %s,
-                %s, %s, %s,
-                %s, %s::jsonb
-            )
-            """,
-            (
-                model,
-                operation,
-                resolved_step,
-                resolved_question_id,
-                int(input_tokens),
-                int(output_tokens),
-                int(total_tokens),
-                resolved_project_id,
-                resolved_persona_id,
-                session_id,
-                request_id,
-                provider_request_id,
-                int(latency_ms) if latency_ms is not None else None,
-                cache_hit,
-                float(cost_usd_input) if cost_usd_input is not None else None,
-                float(cost_usd_output) if cost_usd_output is not None else None,
-                float(cost_usd_total) if cost_usd_total is not None else None,
-                str(resolved_run_id) if resolved_run_id is not None else None,
-                json.dumps(meta or {}, ensure_ascii=False),
-            ),
-        )
-        conn.commit()
+        ]
+    )
+
+
+def _insert_usage_rows_individually(rows: List[tuple]) -> BaseException | None:
+    """Insert rows one per commit after their batch failed, so one bad row loses only itself.
+
+    Stops at the first failure that is not a rejected row.
+
+    Args:
+        rows (List[tuple]): Parameters built by ``_usage_params``.
+
+    Returns:
+        BaseException | None: The first error raised, or `None` when every row was inserted.
+    """
+    first_error: BaseException | None = None
+    for row in rows:
+        try:
+            _insert_usage_rows([row])
+        except BaseException as exc:
+            first_error = first_error or exc
+            if not is_rejected_statement_error(exc):
+                break
+    return first_error
+
+
+class _UsageWriter:
+    """Background writer that drains queued usage rows into batched inserts."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple] = queue.Queue(maxsize=_USAGE_QUEUE_MAX)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    def submit(self, row: tuple) -> None:
+        """Queue one usage row, inserting it inline when the queue is full.
+
+        Args:
+            row (tuple): Parameters built by ``_usage_params``.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="token-usage-writer", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            _insert_usage_rows([row])
+
+    def flush(self) -> None:
+        """Block until every queued row is written, re-raising a failed batch's error.
+
+        Raises:
+            BaseException: The first error raised by a background batch since the last flush.
+        """
+        self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _USAGE_WRITER_WAIT_SECONDS
+            while len(batch) < _USAGE_WRITER_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                _insert_usage_rows(batch)
+            except BaseException as exc:  # surfaced by flush()
+                error = _insert_usage_rows_individually(batch) if is_rejected_statement_error(exc) else exc
+                if self._error is None and error is not None:
+                    self._error = error
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_USAGE_WRITER = _UsageWriter()
+
+
+def record_usage_async(*, db_path: Path = DEFAULT_USAGE_DB, **usage: Any) -> None:
+    """Queue a token usage record for the background writer.
+
+    Queued records are inserted up to 1000 per commit, after at most ~250 ms.
+    When 10,000 records are already pending, the record is inserted inline.
+    Call ``flush_usage`` before reading records back.
+
+    Args:
+        db_path (Path): Path to the local SQLite state database.
+        **usage (Any): Keyword arguments accepted by ``record_usage``.
+    """
+    _USAGE_WRITER.submit(_usage_params(**usage))
+
+
+def flush_usage() -> None:
+    """Wait until all records queued with ``record_usage_async`` are committed.
+
+    Raises:
+        BaseException: The first error raised by a background batch since the last flush.
+    """
+    _USAGE_WRITER.flush()
+
+
+def _flush_usage_at_exit() -> None:
+    """Write pending usage records before interpreter shutdown."""
+    with contextlib.suppress(Exception):
+        flush_usage()
+
+
+atexit.register(_flush_usage_at_exit)
+
+
+@dataclass(frozen=True)
+class _UsageSource:
+    """Table and column expressions that aggregate usage rows."""
+
+    table: str
+    calls: str
+    model: str
+    time_column: str
+
+
+_USAGE_EVENTS = _UsageSource("observability.token_usage", "COUNT(*)", "model", "created_at")
+_USAGE_HOURLY = _UsageSource("observability.token_usage_hourly", "COALESCE(SUM(calls), 0)", "NULLIF(model, '')", "bucket")
+
+
+def _is_hour_aligned(since: Optional[str]) -> bool:
+    """Return whether ``since`` falls on a UTC hour boundary of the rollup.
+
+    Args:
+        since (Optional[str]): ISO timestamp lower bound, or `None`.
+
+    Returns:
+        bool: True when ``since`` is unset or an offset-aware whole UTC hour.
+    """
+    if not since:
+        return True
+    try:
+        parsed = datetime.fromisoformat(since)
+    except ValueError:
+        return False
+    if parsed.tzinfo is None:
+        return False
+    parsed = parsed.astimezone(timezone.utc)
+    return parsed.minute == 0 and parsed.second == 0 and parsed.microsecond == 0
+
+
+def _usage_source(*, request_id: Optional[str], since: Optional[str]) -> _UsageSource:
+    """Pick the hourly rollup when the filters line up with its rows.
+
+    The rollup is keyed by UTC hour, model and session, so request filters and
+    mid-hour ``since`` bounds fall back to the raw usage events.
+
+    Args:
+        request_id (Optional[str]): Request identifier.
+        since (Optional[str]): Input value for since.
+
+    Returns:
+        _UsageSource: Source to aggregate.
+    """
+    if request_id or not _is_hour_aligned(since):
+        return _USAGE_EVENTS
+    return _USAGE_HOURLY
+
+
+def _build_where_sql(mask: int, time_column: str) -> str:
+    """Build the WHERE clause for one filter combination.
+
+    Args:
+        mask (int): Bit 1 session_id, bit 2 request_id, bit 4 since.
+        time_column (str): Timestamp column compared against ``since``.
+
+    Returns:
+        str: WHERE clause with ``%s`` placeholders, or an empty string.
+    """
+    clauses = [
+        clause
+        for bit, clause in ((1, "session_id = %s"), (2, "request_id = %s"), (4, f"{time_column} >= %s"))
+        if mask & bit
+    ]
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+_WHERE_SQL = {
+    (time_column, mask): _build_where_sql(mask, time_column)
+    for time_column in (_USAGE_EVENTS.time_column, _USAGE_HOURLY.time_column)
+    for mask in range(8)
+}
 
 
 def _where_clauses(
@@ -154,64 +464,80 @@ def _where_clauses(
     session_id: Optional[str],
     request_id: Optional[str],
     since: Optional[str],
+    time_column: str = "created_at",
 ) -> tuple[str, List[Any]]:
     """Where clauses.
 
+    Each filter combination maps to fixed SQL text, built once at import, so
+    the reporting queries built from it stay prepared per pooled connection
+    when run with ``prepare=True``.
+
     Args:
         session_id (Optional[str]): Session identifier.
         request_id (Optional[str]): Request identifier.
         since (Optional[str]): Input value for since.
+        time_column (str): Timestamp column compared against ``since``.
 
     Returns:
         tuple[str, List[Any]]: List result produced by the operation.
     """
-    clauses = []
-    params: List[Any] = []
-    if session_id:
-        clauses.append("session_id = %s")
-        params.append(session_id)
-    if request_id:
-        clauses.append("request_id = %s")
-        params.append(request_id)
-    if since:
-        clauses.append("created_at >= %s")
-        params.append(since)
-    if clauses:
-        return " WHERE " + " AND ".join(clauses), params
-    return "", params
+    mask = (1 if session_id else 0) | (2 if request_id else 0) | (4 if since else 0)
+    params: List[Any] = [value for value in (session_id, request_id, since) if value]
+    return _WHERE_SQL[time_column, mask], params
 
 
-def get_usage_summary(
-    *,
-    db_path: Path = DEFAULT_USAGE_DB,
-    session_id: Optional[str] = None,
-    request_id: Optional[str] = None,
-    since: Optional[str] = None,
+def _usage_cache_window() -> int:
+    """Return the current usage cache window number.
+
+    Returns:
+        int: Monotonic clock divided into ``_USAGE_CACHE_SECONDS`` windows.
+    """
+    return int(time.monotonic() // _USAGE_CACHE_SECONDS)
+
+
+def _clear_usage_caches() -> None:
+    """Drop cached aggregates so this process reads its own usage writes."""
+    _usage_summary.cache_clear()
+    _usage_by_model.cache_clear()
+
+
+@lru_cache(maxsize=_USAGE_CACHE_SIZE)
+def _usage_summary(
+    db_url: str,
+    session_id: Optional[str],
+    request_id: Optional[str],
+    since: Optional[str],
+    _window: int,
 ) -> UsageSummary:
-    """Return aggregate usage stats.
+    """Query aggregate usage stats for ``get_usage_summary``.
 
     Args:
-        db_path (Path): Path to the local SQLite state database.
+        db_url (str): Postgres connection URL.
         session_id (Optional[str]): Session identifier.
         request_id (Optional[str]): Request identifier.
         since (Optional[str]): Input value for since.
+        _window (int): Cache window; a new value forces a fresh query.
 
     Returns:
         UsageSummary: Result produced by the operation.
     """
-    with pooled_connection(_database_url(), require_migrated=True) as conn:
-        where_sql, params = _where_clauses(session_id=session_id, request_id=request_id, since=since)
+    with pooled_connection(db_url, require_migrated=True, autocommit=True) as conn:
+        source = _usage_source(request_id=request_id, since=since)
+        where_sql, params = _where_clauses(
+            session_id=session_id, request_id=request_id, since=since, time_column=source.time_column
+        )
         cur = conn.cursor()
         cur.execute(
             f"""
-            SELECT COUNT(*),
+            SELECT {source.calls},
                    COALESCE(SUM(input_tokens), 0),
                    COALESCE(SUM(output_tokens), 0),
                    COALESCE(SUM(total_tokens), 0)
-            FROM observability.token_usage
+            FROM {source.table}
             {where_sql}
             """,
             params,
+            prepare=True,
         )
         row = cur.fetchone()
         return UsageSummary(
@@ -222,14 +548,17 @@ def get_usage_summary(
         )
 
 
-def get_usage_by_model(
+def get_usage_summary(
     *,
     db_path: Path = DEFAULT_USAGE_DB,
     session_id: Optional[str] = None,
     request_id: Optional[str] = None,
     since: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """Return aggregated usage totals grouped by model.
+) -> UsageSummary:
+    """Return aggregate usage stats.
+
+    Results are cached per filter set for up to 5 seconds; usage written by
+    this process clears the cache.
 
     Args:
         db_path (Path): Path to the local SQLite state database.
@@ -238,28 +567,133 @@ def get_usage_by_model(
         since (Optional[str]): Input value for since.
 
     Returns:
-        List[Dict[str, Any]]: Dictionary containing the computed result payload.
+        UsageSummary: Result produced by the operation.
     """
-    with pooled_connection(_database_url(), require_migrated=True) as conn:
-        where_sql, params = _where_clauses(session_id=session_id, request_id=request_id, since=since)
+    return _usage_summary(_database_url(), session_id, request_id, since, _usage_cache_window())
+
+
+@lru_cache(maxsize=_USAGE_CACHE_SIZE)
+def _usage_by_model(
+    db_url: str,
+    session_id: Optional[str],
+    request_id: Optional[str],
+    since: Optional[str],
+    _window: int,
+) -> tuple[Dict[str, Any], ...]:
+    """Query per-model usage totals for ``get_usage_by_model``.
+
+    Args:
+        db_url (str): Postgres connection URL.
+        session_id (Optional[str]): Session identifier.
+        request_id (Optional[str]): Request identifier.
+        since (Optional[str]): Input value for since.
+        _window (int): Cache window; a new value forces a fresh query.
+
+    Returns:
+        tuple[Dict[str, Any], ...]: Rows ordered by total tokens, descending.
+    """
+    with pooled_connection(db_url, require_migrated=True, autocommit=True) as conn:
+        source = _usage_source(request_id=request_id, since=since)
+        where_sql, params = _where_clauses(
+            session_id=session_id, request_id=request_id, since=since, time_column=source.time_column
+        )
         cur = conn.cursor()
         cur.execute(
             f"""
-            SELECT model,
-                   COUNT(*) AS calls,
+            SELECT {source.model} AS model,
+                   {source.calls} AS calls,
                    COALESCE(SUM(total_tokens), 0) AS total_tokens
-            FROM observability.token_usage
+            FROM {source.table}
             {where_sql}
-            GROUP BY model
+            GROUP BY {source.model}
             ORDER BY total_tokens DESC
             """,
             params,
+            prepare=True,
         )
         rows = cur.fetchall()
-        return [
+        return tuple(
             {"model": row[0], "calls": int(row[1] or 0), "total_tokens": int(row[2] or 0)}
             for row in rows
-        ]
+        )
+
+
+def get_usage_by_model(
+    *,
+    db_path: Path = DEFAULT_USAGE_DB,
+    session_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    since: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Return aggregated usage totals grouped by model.
+
+    Cached like ``get_usage_summary``.
+
+    Args:
+        db_path (Path): Path to the local SQLite state database.
+        session_id (Optional[str]): Session identifier.
+        request_id (Optional[str]): Request identifier.
+        since (Optional[str]): Input value for since.
+
+    Returns:
+        List[Dict[str, Any]]: Dictionary containing the computed result payload.
+    """
+    rows = _usage_by_model(_database_url(), session_id, request_id, since, _usage_cache_window())
+    return [dict(row) for row in rows]
+
+
+def _recent_usage_query(
+    *,
+    limit: int,
+    session_id: Optional[str],
+    request_id: Optional[str],
+) -> tuple[str, List[Any]]:
+    """Build the newest-first usage rows query.
+
+    Args:
+        limit (int): Maximum number of records to process.
+        session_id (Optional[str]): Session identifier.
+        request_id (Optional[str]): Request identifier.
+
+    Returns:
+        tuple[str, List[Any]]: SQL text and its parameters.
+    """
+    where_sql, params = _where_clauses(session_id=session_id, request_id=request_id, since=None)
+    params.append(int(limit))
+    sql = f"""
+        SELECT created_at, model, operation, step, question_id, input_tokens, output_tokens, total_tokens, session_id, request_id, run_id
+        FROM observability.token_usage
+        {where_sql}
+        ORDER BY created_at DESC
+        LIMIT %s
+    """
+    return sql, params
+
+
+def _recent_usage_row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a ``_recent_usage_query`` row to its payload.
+
+    Args:
+        row (Any): Result row.
+
+    Returns:
+        Dict[str, Any]: Usage row payload.
+    """
+    created_at = row[0]
+    return {
+        # TIMESTAMPTZ loads as datetime; only the SQLite-backed tests return text.
+        "created_at": created_at if type(created_at) is str else created_at.isoformat(),
+        "model": row[1],
+        "operation": row[2],
+        "step": row[3],
+        "question_id": row[4],
+        "input_tokens": int(row[5] or 0),
+        "output_tokens": int(row[6] or 0),
+        "total_tokens": int(row[7] or 0),
+        "session_id": row[8],
+        "request_id": row[9],
+        "run_id": row[10],
+    }
 
 
 def get_recent_usage(
@@ -280,34 +714,10 @@ def get_recent_usage(
     Returns:
         List[Dict[str, Any]]: Dictionary containing the computed result payload.
     """
-    with pooled_connection(_database_url(), require_migrated=True) as conn:
-        where_sql, params = _where_clauses(session_id=session_id, request_id=request_id, since=None)
-        params.append(int(limit))
+    with pooled_connection(_database_url(), require_migrated=True, autocommit=True) as conn:
+        sql, params = _recent_usage_query(limit=limit, session_id=session_id, request_id=request_id)
         cur = conn.cursor()
-        cur.execute(
-            f"""
-            SELECT created_at, model, operation, step, question_id, input_tokens, output_tokens, total_tokens, session_id, request_id, run_id
-            FROM observability.token_usage
-            {where_sql}
-            ORDER BY created_at DESC
-            LIMIT %s
-            """,
-            params,
-        )
+        cur.execute(sql, params, prepare=True)
         rows = cur.fetchall()
-        return [
-            {
-                "created_at": row[0].isoformat() if hasattr(row[0], "isoformat") else row[0],
-                "model": row[1],
-                "operation": row[2],
-                "step": row[3],
-                "question_id": row[4],
-                "input_tokens": int(row[5] or 0),
-                "output_tokens": int(row[6] or 0),
-                "total_tokens": int(row[7] or 0),
-                "session_id": row[8],
-                "request_id": row[9],
-                "run_id": row[10],
-            }
-            for row in rows
-        ]
+        return [_recent_usage_row_to_dict(row) for row in rows]
+
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import os
 import re
 import subprocess
@@ -33,13 +32,17 @@ from ragonometrics.pipeline.state import (
     create_workflow_run,
     find_similar_completed_step,
     find_similar_report_question_items,
+    flush_steps,
     record_step,
+    record_step_async,
     set_workflow_status,
 )
-from ragonometrics.pipeline.report_store import store_workflow_report
+from ragonometrics.pipeline.report_store import sha256_file, store_workflow_report
+from ragonometrics.pipeline.token_usage import flush_usage
 from ragonometrics.pipeline.prep import prep_corpus
 from ragonometrics.integrations.econ_data import fetch_fred_series
-from ragonometrics.db.connection import connect as db_connect
+from ragonometrics.db.connection import connect as db_connect, pooled_connection
+from ragonometrics.db.jsonb import json_bytes
 
 
 def _utc_now() -> str:
@@ -127,21 +130,35 @@ def _progress_iter(items, desc: str, *, total: int | None = None):
     return tqdm(items, desc=desc, total=total)
 
 
+# Rows fetched per round trip when streaming a run's usage rollup.
+_USAGE_ROLLUP_ITERSIZE = 2000
+
+# URLs that answered a probe in this process; dropped again when a later query
+# against them fails, so an outage is re-probed instead of trusted.
+_REACHABLE_DB_URLS: set[str] = set()
+
+
 def _can_connect_db(db_url: str) -> bool:
     """Return True when the provided database URL is reachable.
 
+    A successful probe is remembered for the process, so the several checks
+    made over one workflow run open a single probe connection.
+
     Args:
         db_url (str): Postgres connection URL.
 
     Returns:
         bool: True when the operation succeeds; otherwise False.
     """
+    if db_url in _REACHABLE_DB_URLS:
+        return True
     try:
         conn = db_connect(db_url, require_migrated=False)
         conn.close()
-        return True
     except Exception:
         return False
+    _REACHABLE_DB_URLS.add(db_url)
+    return True
 
 
 def _resolve_meta_db_url(preferred_db_url: str | None) -> tuple[str | None, Dict[str, Any]]:
@@ -191,6 +208,9 @@ def _resolve_meta_db_url(preferred_db_url: str | None) -> tuple[str | None, Dict
 def _write_report(report_dir: Path, run_id: str, payload: Dict[str, Any]) -> Path:
     """Write the workflow report JSON file and return its path.
 
+    The payload goes to a sibling temp file that is then renamed over the
+    report, so readers never see a partially written report.
+
     Args:
         report_dir (Path): Directory for generated reports.
         run_id (str): Unique workflow run identifier.
@@ -201,10 +221,9 @@ def _write_report(report_dir: Path, run_id: str, payload: Dict[str, Any]) -> Pat
     """
     report_dir.mkdir(parents=True, exist_ok=True)
     path = report_dir / f"workflow-report-{run_id}.json"
-    path.write_text(
-        json.dumps(payload, indent=2, ensure_ascii=False, default=str),
-        encoding="utf-8",
-    )
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(json_bytes(payload, indent=True))
+    os.replace(tmp_path, path)
     return path
 
 
@@ -372,7 +391,9 @@ def _render_audit_artifacts(*, run_id: str, report_path: Path, report_dir: Path)
         out["pdf"] = {"status": "skipped", "reason": "markdown_failed"}
         return out
 
-    out["markdown"] = {"status": "generated", "path": str(md_path)}
+    # Digests are taken while the files are fresh so the report store can
+    # record them without reading the artifacts back from disk.
+    out["markdown"] = {"status": "generated", "path": str(md_path), "sha256": sha256_file(md_path)}
     pdf_enabled = _bool_env("WORKFLOW_RENDER_AUDIT_PDF", True)
     if not pdf_enabled:
         out["pdf"] = {"status": "skipped", "reason": "pdf_disabled", "path": str(pdf_path)}
@@ -410,7 +431,13 @@ def _render_audit_artifacts(*, run_id: str, report_path: Path, report_dir: Path)
         out["status"] = "partial"
         return out
 
-    out["pdf"] = {"status": "generated", "path": str(pdf_path), "tex_path": str(tex_path)}
+    out["pdf"] = {
+        "status": "generated",
+        "path": str(pdf_path),
+        "tex_path": str(tex_path),
+        "sha256": sha256_file(pdf_path),
+        "tex_sha256": sha256_file(tex_path),
+    }
     out["status"] = "completed"
     return out
 
@@ -456,66 +483,48 @@ def _store_report_in_db(
         )
         out["status"] = "stored"
     except Exception as exc:
+        _REACHABLE_DB_URLS.discard(db_url)
         out["status"] = "failed"
         out["error"] = str(exc)
     return out
 
 
-def _collect_usage_rollup_for_run(*, db_url: str | None, run_id: str) -> Dict[str, Any]:
-    """Collect token-usage rollup rows for a workflow run.
+def _usage_rollup_row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a ``token_usage_rollup`` row into a workflow report usage row.
 
     Args:
-        db_url (str | None): Postgres connection URL.
-        run_id (str): Workflow run id.
+        row (Any): Rollup row in ``_collect_usage_rollup_for_run`` column order.
 
     Returns:
-        Dict[str, Any]: Usage summary payload for workflow reports.
+        Dict[str, Any]: Usage row with numeric fields coerced and timestamps in ISO format.
     """
-    out: Dict[str, Any] = {"database_url": bool(db_url)}
-    if not db_url:
-        out["status"] = "skipped"
-        out["reason"] = "db_url_missing"
-        return out
-    if not _can_connect_db(db_url):
-        out["status"] = "skipped"
-        out["reason"] = "db_unreachable"
-        return out
+    return {
+        "step": str(row[0] or ""),
+        "model": str(row[1] or ""),
+        "question_id": str(row[2] or ""),
+        "calls": int(row[3] or 0),
+        "input_tokens": int(row[4] or 0),
+        "output_tokens": int(row[5] or 0),
+        "total_tokens": int(row[6] or 0),
+        "cost_usd_input": float(row[7] or 0.0),
+        "cost_usd_output": float(row[8] or 0.0),
+        "cost_usd_total": float(row[9] or 0.0),
+        "first_seen_at": row[10].isoformat() if hasattr(row[10], "isoformat") else row[10],
+        "last_seen_at": row[11].isoformat() if hasattr(row[11], "isoformat") else row[11],
+    }
 
-    try:
-        conn = db_connect(db_url, require_migrated=True)
-        try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT
-                    COALESCE(step, '') AS step,
-                    COALESCE(model, '') AS model,
-                    COALESCE(question_id, '') AS question_id,
-                    call_count,
-                    input_tokens,
-                    output_tokens,
-                    total_tokens,
-                    cost_usd_input,
-                    cost_usd_output,
-                    cost_usd_total,
-                    first_seen_at,
-                    last_seen_at
-                FROM observability.token_usage_rollup
-                WHERE run_id = %s
-                ORDER BY total_tokens DESC, call_count DESC, step ASC, model ASC
-                """,
-                (run_id,),
-            )
-            rows = cur.fetchall()
-        finally:
-            conn.close()
-    except Exception as exc:
-        out["status"] = "failed"
-        out["error"] = str(exc)
-        return out
 
-    usage_rows: List[Dict[str, Any]] = []
-    totals = {
+def _usage_rollup_aggregates(rows: List[Any]) -> tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Split ``GROUPING SETS ((step), ())`` rollup sums into run totals and per-step totals.
+
+    Args:
+        rows (List[Any]): Aggregate rows of ``(is_total, step, calls, input_tokens,
+            output_tokens, total_tokens, cost_usd_input, cost_usd_output, cost_usd_total)``.
+
+    Returns:
+        tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]: Run totals and totals keyed by step.
+    """
+    totals: Dict[str, Any] = {
         "calls": 0,
         "input_tokens": 0,
         "output_tokens": 0,
@@ -525,61 +534,117 @@ def _collect_usage_rollup_for_run(*, db_url: str | None, run_id: str) -> Dict[st
         "cost_usd_total": 0.0,
     }
     by_step: Dict[str, Dict[str, Any]] = {}
-
     for row in rows:
-        step = str(row[0] or "")
-        model = str(row[1] or "")
-        question_id = str(row[2] or "")
-        calls = int(row[3] or 0)
-        input_tokens = int(row[4] or 0)
-        output_tokens = int(row[5] or 0)
-        total_tokens = int(row[6] or 0)
-        cost_usd_input = float(row[7] or 0.0)
-        cost_usd_output = float(row[8] or 0.0)
-        cost_usd_total = float(row[9] or 0.0)
-        first_seen = row[10].isoformat() if hasattr(row[10], "isoformat") else row[10]
-        last_seen = row[11].isoformat() if hasattr(row[11], "isoformat") else row[11]
-
-        usage_rows.append(
-            {
-                "step": step,
-                "model": model,
-                "question_id": question_id,
+        calls = int(row[2] or 0)
+        input_tokens = int(row[3] or 0)
+        output_tokens = int(row[4] or 0)
+        total_tokens = int(row[5] or 0)
+        cost_usd_total = float(row[8] or 0.0)
+        if row[0]:
+            totals = {
                 "calls": calls,
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
                 "total_tokens": total_tokens,
-                "cost_usd_input": cost_usd_input,
-                "cost_usd_output": cost_usd_output,
+                "cost_usd_input": float(row[6] or 0.0),
+                "cost_usd_output": float(row[7] or 0.0),
                 "cost_usd_total": cost_usd_total,
-                "first_seen_at": first_seen,
-                "last_seen_at": last_seen,
             }
-        )
+            continue
+        by_step[str(row[1] or "")] = {
+            "calls": calls,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+            "cost_usd_total": cost_usd_total,
+        }
+    return totals, by_step
 
-        totals["calls"] += calls
-        totals["input_tokens"] += input_tokens
-        totals["output_tokens"] += output_tokens
-        totals["total_tokens"] += total_tokens
-        totals["cost_usd_input"] += cost_usd_input
-        totals["cost_usd_output"] += cost_usd_output
-        totals["cost_usd_total"] += cost_usd_total
 
-        step_bucket = by_step.setdefault(
-            step,
-            {
-                "calls": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_tokens": 0,
-                "cost_usd_total": 0.0,
-            },
-        )
-        step_bucket["calls"] += calls
-        step_bucket["input_tokens"] += input_tokens
-        step_bucket["output_tokens"] += output_tokens
-        step_bucket["total_tokens"] += total_tokens
-        step_bucket["cost_usd_total"] += cost_usd_total
+def _collect_usage_rollup_for_run(*, db_url: str | None, run_id: str) -> Dict[str, Any]:
+    """Collect token-usage rollup rows for a workflow run.
+
+    Args:
+        db_url (str | None): Postgres connection URL.
+        run_id (str): Workflow run id.
+
+    Returns:
+        Dict[str, Any]: Usage summary payload for workflow reports.
+    """
+    out: Dict[str, Any] = {"database_url": bool(db_url)}
+    if not db_url:
+        out["status"] = "skipped"
+        out["reason"] = "db_url_missing"
+        return out
+    if not _can_connect_db(db_url):
+        out["status"] = "skipped"
+        out["reason"] = "db_unreachable"
+        return out
+
+    # LLM calls queue their usage rows; write them before reading the rollup.
+    # A failed background insert (possibly from another caller) is reported on
+    # its own and does not fail the rollup read.
+    try:
+        flush_usage()
+    except Exception as exc:
+        out["flush_status"] = "failed"
+        out["flush_error"] = str(exc)
+
+    usage_rows: List[Dict[str, Any]] = []
+    try:
+        # Server-side cursors need a transaction, so this checkout stays
+        # transactional; both reads then see the same snapshot.
+        with pooled_connection(db_url, require_migrated=True) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        GROUPING(step) AS is_total,
+                        step,
+                        SUM(call_count),
+                        SUM(input_tokens),
+                        SUM(output_tokens),
+                        SUM(total_tokens),
+                        SUM(cost_usd_input),
+                        SUM(cost_usd_output),
+                        SUM(cost_usd_total)
+                    FROM observability.token_usage_rollup
+                    WHERE run_id = %s
+                    GROUP BY GROUPING SETS ((step), ())
+                    ORDER BY GROUPING(step), SUM(total_tokens) DESC, SUM(call_count) DESC, step ASC
+                    """,
+                    (run_id,),
+                )
+                totals, by_step = _usage_rollup_aggregates(cur.fetchall())
+            with conn.cursor(name="workflow_usage_rollup") as cur:
+                cur.itersize = _USAGE_ROLLUP_ITERSIZE
+                cur.execute(
+                    """
+                    SELECT
+                        COALESCE(step, '') AS step,
+                        COALESCE(model, '') AS model,
+                        COALESCE(question_id, '') AS question_id,
+                        call_count,
+                        input_tokens,
+                        output_tokens,
+                        total_tokens,
+                        cost_usd_input,
+                        cost_usd_output,
+                        cost_usd_total,
+                        first_seen_at,
+                        last_seen_at
+                    FROM observability.token_usage_rollup
+                    WHERE run_id = %s
+                    ORDER BY total_tokens DESC, call_count DESC, step ASC, model ASC
+                    """,
+                    (run_id,),
+                )
+                usage_rows.extend(_usage_rollup_row_to_dict(row) for row in cur)
+    except Exception as exc:
+        _REACHABLE_DB_URLS.discard(db_url)
+        out["status"] = "failed"
+        out["error"] = str(exc)
+        return out
 
     out["status"] = "fetched"
     out["row_count"] = len(usage_rows)
@@ -613,15 +678,33 @@ def _finalize_workflow_report(
     Returns:
         Dict[str, Any]: Dictionary containing the computed result payload.
     """
+    # Step transitions are queued in the background; persist them before the
+    # report is written so a failed write shows up in the report and run status.
+    try:
+        flush_steps(run_id)
+        summary["step_store"] = {"status": "stored"}
+    except Exception as exc:
+        summary["step_store"] = {"status": "failed", "error": str(exc)}
+        workflow_status = "failed"
     summary.setdefault("finished_at", _utc_now())
-    summary["usage_store"] = _collect_usage_rollup_for_run(db_url=db_url, run_id=run_id)
+    summary["usage_store"] = {"status": "pending", "database_url": bool(db_url)}
     summary["report_store"] = {"status": "pending", "database_url": bool(db_url)}
     summary["audit_artifacts"] = {"status": "pending"}
     report_path = _write_report(report_dir, run_id, summary)
     summary["report_path"] = str(report_path)
-    audit_out = _render_audit_artifacts(run_id=run_id, report_path=report_path, report_dir=report_dir)
+    # The audit renderer only reads the report file on disk, so its subprocesses
+    # run while the usage rollup is queried. The report is not rewritten until
+    # the render finishes reading it.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        audit_future = pool.submit(
+            _render_audit_artifacts,
+            run_id=run_id,
+            report_path=report_path,
+            report_dir=report_dir,
+        )
+        summary["usage_store"] = _collect_usage_rollup_for_run(db_url=db_url, run_id=run_id)
+        audit_out = audit_future.result()
     summary["audit_artifacts"] = audit_out
-    report_path = _write_report(report_dir, run_id, summary)
     report_store_out = _store_report_in_db(
         db_url=db_url,
         run_id=run_id,
@@ -682,7 +765,7 @@ def _finalize_quota_termination(
     }
     summary["finished_at"] = _utc_now()
     report_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
+    record_step_async(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
     return _finalize_workflow_report(
         report_dir=report_dir,
         run_id=run_id,
@@ -694,6 +777,10 @@ def _finalize_quota_termination(
     )
 
 
+# Bullet markers, then list numbering, in front of a planner subquestion line.
+_SUBQUESTION_PREFIX_RE = re.compile(r"^[-*•]*\s*[0-9. ]*")
+
+
 def _parse_subquestions(raw: str, max_items: int) -> List[str]:
     """Parse raw planner output into a deduplicated list of subquestions.
 
@@ -704,20 +791,8 @@ def _parse_subquestions(raw: str, max_items: int) -> List[str]:
     Returns:
         List[str]: List result produced by the operation.
     """
-    items: List[str] = []
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        line = line.lstrip("-*•").strip()
-        line = line.lstrip("0123456789. ").strip()
-        if not line:
-            continue
-        if line not in items:
-            items.append(line)
-        if len(items) >= max_items:
-            break
-    return items
+    lines = (_SUBQUESTION_PREFIX_RE.sub("", line.strip(), count=1).strip() for line in raw.splitlines())
+    return list(dict.fromkeys(line for line in lines if line))[:max_items]
 
 
 def _agentic_plan(
@@ -838,39 +913,43 @@ def _format_citations_context(citations: List[Dict[str, Any]], max_items: int) -
     return "\n".join(lines)
 
 
+# One provenance-tagged chunk: a "(page N words A-B[ section S])" header that
+# opens a blank-line separated block, followed by the block text.
+_CONTEXT_CHUNK_RE = re.compile(
+    r"(?:\A|\n\n)[ \t]*\(page[ \t]+(?P<page>\d+)[ \t]+words[ \t]+(?P<start>\d+)-(?P<end>\d+)"
+    r"(?:[ \t]+section[ \t]+(?P<section>[^)\n]+))?\)[ \t]*"
+    r"(?:\n(?!\n)(?P<text>.*?))?(?=\n\n|\Z)",
+    re.DOTALL,
+)
+
+_LINE_BREAK_TRANSLATION = str.maketrans({"\r": "\n", "\f": "\n"})
+
+
 def _split_context_chunks(context: str) -> List[Dict[str, Any]]:
     """Parse provenance-tagged context text into structured chunk metadata.
 
+    CRLF and lone CR line endings and form feeds become plain newlines first,
+    so text extracted on other platforms splits into the same chunks.
+
     Args:
         context (str): Input value for context.
 
     Returns:
         List[Dict[str, Any]]: Dictionary containing the computed result payload.
     """
-    chunks: List[Dict[str, Any]] = []
     if not context:
-        return chunks
-    parts = [p for p in context.split("\n\n") if p.strip()]
-    pattern = re.compile(r"^\(page\s+(?P<page>\d+)\s+words\s+(?P<start>\d+)-(?P<end>\d+)(?:\s+section\s+(?P<section>[^)]+))?\)\s*$")
-    for part in parts:
-        lines = part.splitlines()
-        if not lines:
-            continue
-        meta = lines[0].strip()
-        match = pattern.match(meta)
-        if not match:
-            continue
-        text = "\n".join(lines[1:]).strip()
-        chunks.append(
-            {
-                "page": int(match.group("page")),
-                "start_word": int(match.group("start")),
-                "end_word": int(match.group("end")),
-                "section": (match.group("section") or "").strip() or None,
-                "text": text,
-            }
-        )
-    return chunks
+        return []
+    context = context.replace("\r\n", "\n").translate(_LINE_BREAK_TRANSLATION)
+    return [
+        {
+            "page": int(match.group("page")),
+            "start_word": int(match.group("start")),
+            "end_word": int(match.group("end")),
+            "section": (match.group("section") or "").strip() or None,
+            "text": (match.group("text") or "").strip(),
+        }
+        for match in _CONTEXT_CHUNK_RE.finditer(context)
+    ]
 
 
 def _confidence_from_retrieval_stats(stats: Dict[str, Any] | None) -> tuple[str, float, str]:
@@ -1534,6 +1613,81 @@ def _answer_subquestion(
     }
 
 
+def _answer_subquestions(
+    *,
+    client: OpenAI,
+    model: str,
+    settings,
+    chunks: List[Dict[str, Any]] | List[str],
+    chunk_embeddings: List[List[float]],
+    citations_context: str,
+    subquestions: List[str],
+    paper_path: str | Path | None = None,
+    run_id: str | None = None,
+) -> List[Dict[str, str]]:
+    """Answer agentic subquestions concurrently, preserving planner order.
+
+    Subquestions run one at a time unless ``WORKFLOW_SUBQUESTION_WORKERS`` is
+    set above 1, in which case all of them are submitted before any result is
+    awaited, so the phase takes roughly one answer's latency instead of one per
+    subquestion. The first failure cancels the subquestions not yet started.
+
+    Args:
+        client (OpenAI): Provider client instance.
+        model (str): Model name used for this operation.
+        settings (Any): Loaded application settings.
+        chunks (List[Dict[str, Any]] | List[str]): Mapping containing chunks.
+        chunk_embeddings (List[List[float]]): Collection of chunk embeddings.
+        citations_context (str): Input value for citations context.
+        subquestions (List[str]): Planner subquestions in order.
+        paper_path (str | Path | None): Optional path to scope retrieval to one paper.
+        run_id (str | None): Unique workflow run identifier.
+
+    Returns:
+        List[Dict[str, str]]: Sub-answers in ``subquestions`` order.
+    """
+    if not subquestions:
+        return []
+    try:
+        worker_cap = int(os.environ.get("WORKFLOW_SUBQUESTION_WORKERS", "1"))
+    except Exception:
+        worker_cap = 1
+    max_workers = max(1, min(worker_cap, len(subquestions)))
+    kwargs = {
+        "client": client,
+        "model": model,
+        "settings": settings,
+        "chunks": chunks,
+        "chunk_embeddings": chunk_embeddings,
+        "paper_path": paper_path,
+        "citations_context": citations_context,
+        "run_id": run_id,
+    }
+    if max_workers == 1:
+        return [
+            _answer_subquestion(subq=subq, question_id=f"S{idx:02d}", **kwargs)
+            for idx, subq in enumerate(
+                _progress_iter(subquestions, "Agentic sub-questions", total=len(subquestions)),
+                start=1,
+            )
+        ]
+    results: List[Dict[str, str] | None] = [None] * len(subquestions)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        future_map = {
+            pool.submit(_answer_subquestion, subq=subq, question_id=f"S{idx + 1:02d}", **kwargs): idx
+            for idx, subq in enumerate(subquestions)
+        }
+        try:
+            for future in _progress_iter(as_completed(future_map), "Agentic sub-questions", total=len(future_map)):
+                results[future_map[future]] = future.result()
+        except BaseException:
+            # Drop queued subquestions; the ones already running finish on exit.
+            for future in future_map:
+                future.cancel()
+            raise
+    return [item for item in results if item is not None]
+
+
 def run_workflow(
     *,
     papers_dir: Path,
@@ -1555,6 +1709,80 @@ def run_workflow(
 ) -> Dict[str, Any]:
     """Run the multi-step workflow and persist state transitions.
 
+    Step transitions are queued with ``record_step_async``. The report step
+    flushes them before the run is marked terminal, recording a failed write in
+    the report and run status; a run that raises flushes them on the way out.
+
+    Args:
+        papers_dir (Path): Directory containing input paper files.
+        config_path (Optional[Path]): Path to the configuration file.
+        meta_db_url (Optional[str]): Postgres metadata database URL.
+        report_dir (Optional[Path]): Directory for generated reports.
+        state_db (Path): Path to the workflow state database.
+        agentic (Optional[bool]): Whether to enable agentic.
+        question (Optional[str]): Question text to answer.
+        agentic_model (Optional[str]): Model name used for the agentic workflow stage.
+        agentic_max_subquestions (Optional[int]): Input value for agentic max subquestions.
+        agentic_citations (Optional[bool]): Whether to enable agentic citations.
+        agentic_citations_max_items (Optional[int]): Input value for agentic citations max items.
+        report_question_set (Optional[str]): Structured question set selector.
+        workstream_id (Optional[str]): Logical workstream identifier for grouping related runs.
+        arm (Optional[str]): Experiment arm label for this run.
+        parent_run_id (Optional[str]): Run identifier of the parent run, when applicable.
+        trigger_source (Optional[str]): Source that triggered the run.
+
+    Returns:
+        Dict[str, Any]: Dictionary containing the computed result payload.
+
+    Raises:
+        Exception: If an unexpected runtime error occurs.
+    """
+    try:
+        return _run_workflow(
+            papers_dir=papers_dir,
+            config_path=config_path,
+            meta_db_url=meta_db_url,
+            report_dir=report_dir,
+            state_db=state_db,
+            agentic=agentic,
+            question=question,
+            agentic_model=agentic_model,
+            agentic_max_subquestions=agentic_max_subquestions,
+            agentic_citations=agentic_citations,
+            agentic_citations_max_items=agentic_citations_max_items,
+            report_question_set=report_question_set,
+            workstream_id=workstream_id,
+            arm=arm,
+            parent_run_id=parent_run_id,
+            trigger_source=trigger_source,
+        )
+    except BaseException:
+        # Persist what the failed run queued before its error propagates.
+        flush_steps()
+        raise
+
+
+def _run_workflow(
+    *,
+    papers_dir: Path,
+    config_path: Optional[Path] = None,
+    meta_db_url: Optional[str] = None,
+    report_dir: Optional[Path] = None,
+    state_db: Path = DEFAULT_STATE_DB,
+    agentic: Optional[bool] = None,
+    question: Optional[str] = None,
+    agentic_model: Optional[str] = None,
+    agentic_max_subquestions: Optional[int] = None,
+    agentic_citations: Optional[bool] = None,
+    agentic_citations_max_items: Optional[int] = None,
+    report_question_set: Optional[str] = None,
+    workstream_id: Optional[str] = None,
+    arm: Optional[str] = None,
+    parent_run_id: Optional[str] = None,
+    trigger_source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the workflow steps for ``run_workflow``, queueing step transitions.
+
     Args:
         papers_dir (Path): Directory containing input paper files.
         config_path (Optional[Path]): Path to the configuration file.
@@ -1694,7 +1922,7 @@ def run_workflow(
 
     # Step 0: Prep (corpus profiling)
     prep_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="prep", status="running", started_at=prep_start)
+    record_step_async(state_db, run_id=run_id, step="prep", status="running", started_at=prep_start)
     pdfs = _resolve_paper_paths(Path(papers_dir))
     reused_prep = _find_reusable_step("prep")
     if reused_prep:
@@ -1705,7 +1933,7 @@ def run_workflow(
         )
     else:
         prep_out = prep_corpus(pdfs, report_dir=report_dir, run_id=run_id)
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="prep",
@@ -1746,7 +1974,7 @@ def run_workflow(
     if prep_out.get("status") == "failed":
         summary["finished_at"] = _utc_now()
         report_start = _utc_now()
-        record_step(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
+        record_step_async(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
         return _finalize_workflow_report(
             report_dir=report_dir,
             run_id=run_id,
@@ -1760,7 +1988,7 @@ def run_workflow(
     if validate_only:
         summary["finished_at"] = _utc_now()
         report_start = _utc_now()
-        record_step(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
+        record_step_async(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
         return _finalize_workflow_report(
             report_dir=report_dir,
             run_id=run_id,
@@ -1773,7 +2001,7 @@ def run_workflow(
 
     # Step 1: Ingest
     ingest_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="ingest", status="running", started_at=ingest_start)
+    record_step_async(state_db, run_id=run_id, step="ingest", status="running", started_at=ingest_start)
     reused_ingest = _find_reusable_step("ingest")
     if reused_ingest:
         ingest_out = _with_reuse_marker(
@@ -1784,7 +2012,7 @@ def run_workflow(
     else:
         papers = _ensure_papers_loaded()
         ingest_out = {"num_pdfs": len(pdfs), "num_papers": len(papers)}
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="ingest",
@@ -1798,7 +2026,7 @@ def run_workflow(
 
     # Step 2: Enrich
     enrich_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="enrich", status="running", started_at=enrich_start)
+    record_step_async(state_db, run_id=run_id, step="enrich", status="running", started_at=enrich_start)
     reused_enrich = _find_reusable_step("enrich")
     if reused_enrich:
         enrich_out = _with_reuse_marker(
@@ -1811,7 +2039,7 @@ def run_workflow(
         openalex_count = sum(1 for p in papers if getattr(p, "openalex", None))
         citec_count = sum(1 for p in papers if getattr(p, "citec", None))
         enrich_out = {"openalex": openalex_count, "citec": citec_count}
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="enrich",
@@ -1825,7 +2053,7 @@ def run_workflow(
 
     # Step 3: Econ data (optional)
     econ_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="econ_data", status="running", started_at=econ_start)
+    record_step_async(state_db, run_id=run_id, step="econ_data", status="running", started_at=econ_start)
     reused_econ = _find_reusable_step("econ_data")
     if reused_econ:
         econ_out = _with_reuse_marker(
@@ -1845,7 +2073,7 @@ def run_workflow(
                 obs = fetch_fred_series(series_id, limit=120)
                 series_counts[series_id] = len(obs)
             econ_out = {"status": "fetched", "series_counts": series_counts}
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="econ_data",
@@ -1875,7 +2103,7 @@ def run_workflow(
     except Exception:
         max_citations = 12
     agentic_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="agentic", status="running", started_at=agentic_start)
+    record_step_async(state_db, run_id=run_id, step="agentic", status="running", started_at=agentic_start)
     agentic_out: Dict[str, Any] = {"status": "skipped"}
     agentic_quota_error: Exception | None = None
     reused_agentic = (
@@ -1932,25 +2160,17 @@ def run_workflow(
                     max_items=max_subq,
                     run_id=run_id,
                 )
-                sub_answers: List[Dict[str, str]] = []
-                for idx, subq in enumerate(
-                    _progress_iter(subquestions, "Agentic sub-questions", total=len(subquestions)),
-                    start=1,
-                ):
-                    sub_answers.append(
-                        _answer_subquestion(
-                            client=client,
-                            model=agentic_model,
-                            settings=settings,
-                            chunks=chunks,
-                            chunk_embeddings=chunk_embeddings,
-                            paper_path=target_paper.path,
-                            citations_context=citations_context,
-                            subq=subq,
-                            run_id=run_id,
-                            question_id=f"S{idx:02d}",
-                        )
-                    )
+                sub_answers = _answer_subquestions(
+                    client=client,
+                    model=agentic_model,
+                    settings=settings,
+                    chunks=chunks,
+                    chunk_embeddings=chunk_embeddings,
+                    paper_path=target_paper.path,
+                    citations_context=citations_context,
+                    subquestions=subquestions,
+                    run_id=run_id,
+                )
                 report_questions_enabled = os.environ.get("WORKFLOW_REPORT_QUESTIONS", "1").strip() != "0"
                 report_question_mode = _normalize_report_question_set(
                     report_question_set or os.environ.get("WORKFLOW_REPORT_QUESTIONS_SET"),
@@ -2029,7 +2249,7 @@ def run_workflow(
                 if _is_insufficient_quota_error(exc):
                     agentic_quota_error = exc
     agentic_step_status = "failed" if agentic_out.get("status") == "failed" else "completed"
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="agentic",
@@ -2053,7 +2273,7 @@ def run_workflow(
 
     # Step 5: Index (optional)
     index_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="index", status="running", started_at=index_start)
+    record_step_async(state_db, run_id=run_id, step="index", status="running", started_at=index_start)
     reused_index = _find_reusable_step("index")
     db_ok = bool(db_url) and _can_connect_db(db_url)
     index_out: Dict[str, Any] = {"database_url": bool(db_url), "database_reachable": db_ok}
@@ -2088,7 +2308,7 @@ def run_workflow(
         if db_url and not db_ok:
             index_out["reason"] = "db_unreachable"
     index_step_status = "failed" if index_out.get("status") == "failed" else "completed"
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="index",
@@ -2112,7 +2332,7 @@ def run_workflow(
 
     # Step 6: Evaluate (lightweight stats)
     eval_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="evaluate", status="running", started_at=eval_start)
+    record_step_async(state_db, run_id=run_id, step="evaluate", status="running", started_at=eval_start)
     reused_evaluate = _find_reusable_step("evaluate")
     if reused_evaluate:
         eval_out = _with_reuse_marker(
@@ -2131,7 +2351,7 @@ def run_workflow(
             "max_chunks": max(chunk_counts) if chunk_counts else 0,
             "min_chunks": min(chunk_counts) if chunk_counts else 0,
         }
-    record_step(
+    record_step_async(
         state_db,
         run_id=run_id,
         step="evaluate",
@@ -2145,7 +2365,7 @@ def run_workflow(
 
     # Step 7: Report
     report_start = _utc_now()
-    record_step(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
+    record_step_async(state_db, run_id=run_id, step="report", status="running", started_at=report_start)
     summary["finished_at"] = _utc_now()
     return _finalize_workflow_report(
         report_dir=report_dir,
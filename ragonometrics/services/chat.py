@@ -26,7 +26,7 @@ from ragonometrics.pipeline.query_cache import (
     set_cached_answer,
     set_cached_answer_hybrid,
 )
-from ragonometrics.pipeline.token_usage import record_usage
+from ragonometrics.pipeline.token_usage import record_usage_async
 from ragonometrics.services.papers import PaperRef, load_prepared
 
 _INVALID_CHAT_ANSWER_PATTERNS = (
@@ -172,7 +172,7 @@ def stream_llm_answer(
                 "capability": getattr(response, "capability", "stream_chat"),
                 "fallback_from": getattr(response, "fallback_from", None),
             }
-            record_usage(
+            record_usage_async(
                 model=model,
                 operation=usage_context,
                 step=usage_context,
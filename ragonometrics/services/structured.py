@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import hashlib
-import json
 import os
 import re
 from datetime import datetime, timezone
@@ -14,6 +13,7 @@ from uuid import uuid4
 from ragonometrics.core.main import top_k_context
 from ragonometrics.core.prompts import RESEARCHER_QA_PROMPT
 from ragonometrics.db.connection import pooled_connection
+from ragonometrics.db.jsonb import jsonb
 from ragonometrics.integrations.citec import format_citec_context
 from ragonometrics.integrations.openalex import format_openalex_context
 from ragonometrics.llm.runtime import build_llm_runtime
@@ -235,16 +235,16 @@ def upsert_workflow_structured_answer(
                 VALUES (
                     %s, 'run', '', 'main', 'completed',
                     %s, %s, %s, %s, %s,
-                    %s::jsonb, %s,
+                    %s, %s,
                     %s, %s, NOW(), NOW(),
-                    %s::jsonb, %s::jsonb
+                    %s, %s
                 )
                 ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
                     status = EXCLUDED.status,
                     project_id = COALESCE(EXCLUDED.project_id, workflow.run_records.project_id),
                     persona_id = COALESCE(EXCLUDED.persona_id, workflow.run_records.persona_id),
                     payload_json = workflow.run_records.payload_json || EXCLUDED.payload_json,
-                    metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
+                    metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
                     updated_at = NOW()
                 """,
                 (
@@ -254,12 +254,12 @@ def upsert_workflow_structured_answer(
                     "flask_structured_workstream",
                     str(project_id or "").strip() or None,
                     str(persona_id or "").strip() or None,
-                    json.dumps({"chat_model": selected_model}, ensure_ascii=False),
+                    jsonb({"chat_model": selected_model}),
                     "structured",
                     created_at,
                     created_at,
-                    json.dumps({"source": "flask_structured_workstream"}, ensure_ascii=False),
-                    json.dumps({"source": "flask_structured_workstream", "model": selected_model}, ensure_ascii=False),
+                    jsonb({"source": "flask_structured_workstream"}),
+                    jsonb({"source": "flask_structured_workstream", "model": selected_model}),
                 ),
             )
             cur.execute(
@@ -273,7 +273,7 @@ def upsert_workflow_structured_answer(
                 )
                 VALUES (
                     %s, 'question', 'agentic', %s, %s,
-                    %s, %s, %s, %s, %s, %s, NOW(), NOW(), %s::jsonb, %s::jsonb
+                    %s, %s, %s, %s, %s, %s, NOW(), NOW(), %s, %s
                 )
                 ON CONFLICT (run_id, record_kind, step, record_key) DO UPDATE SET
                     status = EXCLUDED.status,
@@ -284,7 +284,7 @@ def upsert_workflow_structured_answer(
                     project_id = COALESCE(EXCLUDED.project_id, workflow.run_records.project_id),
                     persona_id = COALESCE(EXCLUDED.persona_id, workflow.run_records.persona_id),
                     payload_json = EXCLUDED.payload_json,
-                    metadata_json = workflow.run_records.metadata_json || EXCLUDED.metadata_json,
+                    metadata_json = workflow.merge_meta(workflow.run_records.metadata_json, EXCLUDED.metadata_json),
                     updated_at = NOW()
                 """,
                 (
@@ -297,8 +297,8 @@ def upsert_workflow_structured_answer(
                     inp_hash,
                     str(project_id or "").strip() or None,
                     str(persona_id or "").strip() or None,
-                    json.dumps(question_payload, ensure_ascii=False),
-                    json.dumps(question_meta, ensure_ascii=False),
+                    jsonb(question_payload),
+                    jsonb(question_meta),
                 ),
             )
             conn.commit()
@@ -1,10 +1,37 @@
 """Pytest bootstrap stubs for external deps and sqlite-backed DB shims."""
 
+import contextlib
+import json
 import sys
 import types
 import sqlite3
 import re
 
+import pytest
+
+
+class FakeJson:
+    def __init__(self, obj, dumps=None):
+        self.obj = obj
+        self.dumps = dumps or json.dumps
+
+    def as_text(self):
+        out = self.dumps(self.obj)
+        return out.decode("utf-8") if isinstance(out, bytes) else out
+
+
+class FakeJsonb(FakeJson):
+    pass
+
+
+def _sqlite_merge_meta(existing, incoming):
+    incoming_obj = json.loads(incoming) if incoming else {}
+    if not incoming_obj:
+        return existing
+    merged = json.loads(existing) if existing else {}
+    merged.update(incoming_obj)
+    return json.dumps(merged)
+
 
 class SQLiteCursorWrapper:
     def __init__(self, cur):
@@ -37,13 +64,23 @@ class SQLiteCursorWrapper:
         out = out.replace(" jsonb_path_ops", "")
         return out
 
-    def execute(self, sql, params=None):
+    def execute(self, sql, params=None, *, prepare=None):
         if params is None:
             params = ()
+        # sqlite stores json adapters as their text form
+        if isinstance(params, (list, tuple)):
+            params = tuple(p.as_text() if isinstance(p, FakeJson) else p for p in params)
+            # psycopg adapts lists to arrays; sqlite reads them back through json_each.
+            params = tuple(json.dumps(p) if isinstance(p, list) else p for p in params)
+        sql = re.sub(r"=\s*ANY\(%s\)", "IN (SELECT value FROM json_each(%s))", sql)
         # translate psycopg2 %s params to sqlite ? params
         sql2 = self._rewrite_sql(sql).replace("%s", "?")
         return self._cur.execute(sql2, params)
 
+    def executemany(self, sql, params_seq):
+        for params in params_seq:
+            self.execute(sql, params)
+
     def fetchone(self):
         return self._cur.fetchone()
 
@@ -62,12 +99,14 @@ class SQLiteCursorWrapper:
 
 class SQLiteConnWrapper:
     def __init__(self):
-        self._conn = sqlite3.connect(":memory:")
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.create_function("merge_meta", 2, _sqlite_merge_meta, deterministic=True)
+        self._conn.create_function("set_config", 3, lambda name, value, is_local: value)
         self.info = types.SimpleNamespace(dsn="sqlite://memory")
         cur = self._conn.cursor()
         cur.execute("CREATE TABLE IF NOT EXISTS alembic_version (version_num TEXT PRIMARY KEY)")
         cur.execute("DELETE FROM alembic_version")
-        cur.execute("INSERT INTO alembic_version(version_num) VALUES ('0014')")
+        cur.execute("INSERT INTO alembic_version(version_num) VALUES ('0025')")
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS run_records (
@@ -166,6 +205,90 @@ class SQLiteConnWrapper:
             )
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_usage_hourly (
+                bucket TEXT NOT NULL,
+                model TEXT NOT NULL DEFAULT '',
+                session_id TEXT NOT NULL DEFAULT '',
+                calls INTEGER NOT NULL DEFAULT 0,
+                input_tokens INTEGER NOT NULL DEFAULT 0,
+                output_tokens INTEGER NOT NULL DEFAULT 0,
+                total_tokens INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, model, session_id)
+            )
+            """
+        )
+        # Row-level stand-ins for the statement-level rollup triggers.
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS token_usage_hourly_insert AFTER INSERT ON token_usage
+            BEGIN
+                INSERT INTO token_usage_hourly
+                    (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+                VALUES (
+                    strftime('%Y-%m-%d %H:00:00', NEW.created_at),
+                    COALESCE(NEW.model, ''),
+                    COALESCE(NEW.session_id, ''),
+                    1,
+                    COALESCE(NEW.input_tokens, 0),
+                    COALESCE(NEW.output_tokens, 0),
+                    COALESCE(NEW.total_tokens, 0)
+                )
+                ON CONFLICT (bucket, model, session_id) DO UPDATE SET
+                    calls = calls + excluded.calls,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    total_tokens = total_tokens + excluded.total_tokens;
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS token_usage_hourly_delete AFTER DELETE ON token_usage
+            BEGIN
+                UPDATE token_usage_hourly SET
+                    calls = calls - 1,
+                    input_tokens = input_tokens - COALESCE(OLD.input_tokens, 0),
+                    output_tokens = output_tokens - COALESCE(OLD.output_tokens, 0),
+                    total_tokens = total_tokens - COALESCE(OLD.total_tokens, 0)
+                WHERE bucket = strftime('%Y-%m-%d %H:00:00', OLD.created_at)
+                  AND model = COALESCE(OLD.model, '')
+                  AND session_id = COALESCE(OLD.session_id, '');
+            END
+            """
+        )
+        cur.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS token_usage_hourly_update AFTER UPDATE ON token_usage
+            BEGIN
+                UPDATE token_usage_hourly SET
+                    calls = calls - 1,
+                    input_tokens = input_tokens - COALESCE(OLD.input_tokens, 0),
+                    output_tokens = output_tokens - COALESCE(OLD.output_tokens, 0),
+                    total_tokens = total_tokens - COALESCE(OLD.total_tokens, 0)
+                WHERE bucket = strftime('%Y-%m-%d %H:00:00', OLD.created_at)
+                  AND model = COALESCE(OLD.model, '')
+                  AND session_id = COALESCE(OLD.session_id, '');
+                INSERT INTO token_usage_hourly
+                    (bucket, model, session_id, calls, input_tokens, output_tokens, total_tokens)
+                VALUES (
+                    strftime('%Y-%m-%d %H:00:00', NEW.created_at),
+                    COALESCE(NEW.model, ''),
+                    COALESCE(NEW.session_id, ''),
+                    1,
+                    COALESCE(NEW.input_tokens, 0),
+                    COALESCE(NEW.output_tokens, 0),
+                    COALESCE(NEW.total_tokens, 0)
+                )
+                ON CONFLICT (bucket, model, session_id) DO UPDATE SET
+                    calls = calls + excluded.calls,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    total_tokens = total_tokens + excluded.total_tokens;
+            END
+            """
+        )
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS project_query_cache (
@@ -652,12 +775,26 @@ class SQLiteConnWrapper:
         )
         self._conn.commit()
 
-    def cursor(self):
+    def cursor(self, name=None, binary=None):
         return SQLiteCursorWrapper(self._conn.cursor())
 
+    @property
+    def autocommit(self):
+        return self._conn.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self._conn.isolation_level = None if value else ""
+
     def commit(self):
         return self._conn.commit()
 
+    def rollback(self):
+        return self._conn.rollback()
+
+    def pipeline(self):
+        return contextlib.nullcontext()
+
     def close(self):
         # keep underlying in-memory DB open for the test process
         return None
@@ -680,17 +817,23 @@ def fake_connect(*args, **kwargs):
 
 
 class FakeConnectionPool:
-    def __init__(self, conninfo=None, min_size=1, max_size=8, kwargs=None, open=True):
+    def __init__(self, conninfo=None, min_size=1, max_size=8, kwargs=None, configure=None, open=True):
         self.conninfo = conninfo
         self.min_size = min_size
         self.max_size = max_size
         self.kwargs = kwargs or {}
+        self.configure = configure
         self.open = open
 
     def connection(self):
+        pool = self
+
         class _Ctx:
             def __enter__(self_inner):
-                return fake_connect()
+                conn = fake_connect()
+                if pool.configure is not None:
+                    pool.configure(conn)
+                return conn
 
             def __exit__(self_inner, exc_type, exc, tb):
                 return False
@@ -701,6 +844,76 @@ class FakeConnectionPool:
         return None
 
 
+
+class RecordingCopy:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def write_row(self, row):
+        self.sink.append(row)
+
+
+class RecordingConnection:
+    """Connection double that records what a write path did, not its exact statement order."""
+
+    def __init__(self):
+        self.executed = []
+        self.written = []
+        self.copies = []
+        self.copied = []
+        self.commits = 0
+        self.autocommit_changes = []
+        self.rows = []
+        self.sql = ""
+        self._autocommit = False
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        self._autocommit = value
+        self.autocommit_changes.append(value)
+
+    def cursor(self, binary=None):
+        return self
+
+    def execute(self, sql, params=None, *, prepare=None):
+        self.executed.append(sql)
+        self.sql = sql
+
+    def executemany(self, sql, params_seq):
+        self.written.extend(params_seq)
+        self.sql = sql
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return self.rows
+
+    def copy(self, sql):
+        self.copies.append(sql)
+        return RecordingCopy(self.copied)
+
+    def commit(self):
+        self.commits += 1
+
+    def pipeline(self):
+        return contextlib.nullcontext()
+
+
+@pytest.fixture
+def recording_conn():
+    return RecordingConnection()
+
 # insert fake psycopg/psycopg2 modules for deterministic sqlite-backed tests
 psycopg2_mod = types.ModuleType("psycopg2")
 psycopg2_mod.connect = fake_connect
@@ -711,6 +924,16 @@ psycopg_mod.connect = fake_connect
 psycopg_mod.Connection = SQLiteConnWrapper
 sys.modules["psycopg"] = psycopg_mod
 
+psycopg_types_mod = types.ModuleType("psycopg.types")
+psycopg_json_mod = types.ModuleType("psycopg.types.json")
+psycopg_json_mod.Json = FakeJson
+psycopg_json_mod.Jsonb = FakeJsonb
+psycopg_json_mod.set_json_loads = lambda loads, context=None: None
+psycopg_types_mod.json = psycopg_json_mod
+psycopg_mod.types = psycopg_types_mod
+sys.modules["psycopg.types"] = psycopg_types_mod
+sys.modules["psycopg.types.json"] = psycopg_json_mod
+
 psycopg_pool_mod = types.ModuleType("psycopg_pool")
 psycopg_pool_mod.ConnectionPool = FakeConnectionPool
 sys.modules["psycopg_pool"] = psycopg_pool_mod
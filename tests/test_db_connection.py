@@ -20,6 +20,7 @@ def _set_revision(value: str) -> None:
     cur.execute("UPDATE alembic_version SET version_num = %s", (value,))
     conn.commit()
     db_connection._SCHEMA_READY_BY_DSN.clear()
+    db_connection._SCHEMA_READY_POOLS.clear()
 
 
 def test_normalize_alembic_revision_aliases():
@@ -36,6 +37,17 @@ def test_normalize_alembic_revision_aliases():
     assert db_connection.normalize_alembic_revision("0012_projects_core") == "0012"
     assert db_connection.normalize_alembic_revision("0013_project_scope_existing_tables") == "0013"
     assert db_connection.normalize_alembic_revision("0014_hybrid_query_cache") == "0014"
+    assert db_connection.normalize_alembic_revision("0015_run_records_partial_brin_indexes") == "0015"
+    assert db_connection.normalize_alembic_revision("0016_run_records_metadata_gin") == "0016"
+    assert db_connection.normalize_alembic_revision("0017_workflow_merge_meta_function") == "0017"
+    assert db_connection.normalize_alembic_revision("0018_run_records_step_order_idx") == "0018"
+    assert db_connection.normalize_alembic_revision("0019_run_records_run_reuse_idx") == "0019"
+    assert db_connection.normalize_alembic_revision("0020_run_records_completed_step_idx") == "0020"
+    assert db_connection.normalize_alembic_revision("0021_run_records_lz4_compression") == "0021"
+    assert db_connection.normalize_alembic_revision("0022_token_usage_hourly_rollup") == "0022"
+    assert db_connection.normalize_alembic_revision("0023_token_usage_filter_created_idx") == "0023"
+    assert db_connection.normalize_alembic_revision("0024_token_usage_hourly_update_truncate") == "0024"
+    assert db_connection.normalize_alembic_revision("0025_drop_run_records_metadata_gin") == "0025"
     assert db_connection.normalize_alembic_revision("0004_extra_text") == "0004"
     assert db_connection.normalize_alembic_revision("0006_extra_text") == "0006"
     assert db_connection.normalize_alembic_revision("0007_extra_text") == "0007"
@@ -51,6 +63,17 @@ def test_normalize_alembic_revision_aliases():
     assert db_connection.normalize_alembic_revision("0012") == "0012"
     assert db_connection.normalize_alembic_revision("0013") == "0013"
     assert db_connection.normalize_alembic_revision("0014") == "0014"
+    assert db_connection.normalize_alembic_revision("0015") == "0015"
+    assert db_connection.normalize_alembic_revision("0016") == "0016"
+    assert db_connection.normalize_alembic_revision("0017") == "0017"
+    assert db_connection.normalize_alembic_revision("0018") == "0018"
+    assert db_connection.normalize_alembic_revision("0019") == "0019"
+    assert db_connection.normalize_alembic_revision("0020") == "0020"
+    assert db_connection.normalize_alembic_revision("0021") == "0021"
+    assert db_connection.normalize_alembic_revision("0022") == "0022"
+    assert db_connection.normalize_alembic_revision("0023") == "0023"
+    assert db_connection.normalize_alembic_revision("0024") == "0024"
+    assert db_connection.normalize_alembic_revision("0025") == "0025"
     assert db_connection.normalize_alembic_revision(None) == ""
 
 
@@ -69,7 +92,7 @@ def test_normalize_alembic_version_marker_updates_db():
         row = cur.fetchone()
         assert row[0] == "0002"
     finally:
-        _set_revision("0014")
+        _set_revision("0025")
 
 
 def test_ensure_schema_ready_accepts_legacy_marker_alias():
@@ -78,4 +101,48 @@ def test_ensure_schema_ready_accepts_legacy_marker_alias():
     try:
         db_connection.ensure_schema_ready(conn, expected_revision="0005")
     finally:
-        _set_revision("0014")
+        _set_revision("0025")
+
+
+def test_get_pool_reuses_existing_pool_without_rebuilding(monkeypatch):
+    pool = db_connection.get_pool("dummy-pool-cache")
+
+    def _unexpected(*args, **kwargs):
+        raise AssertionError("pool rebuilt")
+
+    monkeypatch.setattr(db_connection, "ConnectionPool", _unexpected)
+    assert db_connection.get_pool("dummy-pool-cache") is pool
+    db_connection._POOLS.pop("dummy-pool-cache", None)
+
+
+def test_pooled_connection_checks_schema_once_per_pool(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db_connection, "ensure_schema_ready", lambda conn: calls.append(conn))
+    db_connection._SCHEMA_READY_POOLS.clear()
+    for _ in range(3):
+        with db_connection.pooled_connection("dummy-schema-once"):
+            pass
+    assert len(calls) == 1
+    db_connection._POOLS.pop("dummy-schema-once", None)
+    db_connection._SCHEMA_READY_POOLS.clear()
+
+
+def test_get_pool_tags_sessions_and_leaves_dsn_options_alone(monkeypatch):
+    monkeypatch.delenv("DB_APPLICATION_NAME", raising=False)
+    monkeypatch.delenv("DB_SESSION_OPTIONS", raising=False)
+    pool = db_connection.get_pool("dummy-pool-kwargs")
+    try:
+        assert pool.kwargs == {"autocommit": False, "application_name": "ragonometrics"}
+    finally:
+        db_connection._POOLS.pop("dummy-pool-kwargs", None)
+    monkeypatch.setenv("DB_SESSION_OPTIONS", "-c jit=off")
+    assert db_connection._pool_connect_kwargs()["options"] == "-c jit=off"
+
+
+def test_pooled_connection_autocommit_is_scoped_to_checkout():
+    try:
+        with db_connection.pooled_connection("dummy-autocommit", autocommit=True) as conn:
+            assert conn.autocommit
+        assert not conn.autocommit
+    finally:
+        db_connection._POOLS.pop("dummy-autocommit", None)
@@ -0,0 +1,47 @@
+"""Tests for orjson-backed jsonb parameter helpers."""
+
+import json
+
+from ragonometrics.db import connection as db_connection
+from ragonometrics.db.jsonb import _jsonb_dumps, json_bytes, json_loads, jsonb, register_json_loads
+
+
+def test_json_bytes_stringifies_keys_and_unknown_values():
+    class Opaque:
+        def __str__(self):
+            return "opaque"
+
+    assert json.loads(json_bytes({"n": 1, 2: Opaque()})) == {"n": 1, "2": "opaque"}
+
+
+def test_jsonb_passes_encoded_json_through():
+    encoded = b'{"source":"state"}'
+    assert _jsonb_dumps(encoded) is encoded
+    wrapped = jsonb({"a": [1, 2]})
+    assert json.loads(wrapped.dumps(wrapped.obj)) == {"a": [1, 2]}
+
+
+def test_json_bytes_falls_back_to_stdlib_for_wide_integers():
+    value = {"seed": 2**70, "label": "é", 3: None}
+
+    assert json_bytes(value) == '{"seed":1180591620717411303424,"label":"é","3":null}'.encode("utf-8")
+    indented = json_bytes(value, indent=True).decode("utf-8")
+    assert json.loads(indented) == {"seed": 2**70, "label": "é", "3": None}
+    assert '\n  "seed": 1180591620717411303424' in indented
+
+
+def test_json_loads_keeps_integers_wider_than_64_bits():
+    wide = 123456789012345678901234567890
+    assert json_loads(b'{"seed": 123456789012345678901234567890}') == {"seed": wide}
+    assert json_loads('[-9223372036854775809]') == [-9223372036854775809]
+    assert json_loads(json_bytes({"seed": wide})) == {"seed": wide}
+    assert json_loads(b"1e400") == float("inf")
+    assert json_loads(b'{"n": 1, "s": "\xc3\xa9"}') == {"n": 1, "s": "é"}
+
+
+def test_pool_registers_json_loads_per_connection():
+    pool = db_connection.get_pool("dummy-json-loads")
+    try:
+        assert pool.configure is register_json_loads
+    finally:
+        db_connection._POOLS.pop("dummy-json-loads", None)
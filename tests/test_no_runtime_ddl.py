@@ -7,6 +7,7 @@ HOT_PATH_MODULES = [
     "ragonometrics/pipeline/query_cache.py",
     "ragonometrics/pipeline/token_usage.py",
     "ragonometrics/pipeline/state.py",
+    "ragonometrics/pipeline/report_store.py",
     "ragonometrics/pipeline/run_records.py",
     "ragonometrics/integrations/openalex.py",
     "ragonometrics/integrations/citec.py",
@@ -0,0 +1,201 @@
+"""Tests for Postgres-backed token usage logging."""
+
+import pytest
+
+from ragonometrics.pipeline import token_usage
+
+
+@pytest.fixture(autouse=True)
+def _database_url(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "dummy")
+    token_usage._clear_usage_caches()
+
+
+def test_record_usage_async_batches_until_flush():
+    session_id = "usage-async-session"
+    for idx in range(3):
+        token_usage.record_usage_async(
+            model="gpt-test",
+            operation="answer",
+            input_tokens=10,
+            output_tokens=idx,
+            total_tokens=10 + idx,
+            session_id=session_id,
+            meta={"run_id": "usage-async-run"},
+        )
+    token_usage.flush_usage()
+
+    summary = token_usage.get_usage_summary(session_id=session_id)
+    assert summary == token_usage.UsageSummary(calls=3, input_tokens=30, output_tokens=3, total_tokens=33)
+    recent = token_usage.get_recent_usage(session_id=session_id)
+    assert {row["run_id"] for row in recent} == {"usage-async-run"}
+    assert token_usage.get_usage_by_model(session_id=session_id) == [
+        {"model": "gpt-test", "calls": 3, "total_tokens": 33}
+    ]
+
+
+def test_record_usage_async_inserts_inline_when_queue_full(monkeypatch):
+    inserted = []
+    writer = token_usage._UsageWriter()
+    writer._queue.maxsize = 1
+    writer._queue.put_nowait(("pending",))
+    monkeypatch.setattr(writer, "_run", lambda: None)
+    monkeypatch.setattr(token_usage, "_insert_usage_rows", inserted.extend)
+
+    writer.submit(("overflow",))
+
+    assert inserted == [("overflow",)]
+
+
+class _RejectedRow(Exception):
+    sqlstate = "22P02"
+
+
+def test_usage_writer_retries_rejected_batch_row_by_row(monkeypatch):
+    inserted = []
+
+    def _insert(rows):
+        if ("bad",) in rows:
+            raise _RejectedRow("invalid input syntax")
+        inserted.extend(rows)
+
+    monkeypatch.setattr(token_usage, "_insert_usage_rows", _insert)
+    writer = token_usage._UsageWriter()
+    for row in [("a",), ("bad",), ("b",)]:
+        writer._queue.put_nowait(row)
+    writer.submit(("c",))
+
+    with pytest.raises(_RejectedRow):
+        writer.flush()
+    assert inserted == [("a",), ("b",), ("c",)]
+    writer.flush()
+
+
+def test_usage_writer_does_not_retry_connection_failures(monkeypatch):
+    attempts = []
+
+    def _insert(rows):
+        attempts.append(len(rows))
+        raise RuntimeError("connection refused")
+
+    monkeypatch.setattr(token_usage, "_insert_usage_rows", _insert)
+    writer = token_usage._UsageWriter()
+    writer._queue.put_nowait(("a",))
+    writer.submit(("b",))
+
+    with pytest.raises(RuntimeError, match="connection refused"):
+        writer.flush()
+    assert attempts == [2]
+
+
+def _recording_pool(monkeypatch, conn):
+    import contextlib
+
+    monkeypatch.setattr(token_usage, "pooled_connection", lambda *args, **kwargs: contextlib.nullcontext(conn))
+    return conn
+
+
+def _usage_reads(conn):
+    return sum("FROM observability.token_usage" in sql for sql in conn.executed)
+
+
+def _usage_row(idx):
+    return token_usage._usage_params(model="gpt-test", operation="answer", input_tokens=idx, output_tokens=0, total_tokens=idx)
+
+
+def test_insert_usage_rows_copies_large_batches(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    rows = [_usage_row(idx) for idx in range(token_usage._COPY_MIN_USAGE_ROWS)]
+    token_usage._insert_usage_rows(rows)
+
+    assert len(cur.copies) == 1
+    assert cur.copied == [row + (token_usage._EMPTY_META_JSONB,) for row in rows]
+    assert cur.written == []
+    assert cur.commits == 1
+
+
+def test_insert_usage_rows_uses_executemany_for_small_batches(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    token_usage._insert_usage_rows([_usage_row(1), _usage_row(2)])
+
+    assert len(cur.written) == 2
+    assert cur.copies == []
+    assert cur.commits == 1
+
+
+def test_insert_usage_rows_prepares_single_insert(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    token_usage._insert_usage_rows([_usage_row(1)])
+
+    assert sum("INSERT INTO observability.token_usage" in sql for sql in cur.executed) == 1
+    assert cur.written == [] and cur.copies == []
+    assert cur.commits == 1
+
+
+def test_is_hour_aligned_requires_offset_aware_whole_utc_hours():
+    assert token_usage._is_hour_aligned(None)
+    assert token_usage._is_hour_aligned("2026-02-15T10:00:00+00:00")
+    assert token_usage._is_hour_aligned("2026-02-15T15:30:00+05:30")
+    assert not token_usage._is_hour_aligned("2026-02-15T10:00:00")
+    assert not token_usage._is_hour_aligned("2026-02-15T10:15:00+00:00")
+    assert not token_usage._is_hour_aligned("yesterday")
+
+
+def test_usage_queries_fall_back_to_events_for_request_filters(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    token_usage.get_usage_by_model(session_id="usage-route", since="2026-02-15T10:00:00Z")
+    assert "observability.token_usage_hourly" in cur.sql
+    assert "bucket >= %s" in cur.sql
+
+    token_usage.get_usage_by_model(session_id="usage-route", request_id="req-1")
+    assert "observability.token_usage_hourly" not in cur.sql
+    assert "request_id = %s" in cur.sql
+
+
+def test_usage_summary_is_cached_until_usage_is_written(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    cur.fetchone = lambda: (1, 2, 3, 5)
+
+    first = token_usage.get_usage_summary(session_id="usage-cache")
+    assert token_usage.get_usage_summary(session_id="usage-cache") == first
+    assert _usage_reads(cur) == 1
+
+    token_usage._insert_usage_rows([_usage_row(1)])
+    token_usage.get_usage_summary(session_id="usage-cache")
+    assert _usage_reads(cur) == 2
+
+
+def test_usage_params_binds_meta_as_orjson_jsonb():
+    row = token_usage._usage_params(
+        model="gpt-test", operation="answer", input_tokens=1, output_tokens=0, total_tokens=1, meta={"note": "é"}
+    )
+    assert row[-1].as_text() == '{"note":"é"}'
+
+
+def test_insert_usage_rows_leaves_empty_meta_to_column_default(monkeypatch, recording_conn):
+    cur = _recording_pool(monkeypatch, recording_conn)
+    assert len(_usage_row(1)) == len(token_usage._USAGE_COLUMNS)
+
+    token_usage._insert_usage_rows([_usage_row(1)])
+
+    assert "meta" not in cur.sql
+
+
+def test_where_clauses_match_filters_in_order():
+    assert token_usage._where_clauses(session_id=None, request_id=None, since=None) == ("", [])
+    assert token_usage._where_clauses(session_id="s", request_id=None, since="t", time_column="bucket") == (
+        " WHERE session_id = %s AND bucket >= %s",
+        ["s", "t"],
+    )
+    assert token_usage._where_clauses(session_id="s", request_id="r", since="t") == (
+        " WHERE session_id = %s AND request_id = %s AND created_at >= %s",
+        ["s", "r", "t"],
+    )
+
+
+def test_recent_usage_row_formats_created_at():
+    from datetime import datetime, timezone
+
+    row = (datetime(2026, 2, 15, 10, 0, tzinfo=timezone.utc), "gpt-test", "answer", None, None, 1, 2, 3, None, None, None)
+    assert token_usage._recent_usage_row_to_dict(row)["created_at"] == "2026-02-15T10:00:00+00:00"
+    assert token_usage._recent_usage_row_to_dict(("2026-02-15 10:00:00",) + row[1:])["created_at"] == "2026-02-15 10:00:00"
@@ -0,0 +1,462 @@
+"""Tests for workflow orchestration helpers."""
+
+import contextlib
+import hashlib
+import importlib.util
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+
+def _load_mod(path: str, name: str):
+    spec = importlib.util.spec_from_file_location(name, Path(path).resolve())
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+workflow = _load_mod("ragonometrics/pipeline/workflow.py", "ragonometrics.pipeline.workflow")
+
+
+def test_answer_subquestions_runs_concurrently_in_planner_order(monkeypatch):
+    started = threading.Barrier(3, timeout=5)
+
+    def _fake_answer(*, subq, question_id, **kwargs):
+        started.wait()
+        return {"question": subq, "answer": question_id}
+
+    monkeypatch.setattr(workflow, "_answer_subquestion", _fake_answer)
+    monkeypatch.setenv("WORKFLOW_SUBQUESTION_WORKERS", "3")
+
+    answers = workflow._answer_subquestions(
+        client=None,
+        model="m",
+        settings=None,
+        chunks=[],
+        chunk_embeddings=[],
+        citations_context="",
+        subquestions=["a", "b", "c"],
+    )
+
+    assert answers == [
+        {"question": "a", "answer": "S01"},
+        {"question": "b", "answer": "S02"},
+        {"question": "c", "answer": "S03"},
+    ]
+
+
+
+def test_answer_subquestions_runs_sequentially_by_default(monkeypatch):
+    active = []
+
+    def _fake_answer(*, subq, question_id, **kwargs):
+        assert threading.current_thread() is threading.main_thread()
+        active.append(subq)
+        return {"question": subq, "answer": question_id}
+
+    monkeypatch.setattr(workflow, "_answer_subquestion", _fake_answer)
+    monkeypatch.delenv("WORKFLOW_SUBQUESTION_WORKERS", raising=False)
+
+    answers = workflow._answer_subquestions(
+        client=None,
+        model="m",
+        settings=None,
+        chunks=[],
+        chunk_embeddings=[],
+        citations_context="",
+        subquestions=["a", "b"],
+    )
+
+    assert active == ["a", "b"]
+    assert [item["answer"] for item in answers] == ["S01", "S02"]
+
+
+def test_answer_subquestions_cancels_queued_work_after_first_failure(monkeypatch):
+    started = []
+    release = threading.Event()
+
+    def _fake_answer(*, subq, question_id, **kwargs):
+        started.append(subq)
+        if subq == "b":
+            raise RuntimeError("provider error")
+        release.wait(1)
+        return {"question": subq, "answer": question_id}
+
+    monkeypatch.setattr(workflow, "_answer_subquestion", _fake_answer)
+    monkeypatch.setenv("WORKFLOW_SUBQUESTION_WORKERS", "2")
+
+    with pytest.raises(RuntimeError, match="provider error"):
+        workflow._answer_subquestions(
+            client=None,
+            model="m",
+            settings=None,
+            chunks=[],
+            chunk_embeddings=[],
+            citations_context="",
+            subquestions=["a", "b", "c", "d"],
+        )
+
+    assert "d" not in started
+
+def test_can_connect_db_probes_once_until_a_query_fails(monkeypatch):
+    probes = []
+
+    class _Conn:
+        def close(self):
+            pass
+
+    def _fake_connect(db_url, require_migrated=False):
+        probes.append(db_url)
+        return _Conn()
+
+    monkeypatch.setattr(workflow, "db_connect", _fake_connect)
+    monkeypatch.setattr(workflow, "_REACHABLE_DB_URLS", set())
+
+    assert workflow._can_connect_db("postgresql://db/a")
+    assert workflow._can_connect_db("postgresql://db/a")
+    assert probes == ["postgresql://db/a"]
+
+    def _failing_pool(*args, **kwargs):
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(workflow, "pooled_connection", _failing_pool)
+    monkeypatch.setattr(workflow, "flush_usage", lambda: None)
+    out = workflow._collect_usage_rollup_for_run(run_id="r1", db_url="postgresql://db/a")
+
+    assert out["status"] == "failed"
+    assert workflow._can_connect_db("postgresql://db/a")
+    assert probes == ["postgresql://db/a", "postgresql://db/a"]
+
+
+def test_finalize_renders_audit_while_usage_rollup_runs(monkeypatch, tmp_path):
+    both_running = threading.Barrier(2, timeout=5)
+
+    def _fake_render(*, run_id, report_path, report_dir):
+        assert report_path.exists()
+        both_running.wait()
+        return {"status": "completed"}
+
+    def _fake_usage(*, db_url, run_id):
+        both_running.wait()
+        return {"status": "collected"}
+
+    stored = []
+    monkeypatch.setattr(workflow, "_render_audit_artifacts", _fake_render)
+    monkeypatch.setattr(workflow, "_collect_usage_rollup_for_run", _fake_usage)
+    monkeypatch.setattr(
+        workflow,
+        "_store_report_in_db",
+        lambda **kwargs: stored.append(dict(kwargs["payload"])) or {"status": "stored"},
+    )
+    monkeypatch.setattr(workflow, "record_step", lambda *args, **kwargs: None)
+    monkeypatch.setattr(workflow, "set_workflow_status", lambda *args, **kwargs: None)
+
+    summary = workflow._finalize_workflow_report(
+        report_dir=tmp_path,
+        run_id="r1",
+        summary={},
+        state_db=tmp_path / "state.db",
+        report_started_at="2026-01-01T00:00:00+00:00",
+        db_url="postgresql://db/a",
+        workflow_status="completed",
+    )
+
+    assert stored[0]["usage_store"] == {"status": "collected"}
+    assert stored[0]["audit_artifacts"] == {"status": "completed"}
+    assert summary["report_store"] == {"status": "stored"}
+
+
+def test_finalize_writes_report_before_render_and_once_after_store(monkeypatch, tmp_path):
+    writes = []
+    real_write = workflow._write_report
+
+    def _counting_write(report_dir, run_id, payload):
+        writes.append(payload["report_store"]["status"])
+        return real_write(report_dir, run_id, payload)
+
+    monkeypatch.setattr(workflow, "_write_report", _counting_write)
+    monkeypatch.setattr(workflow, "_render_audit_artifacts", lambda **kwargs: {"status": "skipped"})
+    monkeypatch.setattr(workflow, "_collect_usage_rollup_for_run", lambda **kwargs: {"status": "skipped"})
+    monkeypatch.setattr(workflow, "_store_report_in_db", lambda **kwargs: {"status": "stored"})
+    monkeypatch.setattr(workflow, "record_step", lambda *args, **kwargs: None)
+    monkeypatch.setattr(workflow, "set_workflow_status", lambda *args, **kwargs: None)
+
+    workflow._finalize_workflow_report(
+        report_dir=tmp_path,
+        run_id="r1",
+        summary={},
+        state_db=tmp_path / "state.db",
+        report_started_at="2026-01-01T00:00:00+00:00",
+        db_url=None,
+        workflow_status="completed",
+    )
+
+    assert writes == ["pending", "stored"]
+    assert json.loads((tmp_path / "workflow-report-r1.json").read_text())["report_store"] == {"status": "stored"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["workflow-report-r1.json"]
+
+
+def test_split_context_chunks_parses_tagged_blocks_only():
+    context = (
+        "(page 1 words 0-9)\nfirst chunk\ncontinues\n\n"
+        "(page 2 words 10-19 section Results )\n  second chunk  \n\n"
+        "Citations:\n1. Not a chunk\n\n"
+        "(page 3 words 20-29)\n\n"
+        "(page 4 words 30-39)\nlast"
+    )
+
+    assert workflow._split_context_chunks(context) == [
+        {"page": 1, "start_word": 0, "end_word": 9, "section": None, "text": "first chunk\ncontinues"},
+        {"page": 2, "start_word": 10, "end_word": 19, "section": "Results", "text": "second chunk"},
+        {"page": 3, "start_word": 20, "end_word": 29, "section": None, "text": ""},
+        {"page": 4, "start_word": 30, "end_word": 39, "section": None, "text": "last"},
+    ]
+    assert workflow._split_context_chunks("") == []
+    assert workflow._split_context_chunks("no (page 1 words 0-9) header here") == []
+
+
+def test_split_context_chunks_normalizes_line_endings():
+    context = "(page 1 words 0-9)\r\nfirst\r\nline\r\n\r\n(page 2 words 10-19)\rsecond\f\f(page 3 words 20-29)\nthird"
+
+    assert workflow._split_context_chunks(context) == [
+        {"page": 1, "start_word": 0, "end_word": 9, "section": None, "text": "first\nline"},
+        {"page": 2, "start_word": 10, "end_word": 19, "section": None, "text": "second"},
+        {"page": 3, "start_word": 20, "end_word": 29, "section": None, "text": "third"},
+    ]
+
+
+def test_write_report_serializes_non_json_values(tmp_path):
+    path = workflow._write_report(
+        tmp_path,
+        "r1",
+        {"finished_at": workflow.datetime(2026, 1, 2, tzinfo=workflow.timezone.utc), "by_page": {3: "é"}, "path": tmp_path},
+    )
+
+    text = path.read_text(encoding="utf-8")
+    assert json.loads(text) == {
+        "finished_at": "2026-01-02T00:00:00+00:00",
+        "by_page": {"3": "é"},
+        "path": str(tmp_path),
+    }
+    assert '\n  "by_page"' in text
+
+
+class _StreamingCursor:
+    def __init__(self, rows, calls):
+        self._rows = rows
+        self._calls = calls
+        self.itersize = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._calls.append("closed")
+        return False
+
+    def execute(self, sql, params):
+        self._calls.append(("execute", params, self.itersize))
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def fetchall(self):
+        raise AssertionError("rollup rows must be streamed")
+
+
+class _AggregateCursor(_StreamingCursor):
+    def fetchall(self):
+        return list(self._rows)
+
+
+def _streaming_pool(rows, calls, aggregates=()):
+    class _Conn:
+        def cursor(self, name=None):
+            calls.append(("cursor", name))
+            if name is None:
+                return _AggregateCursor(aggregates, calls)
+            return _StreamingCursor(rows, calls)
+
+    @contextlib.contextmanager
+    def _pool(db_url, *, require_migrated=True, autocommit=False):
+        calls.append(("checkout", autocommit))
+        yield _Conn()
+
+    return _pool
+
+
+def test_usage_rollup_streams_rows_and_reads_sums_from_grouping_sets(monkeypatch):
+    calls = []
+    rows = [
+        ("answer", "m1", "Q1", 2, 10, 5, 15, 0.5, 0.25, 0.75, None, None),
+        ("answer", "m2", "Q2", 1, 4, 1, 5, 0.25, 0.0, 0.25, None, None),
+        (None, None, None, 1, 1, 1, 2, None, None, None, None, None),
+    ]
+    aggregates = [
+        (0, "answer", 3, 14, 6, 20, 0.75, 0.25, 1.0),
+        (0, "", 1, 1, 1, 2, 0.0, 0.0, 0.0),
+        (1, None, 4, 15, 7, 22, 0.75, 0.25, 1.0),
+    ]
+    monkeypatch.setattr(workflow, "_REACHABLE_DB_URLS", {"postgresql://db/a"})
+    monkeypatch.setattr(workflow, "flush_usage", lambda: calls.append("flushed"))
+    monkeypatch.setattr(workflow, "pooled_connection", _streaming_pool(rows, calls, aggregates))
+
+    out = workflow._collect_usage_rollup_for_run(db_url="postgresql://db/a", run_id="r1")
+
+    assert calls == [
+        "flushed",
+        ("checkout", False),
+        ("cursor", None),
+        ("execute", ("r1",), None),
+        "closed",
+        ("cursor", "workflow_usage_rollup"),
+        ("execute", ("r1",), workflow._USAGE_ROLLUP_ITERSIZE),
+        "closed",
+    ]
+    assert out["status"] == "fetched"
+    assert out["row_count"] == 3
+    assert out["totals"] == {
+        "calls": 4,
+        "input_tokens": 15,
+        "output_tokens": 7,
+        "total_tokens": 22,
+        "cost_usd_input": 0.75,
+        "cost_usd_output": 0.25,
+        "cost_usd_total": 1.0,
+    }
+    assert out["by_step"] == {
+        "answer": {"calls": 3, "input_tokens": 14, "output_tokens": 6, "total_tokens": 20, "cost_usd_total": 1.0},
+        "": {"calls": 1, "input_tokens": 1, "output_tokens": 1, "total_tokens": 2, "cost_usd_total": 0.0},
+    }
+    assert out["rows"][2]["step"] == "" and out["rows"][2]["cost_usd_total"] == 0.0
+
+
+def test_usage_rollup_aggregates_default_to_zero_for_empty_run():
+    totals, by_step = workflow._usage_rollup_aggregates([(1, None, None, None, None, None, None, None, None)])
+
+    assert totals == {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd_input": 0.0,
+        "cost_usd_output": 0.0,
+        "cost_usd_total": 0.0,
+    }
+    assert by_step == {}
+
+
+def test_parse_subquestions_strips_markers_and_dedupes_in_order():
+    raw = "\n".join(
+        [
+            "1. What is the identification strategy?",
+            "  - 2. Which data sources are used?",
+            "• What is the identification strategy?",
+            "* 3. How robust are the results?",
+            "   ",
+            "4.",
+            "- How large is the sample?",
+        ]
+    )
+
+    assert workflow._parse_subquestions(raw, 3) == [
+        "What is the identification strategy?",
+        "Which data sources are used?",
+        "How robust are the results?",
+    ]
+    assert workflow._parse_subquestions(raw, 10)[-1] == "How large is the sample?"
+    assert workflow._parse_subquestions("", 3) == []
+
+
+def test_run_workflow_flushes_queued_steps_when_the_run_raises(monkeypatch):
+    flushes = []
+    monkeypatch.setattr(workflow, "flush_steps", lambda *args: flushes.append(args))
+    monkeypatch.setattr(workflow, "_run_workflow", lambda **kwargs: {"run_id": "r1"})
+
+    assert workflow.run_workflow(papers_dir=Path("papers")) == {"run_id": "r1"}
+    assert flushes == []
+
+    def _failing_run(**kwargs):
+        raise ValueError("ingest failed")
+
+    monkeypatch.setattr(workflow, "_run_workflow", _failing_run)
+
+    with pytest.raises(ValueError, match="ingest failed"):
+        workflow.run_workflow(papers_dir=Path("papers"))
+    assert flushes == [()]
+
+
+def test_finalize_marks_run_failed_when_queued_steps_were_not_stored(monkeypatch, tmp_path):
+    statuses = []
+
+    def _failing_flush(run_id=None):
+        assert run_id == "r1"
+        raise RuntimeError("step batch rejected")
+
+    monkeypatch.setattr(workflow, "flush_steps", _failing_flush)
+    monkeypatch.setattr(workflow, "_render_audit_artifacts", lambda **kwargs: {"status": "skipped"})
+    monkeypatch.setattr(workflow, "_collect_usage_rollup_for_run", lambda **kwargs: {"status": "skipped"})
+    monkeypatch.setattr(
+        workflow, "_store_report_in_db", lambda **kwargs: {"status": kwargs["workflow_status"]}
+    )
+    monkeypatch.setattr(workflow, "record_step", lambda *args, **kwargs: None)
+    monkeypatch.setattr(workflow, "set_workflow_status", lambda db, run_id, status: statuses.append(status))
+
+    summary = workflow._finalize_workflow_report(
+        report_dir=tmp_path,
+        run_id="r1",
+        summary={},
+        state_db=tmp_path / "state.db",
+        report_started_at="2026-01-01T00:00:00+00:00",
+        db_url=None,
+        workflow_status="completed",
+    )
+
+    assert summary["step_store"] == {"status": "failed", "error": "step batch rejected"}
+    assert summary["report_store"] == {"status": "failed"}
+    assert statuses == ["failed"]
+
+def test_render_audit_artifacts_records_digests_of_written_files(monkeypatch, tmp_path):
+    def _fake_subprocess(cmd, *, cwd):
+        for flag in ("--output", "--output-tex", "--output-pdf"):
+            if flag in cmd:
+                target = Path(cmd[cmd.index(flag) + 1])
+                target.write_bytes(target.suffix.encode("utf-8"))
+        return 0, "", ""
+
+    monkeypatch.setattr(workflow, "_run_subprocess", _fake_subprocess)
+    monkeypatch.delenv("WORKFLOW_RENDER_AUDIT_ARTIFACTS", raising=False)
+    monkeypatch.delenv("WORKFLOW_RENDER_AUDIT_PDF", raising=False)
+
+    out = workflow._render_audit_artifacts(run_id="r1", report_path=tmp_path / "report.json", report_dir=tmp_path)
+
+    assert out["status"] == "completed"
+    assert out["markdown"]["sha256"] == hashlib.sha256(b".md").hexdigest()
+    assert out["pdf"]["sha256"] == hashlib.sha256(b".pdf").hexdigest()
+    assert out["pdf"]["tex_sha256"] == hashlib.sha256(b".tex").hexdigest()
+
+
+def test_usage_rollup_reports_flush_failure_without_failing_the_read(monkeypatch):
+    calls = []
+
+    def _failing_flush():
+        raise RuntimeError("queued insert failed")
+
+    monkeypatch.setattr(workflow, "_REACHABLE_DB_URLS", {"postgresql://db/a"})
+    monkeypatch.setattr(workflow, "flush_usage", _failing_flush)
+    monkeypatch.setattr(workflow, "pooled_connection", _streaming_pool([], calls, [(1, None, 0, 0, 0, 0, 0.0, 0.0, 0.0)]))
+
+    out = workflow._collect_usage_rollup_for_run(db_url="postgresql://db/a", run_id="r1")
+
+    assert out["status"] == "fetched"
+    assert out["flush_status"] == "failed"
+    assert out["flush_error"] == "queued insert failed"
+    assert "postgresql://db/a" in workflow._REACHABLE_DB_URLS
+
+
+def test_write_report_keeps_integers_wider_than_64_bits(tmp_path):
+    path = workflow._write_report(tmp_path, "r1", {"seed": 2**70})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"seed": 2**70}
@@ -1,18 +1,12 @@
 """Tests for Postgres JSON-style workflow report storage helpers."""
 
-import importlib.util
+import contextlib
+import hashlib
 import json
+import os
 from pathlib import Path
 
-
-def _load_mod(path: str, name: str):
-    spec = importlib.util.spec_from_file_location(name, Path(path).resolve())
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod
-
-
-report_store = _load_mod("ragonometrics/pipeline/report_store.py", "ragonometrics.pipeline.report_store")
+from ragonometrics.pipeline import report_store
 
 
 def test_upsert_workflow_report():
@@ -74,3 +68,305 @@ def test_store_workflow_reports_from_dir(tmp_path: Path):
     assert stats["total"] == 1
     assert stats["stored"] == 1
     assert stats["skipped"] == 0
+
+
+def test_store_workflow_reports_from_dir_batches_and_skips_bad_reports(tmp_path: Path, monkeypatch):
+    for idx in range(3):
+        payload = {
+            "run_id": f"run-report-store-batch-{idx}",
+            "finished_at": "2026-02-15T00:02:00+00:00",
+            "papers_dir": "papers/example-batch.pdf",
+            "agentic": {"status": "completed"},
+        }
+        path = tmp_path / f"workflow-report-run-report-store-batch-{idx}.json"
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    # Force an upsert failure for one report inside the batch.
+    real_upsert_artifacts = report_store._upsert_artifacts
+
+    def _failing_upsert_artifacts(cur, *, run_id, report_path, view):
+        if run_id == "run-report-store-batch-bad":
+            raise RuntimeError("artifact upsert failed")
+        real_upsert_artifacts(cur, run_id=run_id, report_path=report_path, view=view)
+
+    monkeypatch.setattr(report_store, "_upsert_artifacts", _failing_upsert_artifacts)
+    bad = {"run_id": "run-report-store-batch-bad", "finished_at": "2026-02-15T00:02:00+00:00"}
+    (tmp_path / "workflow-report-run-report-store-batch-bad.json").write_text(json.dumps(bad), encoding="utf-8")
+    (tmp_path / "workflow-report-run-report-store-batch-garbled.json").write_text("{", encoding="utf-8")
+
+    stats = report_store.store_workflow_reports_from_dir(
+        reports_dir=tmp_path,
+        db_url="dummy",
+        commit_every=2,
+    )
+    assert stats == {"total": 5, "stored": 3, "skipped": 2, "unchanged": 0}
+
+    conn = report_store.connect("dummy", require_migrated=False)
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT COUNT(*)
+        FROM run_records
+        WHERE run_id LIKE 'run-report-store-batch-%' AND record_kind = 'report'
+        """
+    )
+    assert cur.fetchone()[0] == 3
+
+
+def test_upsert_workflow_report_prepares_ledger_statements():
+    class _RecordingCursor:
+        def __init__(self):
+            self.prepare_flags = []
+            self.batch_sizes = []
+
+        def execute(self, sql, params=None, *, prepare=None):
+            self.prepare_flags.append(prepare)
+
+        def executemany(self, sql, params_seq):
+            self.batch_sizes.append(len(list(params_seq)))
+
+    class _RecordingConn:
+        def __init__(self):
+            self.cur = _RecordingCursor()
+
+        def cursor(self):
+            return self.cur
+
+        def pipeline(self):
+            return contextlib.nullcontext()
+
+        def commit(self):
+            pass
+
+    conn = _RecordingConn()
+    report_store.upsert_workflow_report(
+        conn,
+        run_id="run-report-store-prepared",
+        report_path="",
+        payload={"workstream_id": "ws-1", "agentic": {"report_questions": [{"id": "A01"}, {"id": "A02"}]}},
+    )
+    assert conn.cur.prepare_flags == [True, True, True]
+    assert conn.cur.batch_sizes == [2]
+
+
+def test_payload_view_tolerates_malformed_sections():
+    view = report_store._payload_view(
+        {
+            "config": "not-a-dict",
+            "workstream_id": "  ws-1 ",
+            "agentic": {
+                "question": " What is the effect? ",
+                "report_questions": [{"id": "A01"}, "junk"],
+                "report_question_confidence": {"mean": "0.5", "label_counts": ["bad"]},
+            },
+            "audit_artifacts": None,
+        }
+    )
+    assert view.config_hash == ""
+    assert view.config_effective == {}
+    assert view.workstream_id == "ws-1"
+    assert view.question == "What is the effect?"
+    assert view.report_questions == [{"id": "A01"}]
+    assert view.confidence_mean == 0.5
+    assert view.confidence_label_counts == {}
+    assert view.audit_artifacts == {}
+
+
+def test_store_workflow_reports_from_dir_parallel_parse(tmp_path: Path):
+    for idx in range(4):
+        payload = {"run_id": f"run-report-store-parallel-{idx}", "finished_at": "2026-02-15T00:02:00+00:00"}
+        path = tmp_path / f"workflow-report-run-report-store-parallel-{idx}.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+    (tmp_path / "workflow-report-run-report-store-parallel-list.json").write_text("[]", encoding="utf-8")
+
+    with report_store._start_parse_pool(2) as pool:
+        parsed = list(report_store._iter_parsed_reports(sorted(tmp_path.glob("*.json")), pool=pool, workers=2))
+    assert [path.name for path, _ in parsed] == sorted(path.name for path in tmp_path.glob("*.json"))
+    assert sum(1 for _, payload in parsed if payload is None) == 1
+
+    stats = report_store.store_workflow_reports_from_dir(
+        reports_dir=tmp_path,
+        db_url="dummy",
+        parse_workers=2,
+    )
+    assert stats == {"total": 5, "stored": 4, "skipped": 1, "unchanged": 0}
+
+
+def test_store_workflow_reports_from_dir_starts_parsers_before_connecting(tmp_path: Path, monkeypatch):
+    (tmp_path / "workflow-report-run-report-store-order.json").write_text(
+        json.dumps({"run_id": "run-report-store-order"}), encoding="utf-8"
+    )
+    events = []
+    real_start = report_store._start_parse_pool
+    real_connect = report_store.connect
+
+    def _start(workers):
+        events.append("parsers")
+        return real_start(workers)
+
+    def _connect(*args, **kwargs):
+        events.append("connect")
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(report_store, "_start_parse_pool", _start)
+    monkeypatch.setattr(report_store, "connect", _connect)
+
+    stats = report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy", parse_workers=2)
+
+    assert events == ["parsers", "connect"]
+    assert stats["stored"] == 1
+
+
+def test_sha256_file_matches_in_memory_digest(tmp_path: Path):
+
+    path = tmp_path / "artifact.bin"
+    data = b"ragonometrics" * 200_000
+    path.write_bytes(data)
+    assert report_store.sha256_file(path) == hashlib.sha256(data).hexdigest()
+    small = tmp_path / "small.bin"
+    small.write_bytes(b"ragonometrics")
+    assert report_store.sha256_file(small) == hashlib.sha256(b"ragonometrics").hexdigest()
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert report_store.sha256_file(empty) == hashlib.sha256(b"").hexdigest()
+    assert report_store.sha256_file(tmp_path / "missing.bin") is None
+
+
+def test_sha256_file_rehashes_only_when_file_changes(tmp_path: Path):
+    import os
+
+    path = tmp_path / "audit.md"
+    path.write_bytes(b"first")
+    report_store._sha256_file_cached.cache_clear()
+    assert report_store.sha256_file(path) == hashlib.sha256(b"first").hexdigest()
+    assert report_store.sha256_file(path) == hashlib.sha256(b"first").hexdigest()
+    info = report_store._sha256_file_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    stat = path.stat()
+    path.write_bytes(b"second")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert report_store.sha256_file(path) == hashlib.sha256(b"second").hexdigest()
+
+
+def test_iter_report_paths_matches_sorted_glob_order(tmp_path: Path):
+    for rel in [
+        "workflow-report-b.json",
+        "workflow-report-a.json",
+        "notes.json",
+        "archive/workflow-report-c.json",
+        "archive/nested/workflow-report-d.json",
+        "workflow-report-a/workflow-report-e.json",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}", encoding="utf-8")
+
+    pattern = "workflow-report-*.json"
+    recursive = list(report_store._iter_report_paths(tmp_path, recursive=True))
+    assert recursive == sorted(tmp_path.rglob(pattern))
+    flat = list(report_store._iter_report_paths(tmp_path, recursive=False))
+    assert flat == sorted(tmp_path.glob(pattern))
+    assert list(report_store._iter_report_paths(tmp_path / "missing", recursive=True)) == []
+
+
+def test_store_workflow_reports_from_dir_skips_unchanged_reports(tmp_path: Path):
+    for idx in range(2):
+        payload = {"run_id": f"run-report-store-unchanged-{idx}", "finished_at": "2026-02-15T00:02:00+00:00"}
+        path = tmp_path / f"workflow-report-run-report-store-unchanged-{idx}.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+
+    first = report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy")
+    assert first == {"total": 2, "stored": 2, "skipped": 0, "unchanged": 0}
+
+    changed = {"run_id": "run-report-store-unchanged-1", "finished_at": "2026-02-16T00:00:00+00:00"}
+    (tmp_path / "workflow-report-run-report-store-unchanged-1.json").write_text(json.dumps(changed), encoding="utf-8")
+    second = report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy")
+    assert second == {"total": 2, "stored": 1, "skipped": 0, "unchanged": 1}
+
+    forced = report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy", skip_unchanged=False)
+    assert forced == {"total": 2, "stored": 2, "skipped": 0, "unchanged": 0}
+
+
+def test_store_workflow_reports_from_dir_looks_up_only_candidate_runs(tmp_path: Path, monkeypatch):
+    for idx in range(5):
+        payload = {"run_id": f"run-report-store-lookup-{idx}", "finished_at": "2026-02-15T00:02:00+00:00"}
+        path = tmp_path / f"workflow-report-run-report-store-lookup-{idx}.json"
+        path.write_text(json.dumps(payload), encoding="utf-8")
+    assert report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy")["stored"] == 5
+
+    lookups = []
+    real_lookup = report_store._stored_report_hashes
+
+    def _recording_lookup(cur, run_ids):
+        lookups.append(list(run_ids))
+        return real_lookup(cur, run_ids)
+
+    monkeypatch.setattr(report_store, "_stored_report_hashes", _recording_lookup)
+    stats = report_store.store_workflow_reports_from_dir(reports_dir=tmp_path, db_url="dummy", limit=3, commit_every=2)
+
+    assert stats == {"total": 3, "stored": 0, "skipped": 0, "unchanged": 3}
+    assert lookups == [
+        ["run-report-store-lookup-0", "run-report-store-lookup-1"],
+        ["run-report-store-lookup-2"],
+    ]
+
+
+def test_store_workflow_report_uses_pooled_connection():
+    report_store.store_workflow_report(
+        db_url="dummy",
+        run_id="run-report-store-pooled",
+        report_path="reports/workflow-report-run-report-store-pooled.json",
+        payload={"finished_at": "2026-02-15T00:02:00+00:00"},
+    )
+    conn = report_store.connect("dummy", require_migrated=False)
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT status FROM run_records WHERE run_id = %s AND record_kind = 'report'",
+        ("run-report-store-pooled",),
+    )
+    assert cur.fetchone()[0] == "completed"
+
+
+def test_upsert_artifacts_reuses_recorded_sha256(tmp_path: Path, monkeypatch, recording_conn):
+    md_path = tmp_path / "audit.md"
+    md_path.write_text("# audit", encoding="utf-8")
+    pdf_path = tmp_path / "audit.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    report_path = tmp_path / "workflow-report.json"
+    report_path.write_text("{}", encoding="utf-8")
+    os.utime(md_path, ns=(1_000_000_000, 1_000_000_000))
+    os.utime(report_path, ns=(2_000_000_000, 2_000_000_000))
+    hashed = []
+    real_sha256_file = report_store.sha256_file
+
+    def _tracking_sha256_file(path):
+        hashed.append(Path(path).name)
+        return real_sha256_file(path)
+
+    monkeypatch.setattr(report_store, "sha256_file", _tracking_sha256_file)
+
+    cur = recording_conn
+    view = report_store._payload_view(
+        {
+            "audit_artifacts": {
+                "markdown": {"status": "generated", "path": str(md_path), "sha256": "a" * 64},
+                "pdf": {"status": "generated", "path": str(pdf_path)},
+            }
+        }
+    )
+    report_store._upsert_artifacts(cur, run_id="run-report-store-known-sha", report_path=str(report_path), view=view)
+
+    assert sorted(hashed) == ["audit.pdf", "workflow-report.json"]
+    digests = {row[3]: row[5] for row in cur.written}
+    assert digests["audit_markdown"] == "a" * 64
+    assert digests["audit_pdf"] == hashlib.sha256(b"%PDF").hexdigest()
+
+    # An artifact regenerated after the report was written is hashed again.
+    os.utime(md_path, ns=(3_000_000_000, 3_000_000_000))
+    hashed.clear()
+    cur.written.clear()
+    report_store._upsert_artifacts(cur, run_id="run-report-store-known-sha", report_path=str(report_path), view=view)
+
+    assert "audit.md" in hashed
+    digests = {row[3]: row[5] for row in cur.written}
+    assert digests["audit_markdown"] == hashlib.sha256(b"# audit").hexdigest()
@@ -0,0 +1,297 @@
+"""Tests for Postgres-backed workflow state persistence helpers."""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from ragonometrics.pipeline import state
+
+
+@pytest.fixture(autouse=True)
+def _database_url(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "dummy")
+
+
+def test_workflow_run_and_steps_round_trip():
+    db_path = Path("unused")
+    created = state.create_workflow_run(
+        db_path,
+        run_id="run-state-round-trip",
+        papers_dir="papers",
+        config_hash="cfg-1",
+        workstream_id="ws-state",
+        arm="baseline",
+    )
+    assert created == state.get_workflow_run(db_path, "run-state-round-trip")
+    assert created["status"] == "running"
+    state.record_step(
+        db_path,
+        run_id="run-state-round-trip",
+        step="prep",
+        status="completed",
+        started_at="2026-02-15T00:00:00+00:00",
+        finished_at="2026-02-15T00:01:00+00:00",
+    )
+    state.record_step(
+        db_path,
+        run_id="run-state-round-trip",
+        step="agentic",
+        status="running",
+        started_at="2026-02-15T00:01:00+00:00",
+    )
+    state.set_workflow_status(db_path, "run-state-round-trip", "completed")
+
+    run = state.get_workflow_run(db_path, "run-state-round-trip")
+    assert run is not None
+    assert run["status"] == "completed"
+    assert run["config_hash"] == "cfg-1"
+    assert run["workstream_id"] == "ws-state"
+    assert run["finished_at"]
+
+    steps = state.list_workflow_steps(db_path, "run-state-round-trip")
+    assert [(item["step"], item["status"]) for item in steps] == [("prep", "completed"), ("agentic", "running")]
+    assert state.get_workflow_run(db_path, "run-state-missing") is None
+
+
+def test_record_steps_batches_events_for_multiple_runs():
+    db_path = Path("unused")
+    for run_id in ("run-state-batch-a", "run-state-batch-b"):
+        state.create_workflow_run(db_path, run_id=run_id, papers_dir="papers", config_hash="cfg-batch")
+    state.record_steps(
+        db_path,
+        [
+            {"run_id": "run-state-batch-a", "step": "prep", "status": "completed", "started_at": "2026-02-15T00:00:00+00:00"},
+            {"run_id": "run-state-batch-a", "step": "agentic", "status": "running", "started_at": "2026-02-15T00:01:00+00:00"},
+            {"run_id": "run-state-batch-b", "step": "prep", "status": "failed", "error_code": "E1"},
+        ],
+    )
+    state.record_steps(db_path, [])
+
+    assert [item["step"] for item in state.list_workflow_steps(db_path, "run-state-batch-a")] == ["prep", "agentic"]
+    assert [item["status"] for item in state.list_workflow_steps(db_path, "run-state-batch-b")] == ["failed"]
+
+
+def test_record_step_async_batches_until_flush():
+    db_path = Path("unused")
+    state.create_workflow_run(db_path, run_id="run-state-async", papers_dir="papers", config_hash="cfg-async")
+    state.record_step_async(db_path, run_id="run-state-async", step="prep", status="running")
+    state.record_step_async(db_path, run_id="run-state-async", step="prep", status="completed")
+    state.record_step_async(db_path, run_id="run-state-async", step="ingest", status="running")
+    state.flush_steps()
+
+    steps = {item["step"]: item["status"] for item in state.list_workflow_steps(db_path, "run-state-async")}
+    assert steps == {"prep": "completed", "ingest": "running"}
+
+
+def test_flush_steps_reraises_background_errors(monkeypatch):
+    def _fail(db_path, steps):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(state, "record_steps", _fail)
+    state.record_step_async(Path("unused"), run_id="run-state-async-fail", step="prep", status="running")
+    state.flush_steps()
+    with pytest.raises(RuntimeError, match="write failed"):
+        state.flush_steps("run-state-async-fail")
+    state.flush_steps("run-state-async-fail")
+
+
+class _RejectedStep(Exception):
+    sqlstate = "23503"
+
+
+def test_flush_steps_raises_only_the_callers_run_error_and_keeps_good_steps(monkeypatch):
+    written = []
+
+    def _record_steps(db_path, steps):
+        if any(step["run_id"] == "run-bad" for step in steps):
+            raise _RejectedStep("foreign key violation")
+        written.extend((step["run_id"], step["step"]) for step in steps)
+
+    monkeypatch.setattr(state, "record_steps", _record_steps)
+    writer = state._StepWriter()
+    writer._queue.put((Path("unused"), {"run_id": "run-good", "step": "prep", "status": "running"}))
+    writer._queue.put((Path("unused"), {"run_id": "run-bad", "step": "prep", "status": "running"}))
+    writer.submit(Path("unused"), {"run_id": "run-good", "step": "ingest", "status": "running"})
+
+    writer.flush("run-good")
+    assert written == [("run-good", "prep"), ("run-good", "ingest")]
+    with pytest.raises(_RejectedStep):
+        writer.flush("run-bad")
+    writer.flush("run-bad")
+
+
+def _recording_connect(monkeypatch, conn):
+    import contextlib
+
+    def _connect(_db_path, *, autocommit=False):
+        conn.connect_modes.append(autocommit)
+        return contextlib.nullcontext(conn)
+
+    conn.connect_modes = []
+    monkeypatch.setattr(state, "_connect", _connect)
+    return conn
+
+
+def test_record_steps_copies_large_unique_batches(monkeypatch, recording_conn):
+    cur = _recording_connect(monkeypatch, recording_conn)
+    steps = [{"run_id": "run-state-copy", "step": f"step-{idx}", "status": "completed"} for idx in range(state._COPY_MIN_STEPS)]
+    state.record_steps(Path("unused"), steps)
+
+    assert len(cur.copies) == 1
+    assert cur.commits == 1
+    assert cur.written == []
+    assert len(cur.copied) == state._COPY_MIN_STEPS
+    assert all(len(row) == len(state._STEP_STAGE_COLUMNS) for row in cur.copied)
+
+
+def test_record_steps_uses_executemany_when_steps_repeat(monkeypatch, recording_conn):
+    cur = _recording_connect(monkeypatch, recording_conn)
+    steps = [{"run_id": "run-state-copy", "step": "agentic", "status": "running"} for _ in range(state._COPY_MIN_STEPS)]
+    state.record_steps(Path("unused"), steps)
+
+    assert len(cur.written) == state._COPY_MIN_STEPS
+    assert cur.commits == 1
+    assert cur.copies == []
+
+
+def test_set_workflow_status_autocommits_single_statement(monkeypatch, recording_conn):
+    cur = _recording_connect(monkeypatch, recording_conn)
+    state.set_workflow_status(Path("unused"), "run-state-status", "completed")
+
+    assert cur.connect_modes == [True]
+    assert len(cur.executed) == 1
+    assert cur.commits == 0
+
+
+class _StrictAutocommitConn:
+    """Connection double that, like psycopg, refuses autocommit changes mid-transaction."""
+
+    def __init__(self, log):
+        self._log = log
+        self._autocommit = False
+        self.in_transaction = False
+
+    @property
+    def autocommit(self):
+        return self._autocommit
+
+    @autocommit.setter
+    def autocommit(self, value):
+        if self.in_transaction:
+            raise RuntimeError("can't change 'autocommit' now: connection in transaction status INTRANS")
+        self._autocommit = value
+
+    def cursor(self, binary=None):
+        conn = self
+
+        class _Cursor:
+            def execute(self, sql, params=None, *, prepare=None):
+                if not conn.autocommit:
+                    conn.in_transaction = True
+                conn._log.append((" ".join(sql.split())[:20], conn.autocommit))
+
+            def fetchone(self):
+                return None
+
+        return _Cursor()
+
+    def commit(self):
+        self.in_transaction = False
+
+    def rollback(self):
+        self.in_transaction = False
+
+
+def test_set_workflow_status_autocommits_from_a_fresh_pool(monkeypatch):
+    import contextlib
+
+    from ragonometrics.db import connection as db_connection
+
+    log = []
+    conn = _StrictAutocommitConn(log)
+
+    class _Pool:
+        def __init__(self, **kwargs):
+            pass
+
+        def connection(self):
+            return contextlib.nullcontext(conn)
+
+    monkeypatch.setattr(db_connection, "ConnectionPool", _Pool)
+    monkeypatch.setattr(db_connection, "_POOLS", {})
+    monkeypatch.setattr(db_connection, "_SCHEMA_READY_POOLS", set())
+    monkeypatch.setattr(
+        db_connection,
+        "ensure_schema_ready",
+        lambda c: c.cursor().execute("SELECT version_num FROM alembic_version"),
+    )
+    monkeypatch.setenv("DATABASE_URL", "dummy-fresh-pool")
+
+    state.set_workflow_status(Path("unused"), "run-state-fresh", "completed")
+
+    assert log == [("SELECT version_num F", True), ("UPDATE workflow.run_", True)]
+    assert not conn.autocommit
+
+
+def test_stable_hash_matches_stdlib_json_serialization():
+    value = {
+        "step": "agentic",
+        "status": "completed",
+        "run_context": {"question": "Qu'est-ce que c'est? \u6f22 \"quoted\"\n", "config_hash": None, "arm": "gpt-5"},
+        "attempt": 2,
+    }
+    serialized = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    assert state._stable_hash(value) == hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def test_find_similar_completed_step_prefers_latest_finished_run():
+    db_path = Path("unused")
+    for run_id, finished_at in (("run-state-reuse-old", "2026-02-14T00:00:00+00:00"), ("run-state-reuse-new", "2026-02-15T00:00:00+00:00")):
+        state.create_workflow_run(db_path, run_id=run_id, papers_dir="papers-reuse", config_hash="cfg-reuse")
+        state.record_step(db_path, run_id=run_id, step="prep", status="completed", finished_at=finished_at)
+
+    found = state.find_similar_completed_step(
+        db_path,
+        step="prep",
+        exclude_run_id="run-state-reuse-current",
+        config_hash="cfg-reuse",
+        papers_dir="papers-reuse",
+    )
+    assert found is not None
+    assert found["run_id"] == "run-state-reuse-new"
+
+
+def test_to_iso_passes_text_through_and_formats_datetimes():
+    stamp = datetime(2026, 2, 15, 12, 30, tzinfo=timezone.utc)
+    assert state._to_iso(None) is None
+    assert state._to_iso("2026-02-15T12:30:00+00:00") == "2026-02-15T12:30:00+00:00"
+    assert state._to_iso(stamp) == "2026-02-15T12:30:00+00:00"
+    assert state._to_iso(stamp.date()) == "2026-02-15"
+
+
+def test_find_similar_completed_step_matches_question_null_as_empty():
+    db_path = Path("unused")
+    state.create_workflow_run(db_path, run_id="run-state-q-none", papers_dir="papers-q", config_hash="cfg-q")
+    state.create_workflow_run(db_path, run_id="run-state-q-text", papers_dir="papers-q", config_hash="cfg-q", question="Why?")
+    for run_id in ("run-state-q-none", "run-state-q-text"):
+        state.record_step(db_path, run_id=run_id, step="prep", status="completed", finished_at="2026-02-15T00:00:00+00:00")
+
+    def _lookup(question):
+        found = state.find_similar_completed_step(
+            db_path,
+            step="prep",
+            exclude_run_id="run-state-q-current",
+            config_hash="cfg-q",
+            papers_dir="papers-q",
+            question=question,
+            match_question=True,
+        )
+        return found["run_id"] if found else None
+
+    assert _lookup(None) == "run-state-q-none"
+    assert _lookup("") == "run-state-q-none"
+    assert _lookup("Why?") == "run-state-q-text"
+    assert _lookup("Other?") is None